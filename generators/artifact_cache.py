@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Content-addressed build artifact cache shared between builders.
+
+Generated specs, the groupings corpus and pyang tree output are stored under
+keys that hash everything they were built from: the generator version (its
+code and output options) and the content hashes of the source module and its
+imports/includes. The same inputs give the same key on any machine, so a
+cache directory on a shared filesystem lets one builder reuse what another
+built; a local directory works the same way for a single machine.
+
+Layout under the cache root:
+  objects/<ab>/<sha256>       file contents, stored once however many entries use them
+  entries/<ab>/<key>.json     {'files': {relative path: object hash}, 'meta': ...}
+
+Every file is written to a temporary name and renamed into place, so builders
+sharing a directory never see a partial object or entry. Nothing is ever
+modified in place; a directory that grows too large can be deleted (or pruned
+by age) at any time.
+
+The cache is enabled with --cache-dir DIR on the generators and tree scripts,
+or the BUILD_CACHE_DIR environment variable. The tree scripts fall back to a
+local cache in .build/cache, since re-rendering every tree takes minutes.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import spec_io
+
+CACHE_ENV = 'BUILD_CACHE_DIR'
+OBJECTS_DIR = 'objects'
+ENTRIES_DIR = 'entries'
+
+
+def add_cache_argument(parser, local_dir: Optional[Path] = None):
+    """Register --cache-dir on an argparse parser, falling back to local_dir (if given) without it"""
+    parser.add_argument('--cache-dir', default=os.environ.get(CACHE_ENV) or local_dir, metavar='DIR',
+                        help=f'Shared artifact cache directory (default: ${CACHE_ENV}; {local_dir or "none"})')
+    return parser
+
+
+def cache_key(*parts: Any) -> str:
+    """Key for the JSON-serializable parts an artifact was built from"""
+    return hashlib.sha256(spec_io.dumpb(list(parts), pretty=False, sort_keys=True)).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        os.replace(temp_name, path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+
+class ArtifactCache:
+    """A content-addressed artifact store in one (possibly shared) directory"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.hits = 0
+        self.stores = 0
+
+    @classmethod
+    def from_args(cls, args) -> Optional['ArtifactCache']:
+        """The cache named by --cache-dir (see add_cache_argument()), or None"""
+        root = getattr(args, 'cache_dir', None)
+        return cls(root) if root else None
+
+    def _object(self, digest: str) -> Path:
+        return self.root / OBJECTS_DIR / digest[:2] / digest
+
+    def _entry(self, key: str) -> Path:
+        return self.root / ENTRIES_DIR / key[:2] / f"{key}.json"
+
+    def put(self, key: str, files: Mapping[str, bytes], meta: Any = None):
+        """Store files ({relative path: content}) and meta under key"""
+        hashes = {}
+        for name, data in files.items():
+            digest = hashlib.sha256(data).hexdigest()
+            if not self._object(digest).exists():
+                _write_atomic(self._object(digest), data)
+            hashes[name] = digest
+        _write_atomic(self._entry(key), spec_io.dumpb({'files': hashes, 'meta': meta}, pretty=False))
+        self.stores += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """{'files': {relative path: content}, 'meta': ...} stored under key, or None"""
+        entry_file = self._entry(key)
+        if not entry_file.exists():
+            return None
+        try:
+            entry = spec_io.load(entry_file)
+            files = {name: self._object(digest).read_bytes() for name, digest in entry['files'].items()}
+        except (OSError, ValueError, KeyError):
+            # An object pruned from under the entry is a miss, not an error
+            return None
+        self.hits += 1
+        return {'files': files, 'meta': entry.get('meta')}
+
+    def put_file(self, key: str, path: Path, meta: Any = None):
+        """Store one file under key"""
+        self.put(key, {Path(path).name: Path(path).read_bytes()}, meta)
+
+    def get_file(self, key: str, path: Path) -> bool:
+        """Write the one file stored under key to path; False on a miss"""
+        entry = self.get(key)
+        if entry is None or len(entry['files']) != 1:
+            return False
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(Path(path), next(iter(entry['files'].values())))
+        return True
+
+    def report(self, label: str = 'artifact cache'):
+        """Print the hit and store counts, if the cache was used"""
+        if self.hits or self.stores:
+            print(f"{label.capitalize()} ({self.root}): {self.hits} reused, {self.stores} stored")
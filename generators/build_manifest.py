@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Incremental per-module rebuilds for the spec generators.
+
+api/build/manifest.json records, for each source YANG file a generator
+processed, the content hashes of the file and of every module it imports or
+includes (transitively), the generator version (a hash of the generator and
+its shared modules plus the options that change the output) and the specs it
+produced. On the next run a module whose hash set is unchanged, and whose
+specs are still on disk, is not parsed again: the generator reuses the specs
+and the summary it recorded for its own manifest. --full ignores the manifest.
+
+Generators that resolve 'uses' against groupings cached from earlier modules
+also record, per module, a hash of the groupings it resolves that way
+(module_pool.track_groupings()), so a change to a grouping in an earlier
+module rebuilds the modules that use it even though their own closure is
+unchanged.
+
+Post-processing scripts that rewrite specs in place (link injection) are
+idempotent, so reusing a spec they already touched is safe.
+
+A shard (--shard i/N) builds only its own modules and records them in
+api/build/shards/<i>-of-<N>.json; --merge-shards starts from all shards'
+entries instead of api/build/manifest.json (see sharding).
+"""
+
+import hashlib
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import spec_io
+from artifact_cache import ArtifactCache, cache_key
+from sharding import SHARD_DIR, Shard, check_complete, shard_files
+
+BUILD_DIR = 'build'
+MANIFEST_NAME = 'manifest.json'
+# Shared modules whose code affects every generator's output
+GENERATOR_LIBS = ('spec_io.py', 'spec_writer.py', 'fingerprint.py', 'example_rules.py', 'schema_pool.py',
+                  'build_manifest.py', 'module_pool.py', 'shared_corpus.py', 'sharding.py',
+                  'artifact_cache.py')
+# Key of the resolved-groupings hash in a module's sources (never a file name)
+GROUPINGS_KEY = '(groupings)'
+DEPENDENCY_PATTERN = re.compile(r'^\s*(?:import|include)\s+([A-Za-z0-9_.-]+)', re.MULTILINE)
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def generator_version(generator_file, options: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of the generator script, the shared modules and the output options"""
+    generator_file = Path(generator_file).resolve()
+    sha = hashlib.sha256()
+    for path in [generator_file] + [generator_file.parent / name for name in GENERATOR_LIBS]:
+        if path.exists():
+            sha.update(path.name.encode() + b'\0' + path.read_bytes())
+    sha.update(spec_io.dumpb(options or {}, pretty=False, sort_keys=True))
+    return sha.hexdigest()
+
+
+class ModuleSources:
+    """Content hashes of YANG modules and their import/include closures, memoized per file"""
+
+    def __init__(self, yang_dir):
+        self.yang_dir = Path(yang_dir) if yang_dir else None
+        self._hashes: Dict[Path, str] = {}
+        self._dependencies: Dict[Path, List[str]] = {}
+
+    def _hash(self, path: Path) -> str:
+        if path not in self._hashes:
+            self._hashes[path] = file_hash(path)
+        return self._hashes[path]
+
+    def _find_module(self, name: str, near: Path) -> Optional[Path]:
+        for directory in dict.fromkeys([near, self.yang_dir]):
+            exact = directory / f"{name}.yang"
+            if exact.exists():
+                return exact
+            revisions = sorted(directory.glob(f"{name}@*.yang"))
+            if revisions:
+                return revisions[-1]
+        return None
+
+    def _direct_dependencies(self, path: Path) -> List[str]:
+        if path not in self._dependencies:
+            content = path.read_text(encoding='utf-8', errors='ignore')
+            self._dependencies[path] = sorted(set(DEPENDENCY_PATTERN.findall(content)))
+        return self._dependencies[path]
+
+    def hashes(self, yang_file: Path) -> Dict[str, Optional[str]]:
+        """Hashes of yang_file and of every module it imports or includes, transitively"""
+        yang_file = Path(yang_file)
+        hashes: Dict[str, Optional[str]] = {yang_file.name: self._hash(yang_file)}
+        pending = [yang_file]
+        while pending:
+            path = pending.pop()
+            for name in self._direct_dependencies(path):
+                dependency = self._find_module(name, path.parent)
+                key = dependency.name if dependency else name
+                if key in hashes:
+                    continue
+                # Modules outside the corpus are recorded as missing, so adding one counts as a change
+                hashes[key] = self._hash(dependency) if dependency else None
+                if dependency:
+                    pending.append(dependency)
+        return dict(sorted(hashes.items()))
+
+
+class BuildManifest:
+    """Per-module source hashes and outputs of one generator's api/ directory"""
+
+    def __init__(self, writer, yang_dir, generator_file, options: Optional[Dict[str, Any]] = None,
+                 full: bool = False, enabled: bool = True, shard: Optional[Shard] = None,
+                 merge_shards: bool = False, merge_summaries: Optional[Callable[[List[Any]], Any]] = None,
+                 cache: Optional[ArtifactCache] = None):
+        self.writer = writer
+        self.yang_dir = Path(yang_dir) if yang_dir else None
+        self.enabled = enabled
+        self.full = full
+        self.shard = shard
+        self.build_dir = Path(writer.output_dir) / BUILD_DIR if writer else None
+        self.manifest_file = self.build_dir / MANIFEST_NAME if writer else None
+        if shard and writer:
+            self.manifest_file = self.build_dir / SHARD_DIR / f"{shard.label}.json"
+        self.version = generator_version(generator_file, dict(writer.options, **(options or {}))) \
+            if enabled else ''
+        self.merged_shards: List[Path] = []
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        if enabled and merge_shards:
+            self.previous = self._merge_shards(merge_summaries)
+        elif enabled:
+            # A shard's first run can reuse what a full build left
+            for candidate in dict.fromkeys([self.manifest_file, self.build_dir / MANIFEST_NAME]):
+                if candidate.exists():
+                    self.previous = self._load_modules(candidate)
+                    break
+        self.modules: Dict[str, Dict[str, Any]] = {}
+        self.reused = 0
+        self.module_sources = ModuleSources(yang_dir)
+        # File name -> hash of the groupings the module resolves from earlier modules (use_groupings())
+        self.groupings: Dict[str, str] = {}
+        self.cache = cache
+        # A source that shards each build part of (native) is cached per shard
+        self.cache_scope = shard.label if shard and merge_summaries else None
+        self.restored = 0
+
+    @classmethod
+    def from_args(cls, writer, yang_dir, generator_file, args, options: Optional[Dict[str, Any]] = None,
+                  merge_summaries: Optional[Callable[[List[Any]], Any]] = None) -> 'BuildManifest':
+        """Build a manifest from the --full/--shard/--merge-shards/--cache-dir options (add_output_arguments())"""
+        shard = getattr(args, 'shard', None)
+        merge_shards = getattr(args, 'merge_shards', False)
+        full = getattr(args, 'full', False)
+        if merge_shards and (shard or full):
+            raise SystemExit("--merge-shards reuses the shards' specs; it cannot be combined with --shard or --full")
+        return cls(writer, yang_dir, generator_file, options, full=full, shard=shard,
+                   merge_shards=merge_shards, merge_summaries=merge_summaries,
+                   cache=ArtifactCache.from_args(args))
+
+    @classmethod
+    def disabled(cls) -> 'BuildManifest':
+        """A manifest that never reuses or records anything (library use)"""
+        return cls(None, None, None, enabled=False)
+
+    def _load_modules(self, manifest_file: Path) -> Dict[str, Dict[str, Any]]:
+        previous = spec_io.load(manifest_file)
+        return previous.get('modules', {}) if previous.get('version') == self.version else {}
+
+    def _merge_shards(self, merge_summaries: Optional[Callable[[List[Any]], Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        The entries of every shard's build manifest. A source several shards
+        built a part of (native's categories) gets its specs concatenated and
+        its summaries combined by merge_summaries.
+        """
+        files = shard_files(self.build_dir)
+        check_complete(files)
+        entries: Dict[str, List[Dict[str, Any]]] = {}
+        for shard_file in files:
+            shard = spec_io.load(shard_file)
+            if shard.get('version') != self.version:
+                raise SystemExit(f"--merge-shards: {shard_file.name} was built by a different generator "
+                                 f"version or with different options")
+            for key, entry in shard['modules'].items():
+                entries.setdefault(key, []).append(entry)
+
+        merged = {}
+        for key, parts in entries.items():
+            first = parts[0]
+            if all(part == first for part in parts[1:]):
+                merged[key] = first
+                continue
+            if merge_summaries is None or any(part['sources'] != first['sources'] for part in parts):
+                raise SystemExit(f"--merge-shards: shards recorded different builds of {key}")
+            merged[key] = {'sources': first['sources'],
+                           'specs': list(dict.fromkeys(name for part in parts for name in part['specs'])),
+                           'summary': merge_summaries([part['summary'] for part in parts])}
+        self.merged_shards = files
+        return merged
+
+    def owned(self, items: Sequence[Any], weight: Optional[Callable[[Any], float]] = None) -> List[Any]:
+        """The items (source files by default weighted by size) this run builds: all, or this shard's"""
+        return self.shard.select(items, weight) if self.shard else list(items)
+
+    def use_groupings(self, groupings: Dict[str, str]):
+        """Count each module's resolved groupings (by file name, see module_pool.track_groupings()) as a source"""
+        self.groupings = groupings
+
+    def sources(self, yang_file: Path) -> Dict[str, Optional[str]]:
+        """
+        Hashes of yang_file and of every module it imports or includes,
+        transitively, plus that of the groupings it resolves from earlier modules
+        """
+        sources = self.module_sources.hashes(yang_file)
+        groupings = self.groupings.get(Path(yang_file).name)
+        if groupings is not None:
+            sources[GROUPINGS_KEY] = groupings
+        return sources
+
+    def _cache_key(self, yang_file: Path, sources: Dict[str, Optional[str]]) -> str:
+        return cache_key('spec', self.version, Path(yang_file).name, sources, self.cache_scope)
+
+    def _restore(self, yang_file: Path, sources: Dict[str, Optional[str]]) -> Optional[Dict[str, Any]]:
+        """The entry for yang_file from the artifact cache, its outputs written back to api/"""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self._cache_key(yang_file, sources))
+        if cached is None:
+            return None
+        self.writer.restore_outputs(cached['files'])
+        entry = {'sources': sources, **cached['meta']}
+        if not all(self.writer.reuse_spec(name) for name in entry['specs']):
+            return None
+        self.restored += 1
+        return entry
+
+    def reuse(self, yang_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        The recorded entry ({'specs': [...], 'summary': ...}) if yang_file's hash
+        set is unchanged and its specs could be reused - from api/ or, failing
+        that, from the artifact cache; None means regenerate.
+        """
+        if not self.enabled or self.full:
+            return None
+        key = Path(yang_file).name
+        sources = self.sources(yang_file)
+        entry = self.previous.get(key)
+        if entry is None or entry['sources'] != sources or \
+                not all(self.writer.reuse_spec(name) for name in entry['specs']):
+            entry = self._restore(yang_file, sources)
+            if entry is None:
+                return None
+        self.modules[key] = entry
+        self.reused += 1
+        return entry
+
+    def record(self, yang_file: Path, specs: Sequence[str], summary: Any = None) -> Dict[str, Any]:
+        """
+        Record the specs generated from yang_file and the summary the generator's
+        manifest needs (and store them in the artifact cache); returns the entry
+        in the shape reuse() does
+        """
+        entry = {'specs': list(specs), 'summary': summary}
+        if self.enabled:
+            sources = self.sources(yang_file)
+            self.modules[Path(yang_file).name] = {'sources': sources, **entry}
+            if self.cache is not None and not self.writer.externalize:
+                files = {}
+                for name in specs:
+                    files.update(self.writer.spec_outputs(name))
+                self.cache.put(self._cache_key(yang_file, sources), files, entry)
+        return entry
+
+    def save(self):
+        """Write api/build/manifest.json (or the shard's part) for the modules seen in this run"""
+        if not self.enabled:
+            return
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        spec_io.dump({'version': self.version, 'modules': dict(sorted(self.modules.items()))},
+                     self.manifest_file, pretty=False)
+        if self.merged_shards:
+            shutil.rmtree(self.build_dir / SHARD_DIR)
+            print(f"Merged {len(self.merged_shards)} shards into {self.manifest_file.relative_to(self.writer.output_dir)}")
+        if self.reused:
+            print(f"Reused {self.reused}/{len(self.modules)} modules with unchanged sources "
+                  f"({self.manifest_file.relative_to(self.writer.output_dir)})")
+        if self.restored:
+            print(f"  {self.restored} of them restored from the artifact cache ({self.cache.root})")
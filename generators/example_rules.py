@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Compiled rule tables and memoization for the generators' create_example_data.
+
+A rule is a condition string plus the example value it produces. Conditions are
+'&'-joined terms over the lower-cased property name; a term holds when any of
+its '|'-separated substrings occurs in the name, and a leading '!' negates it.
+The empty condition always holds. The first rule that holds wins:
+
+    ('interface|name & loopback', 'Loopback0')
+    ('version & !ip|software|protocol', '17.9')
+
+All substrings of a table are found in one pass with a single regex
+alternation, and the result is cached per name, so each property name is
+classified once per build however many schemas it appears in.
+
+ExampleBudget caps the size of each generated example (--example-max-bytes /
+--example-max-nodes) and reports the paths it had to truncate.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import spec_io
+
+# Returned when no rule holds (None is a legitimate example value)
+NO_MATCH = object()
+
+
+class NameRules:
+    """First-match rule table over lower-cased property names"""
+
+    def __init__(self, rules: Sequence[Tuple[str, Any]]):
+        self._rules: List[Tuple[Tuple[FrozenSet[str], ...], FrozenSet[str], Any]] = []
+        tokens = set()
+
+        for condition, value in rules:
+            required = []
+            excluded = set()
+            for term in filter(None, (t.strip() for t in condition.split('&'))):
+                if term.startswith('!'):
+                    alternatives = term[1:].split('|')
+                    excluded.update(alternatives)
+                else:
+                    alternatives = term.split('|')
+                    required.append(frozenset(alternatives))
+                tokens.update(alternatives)
+            self._rules.append((tuple(required), frozenset(excluded), value))
+
+        # Longest first so the alternation prefers the longest token at each position;
+        # the shorter tokens it contains are added back through _contained
+        ordered = sorted(tokens, key=lambda t: (-len(t), t))
+        self._pattern = re.compile('(?=(%s))' % '|'.join(map(re.escape, ordered))) if ordered else None
+        self._contained = {token: frozenset(t for t in tokens if t in token) for token in tokens}
+        self._cache: Dict[str, Any] = {}
+
+    def _tokens_in(self, name_lower: str) -> FrozenSet[str]:
+        """Every table token that occurs somewhere in name_lower"""
+        if self._pattern is None:
+            return frozenset()
+        found = set()
+        for match in self._pattern.finditer(name_lower):
+            found |= self._contained[match.group(1)]
+        return frozenset(found)
+
+    def match(self, name_lower: str) -> Any:
+        """Value of the first rule that holds for name_lower, or NO_MATCH"""
+        try:
+            return self._cache[name_lower]
+        except KeyError:
+            pass
+
+        found = self._tokens_in(name_lower)
+        result = NO_MATCH
+        for required, excluded, value in self._rules:
+            if excluded.isdisjoint(found) and all(not group.isdisjoint(found) for group in required):
+                result = value
+                break
+
+        self._cache[name_lower] = result
+        return result
+
+
+class ExampleMemo:
+    """
+    Examples memoized by (schema identity, property name).
+    Each entry keeps its schema alive, so an id() can't be reused by another
+    schema while the entry exists. Cached examples are shared - callers that
+    need to modify one must copy it first.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[int, str], Tuple[Dict[str, Any], Any]] = {}
+
+    def get(self, schema: Dict[str, Any], property_name: str) -> Any:
+        entry = self._entries.get((id(schema), property_name))
+        return entry[1] if entry is not None else NO_MATCH
+
+    def put(self, schema: Dict[str, Any], property_name: str, example: Any) -> Any:
+        self._entries[(id(schema), property_name)] = (schema, example)
+        return example
+
+    def clear(self):
+        self._entries.clear()
+
+
+def varied_items(item: Any, count: int, vary) -> List[Any]:
+    """
+    count copies of an array item example, each passed through vary(copy, index).
+    Dicts are shallow-copied so vary() can replace top-level fields; nested
+    values stay shared with the memoized item.
+    """
+    items = []
+    for i in range(count):
+        if isinstance(item, dict):
+            copy = dict(item)
+            vary(copy, i)
+            items.append(copy)
+        else:
+            items.append(item)
+    return items
+
+
+def add_example_arguments(parser):
+    """Register the shared example budget options on a generator's argparse parser"""
+    group = parser.add_argument_group('example options')
+    group.add_argument('--example-max-bytes', type=int, default=ExampleBudget.DEFAULT_MAX_BYTES,
+                       help='Truncate examples larger than this many bytes of compact JSON (0 = no limit)')
+    group.add_argument('--example-max-nodes', type=int, default=ExampleBudget.DEFAULT_MAX_NODES,
+                       help='Truncate examples with more than this many JSON values (0 = no limit)')
+    group.add_argument('--example-budget-report', metavar='FILE',
+                       help='Write the paths whose examples hit the budget to FILE (JSON)')
+    return parser
+
+
+def count_nodes(example: Any) -> int:
+    """Number of JSON values in example, counting shared subtrees once per occurrence"""
+    if isinstance(example, dict):
+        return 1 + sum(count_nodes(value) for value in example.values())
+    if isinstance(example, list):
+        return 1 + sum(count_nodes(value) for value in example)
+    return 1
+
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def single_item(example: Any) -> Any:
+    """example with every array cut down to its first item"""
+    if isinstance(example, dict):
+        return {key: single_item(value) for key, value in example.items()}
+    if isinstance(example, list):
+        return [single_item(example[0])] if example else []
+    return example
+
+
+def key_only_items(example: Any, key_names: Sequence[str] = ()) -> Any:
+    """
+    example with every array cut down to one item holding only its key leaves
+    (or its scalar leaves when the keys are unknown); containers are kept.
+    """
+    if isinstance(example, dict):
+        return {key: key_only_items(value) for key, value in example.items()}
+    if isinstance(example, list):
+        if not example:
+            return []
+        item = example[0]
+        if isinstance(item, dict):
+            keys = [k for k in key_names if k in item and _is_scalar(item[k])]
+            item = {k: item[k] for k in keys} if keys else {k: v for k, v in item.items() if _is_scalar(v)}
+        return [item]
+    return example
+
+
+def minimal_example(schema: Dict[str, Any], example: Any, key_names: Sequence[str] = ()) -> Any:
+    """
+    Minimal required content: the schema's required leaves or list keys when
+    known, otherwise the scalar leaves. Nested containers and lists are dropped;
+    a list becomes a single key-only item.
+    """
+    if isinstance(example, list):
+        items_schema = schema.get('items', {}) if isinstance(schema, dict) else {}
+        return [minimal_example(items_schema, example[0], key_names)] if example else []
+    if not isinstance(example, dict):
+        return example
+
+    required = schema.get('required', []) if isinstance(schema, dict) else []
+    keep = [k for k in list(required) + list(key_names) if k in example and _is_scalar(example[k])]
+    if keep:
+        return {k: example[k] for k in dict.fromkeys(keep)}
+    return {k: v for k, v in example.items() if _is_scalar(v)}
+
+
+class ExampleBudget:
+    """
+    Per-example byte/node budget. Oversized examples are shrunk in steps - arrays
+    to a single item, then arrays to key-only items, then minimal required
+    content - until they fit, and the path is recorded for the report.
+    """
+
+    DEFAULT_MAX_BYTES = 8192
+    DEFAULT_MAX_NODES = 1000
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_nodes: int = DEFAULT_MAX_NODES):
+        self.max_bytes = max_bytes or 0
+        self.max_nodes = max_nodes or 0
+        self.hits: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_args(cls, args) -> 'ExampleBudget':
+        """Build a budget from the options registered by add_example_arguments()"""
+        return cls(max_bytes=getattr(args, 'example_max_bytes', cls.DEFAULT_MAX_BYTES),
+                   max_nodes=getattr(args, 'example_max_nodes', cls.DEFAULT_MAX_NODES))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_bytes or self.max_nodes)
+
+    def _measure(self, example: Any) -> Tuple[int, int, bool]:
+        """(nodes, bytes, fits); bytes is only computed when the node count fits"""
+        nodes = count_nodes(example)
+        if self.max_nodes and nodes > self.max_nodes:
+            return nodes, -1, False
+        size = len(spec_io.dumpb(example, pretty=False)) if self.max_bytes else -1
+        return nodes, size, not (self.max_bytes and size > self.max_bytes)
+
+    def apply(self, path: str, schema: Dict[str, Any], example: Any, key: Optional[str] = None) -> Any:
+        """Return example, or a truncated copy if it exceeds the budget"""
+        if not self.enabled:
+            return example
+
+        nodes, size, fits = self._measure(example)
+        if fits:
+            return example
+
+        key_names = key.split() if key else []
+        steps = (
+            ('single-item', single_item),
+            ('key-only-items', lambda e: key_only_items(e, key_names)),
+            ('minimal', lambda e: minimal_example(schema, e, key_names)),
+        )
+        truncated = example
+        for level, shrink in steps:
+            truncated = shrink(truncated)
+            final_nodes, final_size, fits = self._measure(truncated)
+            if fits:
+                break
+
+        self.hits[path] = {
+            'path': path,
+            'nodes': nodes,
+            'bytes': size if size >= 0 else len(spec_io.dumpb(example, pretty=False)),
+            'truncated_to': level,
+            'final_nodes': final_nodes,
+            'final_bytes': final_size if final_size >= 0 else len(spec_io.dumpb(truncated, pretty=False)),
+        }
+        return truncated
+
+    def report(self, report_file: Optional[str] = None):
+        """Print the paths that hit the budget and optionally write them as JSON"""
+        if not self.hits:
+            return
+        hits = sorted(self.hits.values(), key=lambda h: -h['bytes'])
+        saved = sum(h['bytes'] - h['final_bytes'] for h in hits)
+        print(f"\nExample budget ({self.max_bytes or '-'} bytes / {self.max_nodes or '-'} nodes): "
+              f"{len(hits)} examples truncated, {saved / 1024:.0f} KB saved")
+        for hit in hits[:10]:
+            print(f"  {hit['path']}: {hit['bytes']:,} -> {hit['final_bytes']:,} bytes ({hit['truncated_to']})")
+        if len(hits) > 10:
+            print(f"  ... and {len(hits) - 10} more")
+        if report_file:
+            spec_io.dump({'max_bytes': self.max_bytes, 'max_nodes': self.max_nodes, 'paths': hits}, report_file)
+            print(f"  Report: {report_file}")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Content-hash fingerprinted copies of published files.
+A fingerprinted file is named <stem>.<hash><suffix>; its name changes whenever its
+content does, so it can be served with an immutable, long-lived cache header.
+Only the manifests that map logical names to fingerprinted names need revalidation.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict
+
+HASH_LENGTH = 12
+FINGERPRINT_PATTERN = re.compile(r'\.[0-9a-f]{%d}(\.[A-Za-z0-9]+)$' % HASH_LENGTH)
+# Specs go in a subdirectory so api/*.json globs in the post-processing scripts
+# keep seeing only the logical files
+SPEC_SUBDIR = 'hashed'
+
+
+def content_hash(data: bytes) -> str:
+    """Short SHA-256 hex digest of data"""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def is_fingerprinted(name: str) -> bool:
+    """True for names produced by fingerprinted_name()"""
+    return FINGERPRINT_PATTERN.search(name) is not None
+
+
+def fingerprinted_name(stem: str, suffix: str, data: bytes) -> str:
+    """<stem>.<hash><suffix> for data"""
+    return f"{stem}.{content_hash(data)}{suffix}"
+
+
+def write_fingerprinted(directory: Path, stem: str, suffix: str, data: bytes) -> str:
+    """
+    Write data to directory/<stem>.<hash><suffix> and remove older fingerprints of
+    the same stem. Returns the file name. Unchanged content keeps its name (and
+    the file is not rewritten), so caches stay warm across rebuilds.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = fingerprinted_name(stem, suffix, data)
+
+    previous = re.compile(re.escape(stem) + r'\.[0-9a-f]{%d}' % HASH_LENGTH + re.escape(suffix))
+    for old_file in directory.glob(f"{_glob_escape(stem)}.*{suffix}"):
+        if old_file.name != name and previous.fullmatch(old_file.name):
+            old_file.unlink()
+
+    target = directory / name
+    if not target.exists():
+        with open(target, 'wb') as f:
+            f.write(data)
+    return name
+
+
+def _glob_escape(name: str) -> str:
+    """Escape glob metacharacters in a literal file name part"""
+    return re.sub(r'([\[\]*?])', r'[\1]', name)
+
+
+def fingerprint_files(directory: Path, names: Dict[str, Path], suffix: str,
+                      subdir: str = '') -> Dict[str, str]:
+    """
+    Fingerprint each logical name -> existing file and return
+    logical name -> path of the fingerprinted copy relative to directory.
+    """
+    directory = Path(directory)
+    target_dir = directory / subdir if subdir else directory
+    files = {}
+    for logical, source in sorted(names.items()):
+        name = write_fingerprinted(target_dir, logical, suffix, Path(source).read_bytes())
+        files[logical] = f"{subdir}/{name}" if subdir else name
+    return files
@@ -4,19 +4,29 @@ Convert Config YANG modules to OpenAPI 3.0 specifications.
 Properly parses YANG structure using tree walking.
 """
 
-import json
 import re
+import argparse
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from build_manifest import BuildManifest
+from module_pool import ModulePool, add_jobs_argument, track_groupings
+from spec_writer import SpecWriter, add_output_arguments
 
 class ConfigToOpenAPI:
     """Convert Config YANG modules to OpenAPI 3.0 with proper YANG parsing"""
 
-    def __init__(self, yang_dir: str, output_dir: str):
+    def __init__(self, yang_dir: str, output_dir: str, writer: Optional[SpecWriter] = None,
+                 builds: Optional[BuildManifest] = None,
+                 pool: Optional[ModulePool] = None):
         self.yang_dir = Path(yang_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or SpecWriter(self.output_dir)
+        self.builds = builds or BuildManifest.disabled()
+        self.pool = pool or ModulePool()
         self.groupings_cache = {}
         self.processed_modules = []
         self.total_paths = 0
@@ -68,6 +78,11 @@ class ConfigToOpenAPI:
         match = re.search(r'^\s*module\s+([^\s{]+)', content, re.MULTILINE)
         return match.group(1) if match else ""
 
+    def caches_groupings(self, content: str) -> bool:
+        """Whether process_module() adds this module's groupings to groupings_cache (see module_pool)"""
+        module_name = self.extract_module_name(content)
+        return bool(module_name) and '-cfg' in module_name
+
     def extract_description(self, content: str) -> str:
         """Extract module description"""
         module_match = re.search(r'^\s*module\s+', content, re.MULTILINE)
@@ -155,7 +170,7 @@ class ConfigToOpenAPI:
         # Extract description
         desc_match = re.search(r'\bdescription\s+"([^"]+)"', leaf_content)
         if desc_match:
-            schema['description'] = desc_match.group(1).strip()
+            schema['description'] = sys.intern(desc_match.group(1).strip())
 
         # Check if mandatory
         if re.search(r'\bmandatory\s+true\b', leaf_content):
@@ -250,7 +265,7 @@ class ConfigToOpenAPI:
 
             cont_body = content[cont_start + 1:cont_end]
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', cont_body)
-            description = desc_match.group(1) if desc_match else None
+            description = sys.intern(desc_match.group(1)) if desc_match else None
 
             nested_schema = self.parse_container_or_grouping(cont_body, cont_name, depth + 1)
             if description:
@@ -396,7 +411,7 @@ class ConfigToOpenAPI:
 
             # Extract description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', cont_body)
-            description = desc_match.group(1) if desc_match else f"{cont_name} container"
+            description = sys.intern(desc_match.group(1)) if desc_match else f"{cont_name} container"
 
             # Create path for this container
             current_path = path_parts + [cont_name]
@@ -437,7 +452,7 @@ class ConfigToOpenAPI:
 
             # Extract description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', list_body)
-            description = desc_match.group(1) if desc_match else f"{list_name} list"
+            description = sys.intern(desc_match.group(1)) if desc_match else f"{list_name} list"
 
             # Extract key
             key_match = re.search(r'\bkey\s+"([^"]+)"', list_body)
@@ -614,16 +629,16 @@ class ConfigToOpenAPI:
 
         return openapi_spec
 
-    def process_module(self, yang_file: Path) -> bool:
-        """Process a single Config YANG module"""
+    def process_module(self, yang_file: Path) -> Optional[Dict[str, Any]]:
+        """Process a single Config YANG module; returns its build entry (specs and summary)"""
         try:
             content = self.read_yang_file(yang_file)
             if not content:
-                return False
+                return None
 
             module_name = self.extract_module_name(content)
             if not module_name or not '-cfg' in module_name:
-                return False
+                return None
 
             print(f"Processing {module_name}...")
 
@@ -638,7 +653,7 @@ class ConfigToOpenAPI:
 
             if not paths:
                 print(f"  ⚠️  No paths found for {module_name}")
-                return False
+                return None
 
             print(f"  ✓ Found {len(paths)} paths")
 
@@ -647,19 +662,17 @@ class ConfigToOpenAPI:
 
             # Write to file
             output_file = self.output_dir / f"{module_name}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(openapi_spec, f, indent=2)
+            self.writer.write_spec(module_name, openapi_spec)
+            built = self.builds.record(yang_file, [module_name], {'paths': len(paths)})
 
             print(f"  ✓ Generated {output_file}")
-            self.processed_modules.append(module_name)
-            self.total_paths += len(paths)
-            return True
+            return built
 
         except Exception as e:
             print(f"  ✗ Error processing {yang_file.name}: {e}")
             import traceback
             traceback.print_exc()
-            return False
+            return None
 
     def generate_all(self):
         """Process all Config modules"""
@@ -677,9 +690,24 @@ class ConfigToOpenAPI:
         print(f"Found {len(yang_files)} Config modules\n")
 
         success_count = 0
-        for yang_file in yang_files:
-            if self.process_module(yang_file):
+        # Modules reuse their specs only if the groupings they resolve from earlier ones are unchanged
+        track_groupings(self, yang_files)
+        pending = []
+        for yang_file in self.builds.owned(yang_files):
+            reused = self.builds.reuse(yang_file)
+            if reused is None:
+                pending.append(yang_file)
+                continue
+            self.processed_modules.extend(reused['specs'])
+            self.total_paths += reused['summary']['paths']
+            success_count += 1
+
+        for built in self.pool.map(self, 'process_module', pending, sources=yang_files):
+            if built:
+                self.processed_modules.extend(built['specs'])
+                self.total_paths += built['summary']['paths']
                 success_count += 1
+        self.pool.report()
 
         print(f"\n{'='*70}")
         print(f"Generation Complete: {success_count}/{len(yang_files)} modules")
@@ -694,9 +722,9 @@ class ConfigToOpenAPI:
             'timestamp': '2026-01-31'
         }
 
-        manifest_file = self.output_dir / 'manifest.json'
-        with open(manifest_file, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_file = self.writer.write_manifest(manifest)
+        self.writer.finalize()
+        self.builds.save()
 
         print(f"Manifest: {manifest_file}")
 
@@ -706,7 +734,15 @@ def main():
     yang_dir = script_dir.parent / 'references' / '17181-YANG-modules'
     output_dir = script_dir.parent / 'swagger-cfg-model' / 'api'
 
-    converter = ConfigToOpenAPI(str(yang_dir), str(output_dir))
+    parser = argparse.ArgumentParser(description='Generate Config OpenAPI specifications')
+    add_output_arguments(parser)
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    writer = SpecWriter.from_args(output_dir, args)
+    converter = ConfigToOpenAPI(str(yang_dir), str(output_dir), writer=writer,
+                                builds=BuildManifest.from_args(writer, yang_dir, __file__, args),
+                                pool=ModulePool.from_args(args))
     converter.generate_all()
 
 if __name__ == '__main__':
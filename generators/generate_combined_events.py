@@ -4,9 +4,10 @@ Generate combined Events/Telemetry model OpenAPI specification.
 Merges all 32 event notification module specifications into a single unified spec.
 """
 
-import json
 from pathlib import Path
 
+import spec_io
+
 def generate_combined_events():
     """Generate all-events.json combining all event module specs."""
 
@@ -91,8 +92,7 @@ This unified specification combines all 32 event notification and telemetry modu
 
     # Merge each module
     for spec_file in spec_files:
-        with open(spec_file, 'r') as f:
-            spec = json.load(f)
+        spec = spec_io.load(spec_file)
 
         module_name = spec_file.stem
         stats["modules"].append(module_name)
@@ -125,8 +125,7 @@ This unified specification combines all 32 event notification and telemetry modu
 
     # Write combined spec
     output_file = base_path / "all-events.json"
-    with open(output_file, 'w') as f:
-        json.dump(combined, f, indent=2)
+    spec_io.dump(combined, output_file)
 
     print(f"\n📊 Combined Events Model Statistics:")
     print(f"   Modules Merged: {stats['modules_merged']}")
@@ -4,9 +4,10 @@ Generate combined IETF model OpenAPI specification.
 Merges all 28 IETF standard module specifications into a single unified spec.
 """
 
-import json
 from pathlib import Path
 
+import spec_io
+
 def generate_combined_ietf():
     """Generate all-ietf.json combining all IETF module specs."""
 
@@ -83,8 +84,7 @@ All modules implement official IETF RFCs ensuring vendor-neutral, interoperable
 
     # Merge each module
     for spec_file in spec_files:
-        with open(spec_file, 'r') as f:
-            spec = json.load(f)
+        spec = spec_io.load(spec_file)
 
         module_name = spec_file.stem
         stats["modules"].append(module_name)
@@ -117,8 +117,7 @@ All modules implement official IETF RFCs ensuring vendor-neutral, interoperable
 
     # Write combined spec
     output_file = base_path / "all-ietf.json"
-    with open(output_file, 'w') as f:
-        json.dump(combined, f, indent=2)
+    spec_io.dump(combined, output_file)
 
     print(f"\n📊 Combined IETF Model Statistics:")
     print(f"   Modules Merged: {stats['modules_merged']}")
@@ -4,9 +4,10 @@ Generate combined MIB OpenAPI specification.
 Merges all 147 SNMP MIB (SMIv2-to-YANG) module specifications into a single unified spec.
 """
 
-import json
 from pathlib import Path
 
+import spec_io
+
 def generate_combined_mib():
     """Generate all-mibs.json combining all MIB module specs."""
 
@@ -95,8 +96,7 @@ These YANG models exist for SMIv2-to-YANG translation purposes, but **MIB data o
 
     for json_file in json_files:
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                spec = json.load(f)
+            spec = spec_io.load(json_file)
 
             module_name = json_file.stem
             paths_count = len(spec.get("paths", {}))
@@ -136,8 +136,7 @@ These YANG models exist for SMIv2-to-YANG translation purposes, but **MIB data o
 
     # Write combined spec
     output_file = base_path / "all-mibs.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined, f, indent=2)
+    spec_io.dump(combined, output_file)
 
     print(f"\n{'='*70}")
     print(f"Combined MIB Specification Generated!")
@@ -150,8 +149,7 @@ These YANG models exist for SMIv2-to-YANG translation purposes, but **MIB data o
 
     # Save merge statistics
     stats_file = base_path / "merge_stats.json"
-    with open(stats_file, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, indent=2)
+    spec_io.dump(stats, stats_file)
 
     print(f"Merge statistics saved: {stats_file}")
 
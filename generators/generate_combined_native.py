@@ -4,9 +4,10 @@ Generate combined Native Config model OpenAPI specification.
 Merges all 10 category specifications into a single unified spec.
 """
 
-import json
 from pathlib import Path
 
+import spec_io
+
 def generate_combined_native():
     """Generate all-native.json combining all category specs."""
 
@@ -68,6 +69,7 @@ This unified specification provides access to the entire Cisco-IOS-XE-native YAN
         "paths": {},
         "components": {
             "schemas": {},
+            "examples": {},
             "securitySchemes": {
                 "BasicAuth": {
                     "type": "http",
@@ -94,8 +96,7 @@ This unified specification provides access to the entire Cisco-IOS-XE-native YAN
             print(f"⚠️  Warning: {category}.json not found, skipping")
             continue
 
-        with open(spec_file, 'r') as f:
-            spec = json.load(f)
+        spec = spec_io.load(spec_file)
 
         # Merge paths
         if "paths" in spec:
@@ -109,6 +110,10 @@ This unified specification provides access to the entire Cisco-IOS-XE-native YAN
                 combined["components"]["schemas"][schema_name] = schema_def
                 stats["total_schemas"] += 1
 
+        # Merge the shared examples the operations reference
+        for example_name, example_def in spec.get("components", {}).get("examples", {}).items():
+            combined["components"]["examples"][example_name] = example_def
+
         # Add tag
         category_name = category.replace("native-", "").replace("-", " ").title()
         combined["tags"].append({
@@ -121,8 +126,7 @@ This unified specification provides access to the entire Cisco-IOS-XE-native YAN
 
     # Write combined spec
     output_file = base_path / "all-native.json"
-    with open(output_file, 'w') as f:
-        json.dump(combined, f, indent=2)
+    spec_io.dump(combined, output_file)
 
     print(f"\n📊 Combined Native Model Statistics:")
     print(f"   Categories Merged: {stats['categories_merged']}/10")
@@ -5,10 +5,11 @@ Generate a combined OpenAPI specification containing ALL Operational GET operati
 This creates a single unified view of all operational data endpoints.
 """
 
-import json
 from pathlib import Path
 import sys
 
+import spec_io
+
 # Ensure proper console encoding
 if sys.platform.startswith('win'):
     sys.stdout.reconfigure(encoding='utf-8')
@@ -24,9 +25,8 @@ def generate_combined_spec():
     manifest_file = api_dir / "manifest.json"
     total_modules = 209  # Default
     if manifest_file.exists():
-        with open(manifest_file, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
-            total_modules = manifest.get('total_modules', 209)
+        manifest = spec_io.load(manifest_file)
+        total_modules = manifest.get('total_modules', 209)
 
     # Base OpenAPI structure
     combined_spec = {
@@ -121,8 +121,7 @@ def generate_combined_spec():
             continue
 
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                spec = json.load(f)
+            spec = spec_io.load(json_file)
 
             module_name = json_file.stem
             modules_processed += 1
@@ -197,8 +196,7 @@ def generate_combined_spec():
 
     # Write combined specification
     output_file = api_dir / "all-operations.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined_spec, f, indent=2, ensure_ascii=False)
+    spec_io.dump(combined_spec, output_file, ensure_ascii=False)
 
     print(f"\n✅ Combined specification created successfully!")
     print(f"   📊 Modules processed: {modules_processed}")
@@ -5,10 +5,11 @@ Generate a combined OpenAPI specification containing ALL RPC operations from all
 This creates a single unified view of all operations.
 """
 
-import json
 from pathlib import Path
 import sys
 
+import spec_io
+
 # Ensure proper console encoding
 if sys.platform.startswith('win'):
     sys.stdout.reconfigure(encoding='utf-8')
@@ -22,9 +23,8 @@ def generate_combined_spec():
     manifest_file = api_dir / "manifest.json"
     total_ops = 274  # Default
     if manifest_file.exists():
-        with open(manifest_file, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
-            total_ops = manifest.get('total_operations', 274)
+        manifest = spec_io.load(manifest_file)
+        total_ops = manifest.get('total_operations', 274)
     
     # Base OpenAPI structure
     combined_spec = {
@@ -97,8 +97,7 @@ def generate_combined_spec():
             continue
             
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                spec = json.load(f)
+            spec = spec_io.load(json_file)
             
             module_name = json_file.stem
             modules_processed += 1
@@ -155,12 +154,12 @@ def generate_combined_spec():
                         for method, operation in methods.items():
                             if module_name in operation.get('tags', []):
                                 # Update schema references in this operation
-                                operation_str = json.dumps(operation)
+                                operation_str = spec_io.dumps(operation, pretty=False)
                                 operation_str = operation_str.replace(
                                     f'"#/components/schemas/{schema_name}"',
                                     f'"#/components/schemas/{prefixed_name}"'
                                 )
-                                combined_spec['paths'][path][method] = json.loads(operation_str)
+                                combined_spec['paths'][path][method] = spec_io.loads(operation_str)
         
         except Exception as e:
             print(f"Warning: Could not process {json_file.name}: {e}")
@@ -171,8 +170,7 @@ def generate_combined_spec():
     
     # Write combined spec
     output_file = api_dir / "all-operations.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined_spec, f, indent=2)
+    spec_io.dump(combined_spec, output_file)
     
     print(f"\n[SUCCESS] Successfully created combined OpenAPI specification!")
     print(f"   Output: {output_file}")
@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 """Generate OpenAPI specs for Cisco IOS-XE Events YANG modules"""
 
-import json
+import argparse
 import re
 from pathlib import Path
 
+from build_manifest import BuildManifest
+from spec_writer import SpecWriter, add_output_arguments
+
 script_dir = Path(__file__).parent
 yang_dir = script_dir.parent / 'references' / '17181-YANG-modules'
 output_dir = script_dir.parent / 'swagger-events-model' / 'api'
-output_dir.mkdir(parents=True, exist_ok=True)
+
+parser = argparse.ArgumentParser(description='Generate Events OpenAPI specifications')
+add_output_arguments(parser)
+args = parser.parse_args()
+writer = SpecWriter.from_args(output_dir, args)
+builds = BuildManifest.from_args(writer, yang_dir, __file__, args)
 
 print("\n🔧 IOS-XE Events YANG to OpenAPI Generator")
 print("=" * 60)
@@ -23,8 +31,12 @@ print()
 
 specs_created = []
 
-for yang_file in events_files:
+for yang_file in builds.owned(events_files):
     module_name = yang_file.stem
+    reused = builds.reuse(yang_file)
+    if reused is not None:
+        specs_created.append(reused['summary'])
+        continue
     print(f"  ✓ Processing: {module_name}")
     
     # Read YANG content
@@ -130,11 +142,10 @@ for yang_file in events_files:
     }
     
     # Save spec
-    output_file = output_dir / f"{module_name}.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(spec, f, indent=2)
+    writer.write_spec(module_name, spec)
     
     specs_created.append({"name": module_name, "file": f"{module_name}.json"})
+    builds.record(yang_file, [module_name], specs_created[-1])
 
 # Create manifest
 manifest = {
@@ -144,8 +155,9 @@ manifest = {
     "modules": specs_created
 }
 
-with open(output_dir / "manifest.json", 'w') as f:
-    json.dump(manifest, f, indent=2)
+writer.write_manifest(manifest)
+writer.finalize()
+builds.save()
 
 print(f"\n✅ Generated {len(specs_created)} Events module specifications")
 print(f"📂 Output: {output_dir}")
@@ -2,14 +2,18 @@
 """
 Generate example payloads for OpenAPI specs from YANG models.
 This script extracts YANG structures and creates proper request body examples.
+Also registered as the yang-examples plugin of the post-processing pass
+(spec_plugins); not part of the default pass.
 """
 
-import json
 import re
 import os
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+import spec_io
+from spec_plugins import REPO_ROOT, spec_plugin
+
 class YANGToExampleGenerator:
     def __init__(self, yang_dir: str, openapi_dir: str):
         self.yang_dir = Path(yang_dir)
@@ -109,11 +113,10 @@ class YANGToExampleGenerator:
     
     def load_yang_file(self, yang_file: str) -> str:
         """Load YANG file content"""
-        yang_path = self.yang_dir / yang_file
-        if yang_path.exists():
-            with open(yang_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        return ""
+        if yang_file not in self.yang_cache:
+            yang_path = self.yang_dir / yang_file
+            self.yang_cache[yang_file] = yang_path.read_text(encoding='utf-8') if yang_path.exists() else ""
+        return self.yang_cache[yang_file]
     
     def generate_example_for_xpath(self, xpath: str) -> Optional[Dict[str, Any]]:
         """Generate example payload from XPath"""
@@ -151,19 +154,8 @@ class YANGToExampleGenerator:
         
         return example
     
-    def update_openapi_file(self, openapi_file: str, dry_run: bool = True):
-        """Update OpenAPI file with generated examples"""
-        
-        file_path = self.openapi_dir / openapi_file
-        if not file_path.exists():
-            print(f"❌ File not found: {openapi_file}")
-            return
-        
-        print(f"\n📄 Processing: {openapi_file}")
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            spec = json.load(f)
-        
+    def add_examples(self, spec: Dict[str, Any], verbose: bool = False) -> int:
+        """Add generated examples to the request bodies of spec; returns the number added"""
         updates = 0
         
         # Iterate through paths
@@ -194,11 +186,28 @@ class YANGToExampleGenerator:
                             if content_type in content:
                                 schema = content[content_type].get('schema', {})
                                 
-                                # Add example to schema
-                                if 'example' not in schema:
+                                # Add example to schema (unless it is shared via components)
+                                if 'example' not in schema and '$ref' not in schema \
+                                        and 'examples' not in content[content_type]:
                                     schema['example'] = example
                                     updates += 1
-                                    print(f"  ✅ Added example for {method.upper()} {path}")
+                                    if verbose:
+                                        print(f"  ✅ Added example for {method.upper()} {path}")
+        
+        return updates
+    
+    def update_openapi_file(self, openapi_file: str, dry_run: bool = True):
+        """Update OpenAPI file with generated examples"""
+        
+        file_path = self.openapi_dir / openapi_file
+        if not file_path.exists():
+            print(f"❌ File not found: {openapi_file}")
+            return
+        
+        print(f"\n📄 Processing: {openapi_file}")
+        
+        spec = spec_io.load(file_path)
+        updates = self.add_examples(spec, verbose=True)
         
         print(f"\n📊 Total updates: {updates}")
         
@@ -207,14 +216,26 @@ class YANGToExampleGenerator:
             backup_path = file_path.with_suffix('.json.backup')
             file_path.rename(backup_path)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(spec, f, indent=2)
+            spec_io.dump(spec, file_path)
             
             print(f"💾 Saved updated file (backup: {backup_path.name})")
         elif dry_run:
             print("🔍 DRY RUN - No files modified")
 
 
+_plugin_generator: Optional[YANGToExampleGenerator] = None
+
+
+@spec_plugin('yang-examples', default=False)
+def add_yang_examples(spec: Dict[str, Any], spec_file: Path) -> bool:
+    """Post-processing plugin: add_examples() with the repository's YANG modules"""
+    global _plugin_generator
+    if _plugin_generator is None:
+        _plugin_generator = YANGToExampleGenerator(str(REPO_ROOT / 'references' / '17181-YANG-modules'),
+                                                   str(spec_file.parent))
+    return _plugin_generator.add_examples(spec) > 0
+
+
 def main():
     import argparse
     
@@ -4,18 +4,53 @@ Convert IETF YANG modules to OpenAPI 3.0 specifications.
 Properly parses YANG structure using tree walking.
 """
 
-import json
+import argparse
 import re
+import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from example_rules import NO_MATCH, ExampleBudget, ExampleMemo, NameRules, add_example_arguments, varied_items
+from build_manifest import BuildManifest
+from module_pool import ModulePool, add_jobs_argument, track_groupings
+from spec_writer import SpecWriter, add_output_arguments
+
+# Integer/number examples by property name (see example_rules)
+NUMBER_EXAMPLES = NameRules([
+    ('port', 830),
+    ('timeout', 30),
+    ('mtu', 1500),
+    ('id|index', 1),
+])
+
+# String examples with context awareness
+STRING_EXAMPLES = NameRules([
+    ('ip|addr & ipv6', "2001:db8::1"),
+    ('ip|addr', "192.168.1.1"),
+    ('interface|name', "GigabitEthernet0/0/0"),
+    ('hostname|host', "router.example.com"),
+    ('username|user', "admin"),
+    ('password', "********"),
+    ('description|descr', "Example configuration"),
+    ('type', "ethernet"),
+    ('status|state', "up"),
+])
+
 
 class IETFToOpenAPI:
     """Convert IETF YANG modules to OpenAPI 3.0 with proper YANG parsing"""
 
-    def __init__(self, yang_dir: str, output_dir: str):
+    def __init__(self, yang_dir: str, output_dir: str, writer: Optional[SpecWriter] = None,
+                 example_budget: Optional[ExampleBudget] = None, builds: Optional[BuildManifest] = None,
+                 pool: Optional[ModulePool] = None):
         self.yang_dir = Path(yang_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or SpecWriter(self.output_dir)
+        self.builds = builds or BuildManifest.disabled()
+        self.pool = pool or ModulePool()
+        self.example_memo = ExampleMemo()
+        self.example_budget = example_budget or ExampleBudget()
         self.groupings_cache = {}
         self.processed_modules = []
         self.total_paths = 0
@@ -25,30 +60,25 @@ class IETFToOpenAPI:
         if not schema:
             return "example-value"
         
+        example = self.example_memo.get(schema, property_name)
+        if example is NO_MATCH:
+            example = self.example_memo.put(schema, property_name, self._build_example(schema, property_name))
+        return example
+
+    def budgeted_example(self, path: str, schema: Dict[str, Any], property_name: str = "",
+                         key: Optional[str] = None) -> Any:
+        """create_example_data() held to the per-example budget; path labels the budget report"""
+        return self.example_budget.apply(path, schema, self.create_example_data(schema, property_name), key)
+
+    def _build_example(self, schema: Dict[str, Any], property_name: str) -> Any:
+        """Uncached body of create_example_data"""
         schema_type = schema.get('type', 'string')
         
         # Handle arrays - generate 3 items for better examples
         if schema_type == 'array':
-            items_schema = schema.get('items', {})
-            example_items = []
-            for i in range(3):
-                item = self.create_example_data(items_schema, property_name)
-                # Vary data for each entry
-                if isinstance(item, dict):
-                    # Update index fields
-                    for key in list(item.keys()):
-                        if 'index' in key.lower() or 'id' in key.lower():
-                            if isinstance(item[key], str):
-                                item[key] = str(i + 1)
-                            elif isinstance(item[key], int):
-                                item[key] = i + 1
-                    # Update interface-specific fields
-                    if 'name' in item and 'interface' in property_name.lower():
-                        item['name'] = f"GigabitEthernet0/0/{i}"
-                    if 'address' in item and 'ip' in str(item.keys()).lower():
-                        item['address'] = f"192.168.{i+1}.1"
-                example_items.append(item)
-            return example_items
+            item = self.create_example_data(schema.get('items', {}), property_name)
+            is_interface = 'interface' in property_name.lower()
+            return varied_items(item, 3, lambda entry, i: self._vary_array_item(entry, i, is_interface))
         
         # Handle objects
         if schema_type == 'object':
@@ -65,37 +95,27 @@ class IETFToOpenAPI:
             return True
         
         if schema_type == 'integer' or schema_type == 'number':
-            if 'port' in name_lower:
-                return 830
-            if 'timeout' in name_lower:
-                return 30
-            if 'mtu' in name_lower:
-                return 1500
-            if 'id' in name_lower or 'index' in name_lower:
-                return 1
-            return schema.get('minimum', 0)
-        
-        # String type with context awareness
-        if 'ip' in name_lower or 'addr' in name_lower:
-            if 'ipv6' in name_lower:
-                return "2001:db8::1"
-            return "192.168.1.1"
-        if 'interface' in name_lower or 'name' in name_lower:
-            return "GigabitEthernet0/0/0"
-        if 'hostname' in name_lower or 'host' in name_lower:
-            return "router.example.com"
-        if 'username' in name_lower or 'user' in name_lower:
-            return "admin"
-        if 'password' in name_lower:
-            return "********"
-        if 'description' in name_lower or 'descr' in name_lower:
-            return "Example configuration"
-        if 'type' in name_lower:
-            return "ethernet"
-        if 'status' in name_lower or 'state' in name_lower:
-            return "up"
+            example = NUMBER_EXAMPLES.match(name_lower)
+            return schema.get('minimum', 0) if example is NO_MATCH else example
         
-        return "example-string"
+        example = STRING_EXAMPLES.match(name_lower)
+        return "example-string" if example is NO_MATCH else example
+
+    @staticmethod
+    def _vary_array_item(item: Dict[str, Any], i: int, is_interface: bool):
+        """Vary data for the i-th array entry"""
+        # Update index fields
+        for key in list(item.keys()):
+            if 'index' in key.lower() or 'id' in key.lower():
+                if isinstance(item[key], str):
+                    item[key] = str(i + 1)
+                elif isinstance(item[key], int):
+                    item[key] = i + 1
+        # Update interface-specific fields
+        if 'name' in item and is_interface:
+            item['name'] = f"GigabitEthernet0/0/{i}"
+        if 'address' in item and 'ip' in str(item.keys()).lower():
+            item['address'] = f"192.168.{i+1}.1"
 
     def find_balanced_braces(self, text: str, start_pos: int) -> int:
         """Find the end position of balanced braces"""
@@ -144,6 +164,11 @@ class IETFToOpenAPI:
         match = re.search(r'^\s*module\s+([^\s{]+)', content, re.MULTILINE)
         return match.group(1) if match else ""
 
+    def caches_groupings(self, content: str) -> bool:
+        """Whether process_module() adds this module's groupings to groupings_cache (see module_pool)"""
+        module_name = self.extract_module_name(content)
+        return module_name.startswith('ietf-')
+
     def extract_description(self, content: str) -> str:
         """Extract module description"""
         module_match = re.search(r'^\s*module\s+', content, re.MULTILINE)
@@ -231,7 +256,7 @@ class IETFToOpenAPI:
         # Extract description
         desc_match = re.search(r'\bdescription\s+"([^"]+)"', leaf_content)
         if desc_match:
-            schema['description'] = desc_match.group(1).strip()
+            schema['description'] = sys.intern(desc_match.group(1).strip())
 
         # Check if mandatory
         if re.search(r'\bmandatory\s+true\b', leaf_content):
@@ -326,7 +351,7 @@ class IETFToOpenAPI:
 
             cont_body = content[cont_start + 1:cont_end]
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', cont_body)
-            description = desc_match.group(1) if desc_match else None
+            description = sys.intern(desc_match.group(1)) if desc_match else None
 
             nested_schema = self.parse_container_or_grouping(cont_body, cont_name, depth + 1)
             if description:
@@ -472,7 +497,7 @@ class IETFToOpenAPI:
 
             # Extract description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', cont_body)
-            description = desc_match.group(1) if desc_match else f"{cont_name} container"
+            description = sys.intern(desc_match.group(1)) if desc_match else f"{cont_name} container"
 
             # Create path for this container
             current_path = path_parts + [cont_name]
@@ -513,7 +538,7 @@ class IETFToOpenAPI:
 
             # Extract description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', list_body)
-            description = desc_match.group(1) if desc_match else f"{list_name} list"
+            description = sys.intern(desc_match.group(1)) if desc_match else f"{list_name} list"
 
             # Extract key
             key_match = re.search(r'\bkey\s+"([^"]+)"', list_body)
@@ -587,6 +612,7 @@ class IETFToOpenAPI:
 
             # Store schema in components
             openapi_spec['components']['schemas'][schema_name] = path_info['schema']
+            example = self.budgeted_example(path, path_info['schema'], path_info['name'], path_info.get('key'))
 
             # Create operations
             operations = {}
@@ -603,7 +629,7 @@ class IETFToOpenAPI:
                         'content': {
                             'application/yang-data+json': {
                                 'schema': path_info['schema'],
-                                'example': self.create_example_data(path_info['schema'], path_info['name'])
+                                'example': example
                             }
                         }
                     },
@@ -624,7 +650,7 @@ class IETFToOpenAPI:
                         'content': {
                             'application/yang-data+json': {
                                 'schema': path_info['schema'],
-                                'example': self.create_example_data(path_info['schema'], path_info['name'])
+                                'example': example
                             }
                         }
                     },
@@ -646,7 +672,7 @@ class IETFToOpenAPI:
                         'content': {
                             'application/yang-data+json': {
                                 'schema': path_info['schema'],
-                                'example': self.create_example_data(path_info['schema'], path_info['name'])
+                                'example': example
                             }
                         }
                     },
@@ -682,7 +708,8 @@ class IETFToOpenAPI:
                         'content': {
                             'application/yang-data+json': {
                                 'schema': item_schema,
-                                'example': self.create_example_data(item_schema, path_info['name'])
+                                'example': self.budgeted_example(f"POST {path}", item_schema, path_info['name'],
+                                                                 path_info.get('key'))
                             }
                         }
                     },
@@ -696,16 +723,17 @@ class IETFToOpenAPI:
 
         return openapi_spec
 
-    def process_module(self, yang_file: Path) -> bool:
-        """Process a single IETF YANG module"""
+    def process_module(self, yang_file: Path) -> Optional[Dict[str, Any]]:
+        """Process a single IETF YANG module; returns its build entry (specs and summary)"""
+        self.example_memo.clear()  # schemas are per module, don't keep them alive
         try:
             content = self.read_yang_file(yang_file)
             if not content:
-                return False
+                return None
 
             module_name = self.extract_module_name(content)
             if not module_name or not module_name.startswith('ietf-'):
-                return False
+                return None
 
             print(f"Processing {module_name}...")
 
@@ -720,7 +748,7 @@ class IETFToOpenAPI:
 
             if not paths:
                 print(f"  ⚠️  No paths found for {module_name}")
-                return False
+                return None
 
             print(f"  ✓ Found {len(paths)} paths")
 
@@ -729,19 +757,17 @@ class IETFToOpenAPI:
 
             # Write to file
             output_file = self.output_dir / f"{module_name}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(openapi_spec, f, indent=2)
+            self.writer.write_spec(module_name, openapi_spec)
+            built = self.builds.record(yang_file, [module_name], {'paths': len(paths)})
 
             print(f"  ✓ Generated {output_file}")
-            self.processed_modules.append(module_name)
-            self.total_paths += len(paths)
-            return True
+            return built
 
         except Exception as e:
             print(f"  ✗ Error processing {yang_file.name}: {e}")
             import traceback
             traceback.print_exc()
-            return False
+            return None
 
     def generate_all(self):
         """Process all IETF modules"""
@@ -759,9 +785,24 @@ class IETFToOpenAPI:
         print(f"Found {len(yang_files)} IETF modules\n")
 
         success_count = 0
-        for yang_file in yang_files:
-            if self.process_module(yang_file):
+        # Modules reuse their specs only if the groupings they resolve from earlier ones are unchanged
+        track_groupings(self, yang_files)
+        pending = []
+        for yang_file in self.builds.owned(yang_files):
+            reused = self.builds.reuse(yang_file)
+            if reused is None:
+                pending.append(yang_file)
+                continue
+            self.processed_modules.extend(reused['specs'])
+            self.total_paths += reused['summary']['paths']
+            success_count += 1
+
+        for built in self.pool.map(self, 'process_module', pending, sources=yang_files):
+            if built:
+                self.processed_modules.extend(built['specs'])
+                self.total_paths += built['summary']['paths']
                 success_count += 1
+        self.pool.report()
 
         print(f"\n{'='*70}")
         print(f"Generation Complete: {success_count}/{len(yang_files)} modules")
@@ -776,9 +817,9 @@ class IETFToOpenAPI:
             'timestamp': '2026-01-30'
         }
 
-        manifest_file = self.output_dir / 'manifest.json'
-        with open(manifest_file, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_file = self.writer.write_manifest(manifest)
+        self.writer.finalize()
+        self.builds.save()
 
         print(f"Manifest: {manifest_file}")
 
@@ -788,8 +829,21 @@ def main():
     yang_dir = script_dir.parent / 'references' / '17181-YANG-modules'
     output_dir = script_dir.parent / 'swagger-ietf-model' / 'api'
 
-    converter = IETFToOpenAPI(str(yang_dir), str(output_dir))
+    parser = argparse.ArgumentParser(description='Generate IETF OpenAPI specifications')
+    add_output_arguments(parser)
+    add_jobs_argument(parser)
+    add_example_arguments(parser)
+    args = parser.parse_args()
+
+    writer = SpecWriter.from_args(output_dir, args)
+    example_budget = ExampleBudget.from_args(args)
+    builds = BuildManifest.from_args(writer, yang_dir, __file__, args,
+                                     options={'example_max_bytes': example_budget.max_bytes,
+                                              'example_max_nodes': example_budget.max_nodes})
+    converter = IETFToOpenAPI(str(yang_dir), str(output_dir), writer=writer, example_budget=example_budget,
+                              builds=builds, pool=ModulePool.from_args(args))
     converter.generate_all()
+    converter.example_budget.report(args.example_budget_report)
 
 if __name__ == '__main__':
     main()
@@ -4,19 +4,57 @@ Convert MIB YANG modules to OpenAPI 3.0 specifications.
 Processes SMIv2-to-YANG translated MIB files.
 """
 
-import json
+import argparse
 import re
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from example_rules import NO_MATCH, ExampleBudget, ExampleMemo, NameRules, add_example_arguments, varied_items
+from build_manifest import BuildManifest
+from module_pool import ModulePool, add_jobs_argument
+from schema_pool import SchemaPool
+from spec_writer import SpecWriter, add_output_arguments
+
+# Integer/number examples - specific MIB counter/gauge types (see example_rules)
+NUMBER_EXAMPLES = NameRules([
+    ('counter|octets|packets', 1234567890),
+    ('mtu', 1500),
+    ('speed', 1000000000),  # 1 Gbps in bits/sec
+    ('index|ifindex', 1),
+    ('admin|oper', 1),  # up(1)
+])
+
+# String examples with context awareness
+STRING_EXAMPLES = NameRules([
+    ('mac', "00:11:22:33:44:55"),
+    ('phys & address', "00:11:22:33:44:55"),
+    ('ip|addr & ipv6', "2001:db8::1"),
+    ('ip|addr', "192.168.1.1"),
+    ('interface|ifname|descr', "GigabitEthernet1/0/1"),
+    ('type', "ethernetCsmacd(6)"),
+    ('status|state', "up(1)"),
+    ('name', "interface-1"),
+    ('oid', "1.3.6.1.2.1.1"),
+])
+
 
 class MIBToOpenAPI:
     """Convert MIB YANG modules to OpenAPI 3.0 with proper YANG parsing"""
 
-    def __init__(self, yang_dir: str, output_dir: str):
+    def __init__(self, yang_dir: str, output_dir: str, writer: Optional[SpecWriter] = None,
+                 example_budget: Optional[ExampleBudget] = None, builds: Optional[BuildManifest] = None,
+                 pool: Optional[ModulePool] = None):
         self.yang_dir = Path(yang_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or SpecWriter(self.output_dir)
+        self.builds = builds or BuildManifest.disabled()
+        self.pool = pool or ModulePool()
+        self.example_memo = ExampleMemo()
+        self.schema_pool = SchemaPool()
+        self.example_budget = example_budget or ExampleBudget()
         self.groupings_cache = {}
         self.processed_modules = []
 
@@ -25,31 +63,24 @@ class MIBToOpenAPI:
         if not schema:
             return "example-value"
         
+        example = self.example_memo.get(schema, property_name)
+        if example is NO_MATCH:
+            example = self.example_memo.put(schema, property_name, self._build_example(schema, property_name))
+        return example
+
+    def budgeted_example(self, path: str, schema: Dict[str, Any], property_name: str = "",
+                         key: Optional[str] = None) -> Any:
+        """create_example_data() held to the per-example budget; path labels the budget report"""
+        return self.example_budget.apply(path, schema, self.create_example_data(schema, property_name), key)
+
+    def _build_example(self, schema: Dict[str, Any], property_name: str) -> Any:
+        """Uncached body of create_example_data"""
         schema_type = schema.get('type', 'string')
         
         # Handle arrays - generate 3 items for better examples
         if schema_type == 'array':
-            items_schema = schema.get('items', {})
-            example_items = []
-            for i in range(3):
-                item = self.create_example_data(items_schema, property_name)
-                # Vary data for each entry
-                if isinstance(item, dict):
-                    # Update index fields
-                    for key in list(item.keys()):
-                        if 'Index' in key or 'index' in key:
-                            item[key] = str(i + 1) if isinstance(item[key], str) else i + 1
-                    # Update interface-specific fields
-                    if 'ifDescr' in item:
-                        item['ifDescr'] = f"GigabitEthernet1/0/{i + 1}"
-                    if 'ifPhysAddress' in item:
-                        item['ifPhysAddress'] = f"00:11:22:33:44:{i+1:02x}"
-                    if 'ifInOctets' in item:
-                        item['ifInOctets'] = 1234567890 + (i * 1000000)
-                    if 'ifOutOctets' in item:
-                        item['ifOutOctets'] = 1234567890 + (i * 1000000)
-                example_items.append(item)
-            return example_items
+            item = self.create_example_data(schema.get('items', {}), property_name)
+            return varied_items(item, 3, self._vary_array_item)
         
         # Handle objects
         if schema_type == 'object':
@@ -66,38 +97,28 @@ class MIBToOpenAPI:
             return True
         
         if schema_type == 'integer' or schema_type == 'number':
-            # Check for specific MIB counter/gauge types
-            if 'counter' in name_lower or 'octets' in name_lower or 'packets' in name_lower:
-                return 1234567890
-            if 'mtu' in name_lower:
-                return 1500
-            if 'speed' in name_lower:
-                return 1000000000  # 1 Gbps in bits/sec
-            if 'index' in name_lower or 'ifindex' in name_lower:
-                return 1
-            if 'admin' in name_lower or 'oper' in name_lower:
-                return 1  # up(1)
-            return schema.get('minimum', 0)
-        
-        # String type with context awareness
-        if 'mac' in name_lower or 'phys' in name_lower and 'address' in name_lower:
-            return "00:11:22:33:44:55"
-        if 'ip' in name_lower or 'addr' in name_lower:
-            if 'ipv6' in name_lower:
-                return "2001:db8::1"
-            return "192.168.1.1"
-        if 'interface' in name_lower or 'ifname' in name_lower or 'descr' in name_lower:
-            return "GigabitEthernet1/0/1"
-        if 'type' in name_lower:
-            return "ethernetCsmacd(6)"
-        if 'status' in name_lower or 'state' in name_lower:
-            return "up(1)"
-        if 'name' in name_lower:
-            return "interface-1"
-        if 'oid' in name_lower:
-            return "1.3.6.1.2.1.1"
+            example = NUMBER_EXAMPLES.match(name_lower)
+            return schema.get('minimum', 0) if example is NO_MATCH else example
         
-        return "example-string"
+        example = STRING_EXAMPLES.match(name_lower)
+        return "example-string" if example is NO_MATCH else example
+
+    @staticmethod
+    def _vary_array_item(item: Dict[str, Any], i: int):
+        """Vary data for the i-th array entry"""
+        # Update index fields
+        for key in list(item.keys()):
+            if 'Index' in key or 'index' in key:
+                item[key] = str(i + 1) if isinstance(item[key], str) else i + 1
+        # Update interface-specific fields
+        if 'ifDescr' in item:
+            item['ifDescr'] = f"GigabitEthernet1/0/{i + 1}"
+        if 'ifPhysAddress' in item:
+            item['ifPhysAddress'] = f"00:11:22:33:44:{i+1:02x}"
+        if 'ifInOctets' in item:
+            item['ifInOctets'] = 1234567890 + (i * 1000000)
+        if 'ifOutOctets' in item:
+            item['ifOutOctets'] = 1234567890 + (i * 1000000)
 
     def find_balanced_braces(self, text: str, start_pos: int) -> int:
         """Find the end position of balanced braces"""
@@ -146,6 +167,11 @@ class MIBToOpenAPI:
         match = re.search(r'^\s*module\s+([^\s{]+)', content, re.MULTILINE)
         return match.group(1) if match else ""
 
+    def caches_groupings(self, content: str) -> bool:
+        """Whether process_mib() adds this module's groupings to groupings_cache (see module_pool)"""
+        module_name = self.extract_module_name(content)
+        return bool(module_name) and ('container ' in content or 'list ' in content)
+
     def extract_description(self, content: str) -> str:
         """Extract module description"""
         module_match = re.search(r'^\s*module\s+', content, re.MULTILINE)
@@ -165,7 +191,7 @@ class MIBToOpenAPI:
         # Extract description
         desc_match = re.search(r'description\s+"([^"]+)"', leaf_content)
         if desc_match:
-            schema["description"] = desc_match.group(1).strip()
+            schema["description"] = sys.intern(desc_match.group(1).strip())
 
         # Extract type
         type_match = re.search(r'type\s+([^;\s{]+)', leaf_content)
@@ -177,7 +203,7 @@ class MIBToOpenAPI:
         if re.search(r'\bmandatory\s+true', leaf_content):
             schema["x-mandatory"] = True
 
-        return schema
+        return self.schema_pool.intern(schema)
 
     def yang_type_to_json_schema(self, yang_type: str) -> Dict[str, Any]:
         """Convert YANG type to JSON Schema type"""
@@ -229,7 +255,7 @@ class MIBToOpenAPI:
         # Extract description
         desc_match = re.search(r'description\s+"([^"]+)"', content[:500])
         if desc_match:
-            schema["description"] = desc_match.group(1).strip()
+            schema["description"] = sys.intern(desc_match.group(1).strip())
 
         # Parse nested elements
         properties_target = schema["items"]["properties"] if is_list else schema["properties"]
@@ -296,7 +322,7 @@ class MIBToOpenAPI:
 
                 pos = leaf_end + 1 if leaf_end != -1 else pos + leaf_match.end()
 
-        return schema
+        return self.schema_pool.intern(schema)
 
     def extract_paths(self, content: str, module_name: str) -> Dict[str, Any]:
         """Extract RESTCONF paths from YANG module"""
@@ -361,7 +387,7 @@ class MIBToOpenAPI:
             if container_path not in paths:
                 # Generate example from schema
                 container_schema = self.parse_container_or_grouping(container_content, container_name, False)
-                example_data = self.create_example_data(container_schema, container_name)
+                example_data = self.budgeted_example(container_path, container_schema, container_name)
                 
                 paths[container_path] = {
                     "get": {
@@ -420,7 +446,7 @@ class MIBToOpenAPI:
             if list_path not in paths:
                 # Generate example from schema
                 list_schema = self.parse_container_or_grouping(list_content, list_name, True)
-                example_item = self.create_example_data(list_schema.get('items', {}), list_name)
+                example_item = self.budgeted_example(list_path, list_schema.get('items', {}), list_name, key_params)
                 
                 paths[list_path] = {
                     "get": {
@@ -448,7 +474,7 @@ class MIBToOpenAPI:
             if item_path not in paths:
                 # Generate example from schema (reuse from above)
                 list_schema = self.parse_container_or_grouping(list_content, list_name, True)
-                example_item = self.create_example_data(list_schema.get('items', {}), list_name)
+                example_item = self.budgeted_example(item_path, list_schema.get('items', {}), list_name, key_params)
                 item_schema = list_schema.get('items', {"type": "object"})
                 
                 paths[item_path] = {
@@ -530,6 +556,8 @@ class MIBToOpenAPI:
 
     def convert_to_openapi(self, yang_file: Path) -> Dict[str, Any]:
         """Convert a YANG file to OpenAPI 3.0 specification"""
+        self.example_memo.clear()  # schemas are per module, don't keep them alive
+        self.schema_pool.clear()
         content = self.read_yang_file(yang_file)
         if not content:
             return None
@@ -612,15 +640,26 @@ This YANG model exists for SMIv2-to-YANG translation purposes, but MIB data on I
             ]
         }
 
-        self.processed_modules.append({
-            "name": module_name,
-            "file": yang_file.name,
-            "paths": len(paths),
-            "schemas": len(schemas)
-        })
-
         return openapi_spec
 
+    def process_mib(self, mib_file: Path) -> Optional[Dict[str, Any]]:
+        """Convert and write one MIB module; returns its build entry, or None if it was skipped"""
+        print(f"Processing: {mib_file.name}...")
+
+        openapi_spec = self.convert_to_openapi(mib_file)
+        if not openapi_spec:
+            return None
+
+        output_file = self.output_dir / f"{mib_file.stem}.json"
+        self.writer.write_spec(mib_file.stem, openapi_spec)
+        print(f"  + Generated: {output_file.name} ({len(openapi_spec['paths'])} paths)")
+        return self.builds.record(mib_file, [mib_file.stem], {
+            "name": openapi_spec['tags'][0]['name'],
+            "file": mib_file.name,
+            "paths": len(openapi_spec['paths']),
+            "schemas": len(openapi_spec['components']['schemas'])
+        })
+
     def process_all_mibs(self):
         """Process all MIB YANG files"""
         mib_files = sorted(self.yang_dir.glob('*.yang'))
@@ -629,22 +668,24 @@ This YANG model exists for SMIv2-to-YANG translation purposes, but MIB data on I
         print(f"Processing {len(mib_files)} MIB YANG files from MIBS directory")
         print(f"{'='*70}\n")
 
-        processed_count = 0
-        skipped_count = 0
-
-        for mib_file in mib_files:
-            print(f"Processing: {mib_file.name}...")
+        # Manifest entries stay in file order whether a module was reused or rebuilt
+        entries = {}
+        pending = []
+        for mib_file in self.builds.owned(mib_files):
+            reused = self.builds.reuse(mib_file)
+            if reused is None:
+                pending.append(mib_file)
+            else:
+                entries[mib_file] = reused
 
-            openapi_spec = self.convert_to_openapi(mib_file)
+        for mib_file, built in zip(pending, self.pool.map(self, 'process_mib', pending, sources=mib_files)):
+            if built:
+                entries[mib_file] = built
+        self.pool.report()
 
-            if openapi_spec:
-                output_file = self.output_dir / f"{mib_file.stem}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(openapi_spec, f, indent=2)
-                print(f"  + Generated: {output_file.name} ({len(openapi_spec['paths'])} paths)")
-                processed_count += 1
-            else:
-                skipped_count += 1
+        self.processed_modules = [entries[mib_file]['summary'] for mib_file in mib_files if mib_file in entries]
+        processed_count = len(self.processed_modules)
+        skipped_count = len(mib_files) - processed_count
 
         print(f"\n{'='*70}")
         print(f"MIB Generation Complete!")
@@ -662,9 +703,9 @@ This YANG model exists for SMIv2-to-YANG translation purposes, but MIB data on I
             "modules": self.processed_modules
         }
 
-        manifest_file = self.output_dir / "manifest.json"
-        with open(manifest_file, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_file = self.writer.write_manifest(manifest)
+        self.writer.finalize()
+        self.builds.save()
 
         print(f"Manifest saved: {manifest_file}")
 
@@ -683,8 +724,21 @@ def main():
     yang_dir = script_dir.parent / 'references' / '17181-YANG-modules' / 'MIBS'
     output_dir = script_dir.parent / 'swagger-mib-model' / 'api'
 
-    converter = MIBToOpenAPI(str(yang_dir), str(output_dir))
+    parser = argparse.ArgumentParser(description='Generate MIB OpenAPI specifications')
+    add_output_arguments(parser)
+    add_jobs_argument(parser)
+    add_example_arguments(parser)
+    args = parser.parse_args()
+
+    writer = SpecWriter.from_args(output_dir, args)
+    example_budget = ExampleBudget.from_args(args)
+    builds = BuildManifest.from_args(writer, yang_dir, __file__, args,
+                                     options={'example_max_bytes': example_budget.max_bytes,
+                                              'example_max_nodes': example_budget.max_nodes})
+    converter = MIBToOpenAPI(str(yang_dir), str(output_dir), writer=writer, example_budget=example_budget,
+                             builds=builds, pool=ModulePool.from_args(args))
     modules = converter.process_all_mibs()
+    converter.example_budget.report(args.example_budget_report)
 
     print(f"\n+ Successfully generated {len(modules)} MIB OpenAPI specifications")
     print(f"  Output directory: {output_dir}")
@@ -5,19 +5,121 @@ Properly parses YANG structure instead of using hard-coded examples.
 Splits into logical feature categories for better organization.
 """
 
-import json
+import argparse
 import re
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from build_manifest import BuildManifest
+from example_rules import NO_MATCH, ExampleBudget, ExampleMemo, NameRules, add_example_arguments, varied_items
+from module_pool import ModulePool, add_jobs_argument
+from schema_pool import SchemaPool
+import spec_io
+from spec_writer import SpecWriter, add_output_arguments
+
+# Property-name examples, checked in order before the schema type (see example_rules)
+NAME_EXAMPLES = NameRules([
+    # Hostname examples - realistic production data center naming
+    ('hostname', 'DC1-CORE-SW01'),
+    # Version examples
+    ('version & !ip|software|protocol', '17.9'),
+    # Config register examples
+    ('config-register', '0x2102'),
+    # Interface examples - production port numbers
+    ('interface|name & loopback', 'Loopback0'),
+    ('interface|name & vlan', 'Vlan100'),
+    ('interface|name & tunnel', 'Tunnel10'),
+    ('interface|name & port-channel|portchannel', 'Port-channel1'),
+    ('interface|name & tengigabit', 'TenGigabitEthernet1/1/1'),
+    ('interface|name', 'GigabitEthernet1/0/24'),
+    # IP address examples - corporate/private ranges
+    ('ip-address|ipaddress|address & ipv6|v6', '2001:db8:1::1'),
+    ('ip-address|ipaddress|address & loopback', '10.255.255.1'),
+    ('ip-address|ipaddress|address & mgmt|management', '172.16.0.1'),
+    ('ip-address|ipaddress|address', '10.10.10.1'),
+    # Network mask examples
+    ('mask|netmask', '255.255.255.0'),
+    # Prefix examples - realistic network addressing
+    ('prefix & ipv6', '2001:db8:1::/64'),
+    ('prefix', '10.10.0.0/16'),
+    # MAC address examples
+    ('mac & address', '00:1A:2B:3C:4D:5E'),
+    # VLAN examples - common production VLANs
+    ('vlan & id', 100),
+    # VRF examples
+    ('vrf', 'PROD-VRF'),
+    # AS number examples - private AS range
+    ('as|asn', 65001),
+    # Description examples - network engineer style
+    ('description|descr & interface', 'UPLINK_TO_DC2_CORE_SW01'),
+    ('description|descr & bgp|peer', 'BGP_PEER_AS65002'),
+    ('description|descr & vlan', 'DATA_VLAN_FLOOR2'),
+    ('description|descr', 'Managed_via_RESTCONF'),
+    # Banner examples
+    ('banner & motd', '*** AUTHORIZED ACCESS ONLY - All activity monitored ***'),
+    ('banner & login', 'Corporate Network - Authenticate to proceed'),
+    ('banner', 'Authorized Users Only'),
+    # Domain examples
+    ('domain', 'corp.example.com'),
+    # Username examples
+    ('username|user', 'netadmin'),
+    # Password examples
+    ('password|secret', '********'),
+    # Port examples
+    ('port & ssh', 22),
+    ('port & https', 443),
+    ('port', 8443),
+    # Community string examples
+    ('community', 'RO_SNMP_v2c'),
+    # Server/host examples
+    ('server|host & ntp', 'ntp.corp.example.com'),
+    ('server|host & syslog|log', 'syslog.corp.example.com'),
+    ('server|host & tacacs', 'tacacs.corp.example.com'),
+    ('server|host & radius', 'radius.corp.example.com'),
+    ('server|host', 'server.corp.example.com'),
+])
+
+# Context-specific integer values
+INTEGER_EXAMPLES = NameRules([
+    ('mtu', 1500),
+    ('bandwidth', 1000000),
+    ('delay', 100),
+    ('metric', 10),
+    ('cost', 1),
+    ('priority', 100),
+    ('weight', 1),
+])
+
 
 class NativeToOpenAPI:
     """Convert Cisco-IOS-XE-native YANG to OpenAPI 3.0 with proper YANG parsing"""
 
-    def __init__(self, yang_dir: str, output_dir: str):
+    # Most paths a container/list subtree may emit below its root before it is
+    # collapsed into the root operation (its schema already covers the subtree)
+    DEFAULT_PATH_BUDGET = 100
+    # Categories whose spec would be larger are split alphabetically into parts
+    MAX_FILE_SIZE_MB = 5
+
+    def __init__(self, yang_dir: str, output_dir: str, writer: Optional[SpecWriter] = None,
+                 example_budget: Optional[ExampleBudget] = None, path_budget: int = DEFAULT_PATH_BUDGET,
+                 builds: Optional[BuildManifest] = None, pool: Optional[ModulePool] = None):
         self.yang_dir = Path(yang_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or SpecWriter(self.output_dir)
+        self.builds = builds or BuildManifest.disabled()
+        self.pool = pool or ModulePool()
+        self.example_memo = ExampleMemo()
+        self.example_budget = example_budget or ExampleBudget()
+        self.structure_keys: Dict[int, Tuple[Any, bytes]] = {}
+        self.schema_pool = SchemaPool()
+        self.path_budget = path_budget or 0
+        self.collapsed_subtrees: Dict[str, Dict[str, Any]] = {}
+        # Paths per category and quick-start collection, set by generate_all()
+        self.categorized_paths: Dict[str, List[Dict[str, Any]]] = {}
+        self.quick_starts: Dict[str, List[Dict[str, Any]]] = {}
         self.groupings_cache = {}
         self.typedefs_cache = {}
         self.processed_paths = []
@@ -73,6 +175,28 @@ class NativeToOpenAPI:
 
     def create_example_data(self, schema: Dict[str, Any], property_name: str = '') -> Any:
         """Generate context-aware example data based on schema and property name"""
+        example = self.example_memo.get(schema, property_name)
+        if example is NO_MATCH:
+            example = self.example_memo.put(schema, property_name, self._build_example(schema, property_name))
+        return example
+
+    def budgeted_example(self, path: str, schema: Dict[str, Any], property_name: str = '',
+                         key: Optional[str] = None) -> Any:
+        """create_example_data() held to the per-example budget; path labels the budget report"""
+        return self.example_budget.apply(path, schema, self.create_example_data(schema, property_name), key)
+
+    def structure_key(self, node: Any) -> bytes:
+        """
+        Canonical serialization of a schema or example, cached per object (and
+        pinning it, like ExampleMemo), so structurally identical subtrees compare equal
+        """
+        entry = self.structure_keys.get(id(node))
+        if entry is None:
+            entry = self.structure_keys[id(node)] = (node, spec_io.dumpb(node, pretty=False, sort_keys=True))
+        return entry[1]
+
+    def _build_example(self, schema: Dict[str, Any], property_name: str) -> Any:
+        """Uncached body of create_example_data"""
         schema_type = schema.get('type', 'string')
         
         # Handle enumerations
@@ -81,158 +205,16 @@ class NativeToOpenAPI:
         
         # Context-aware examples based on property name
         name_lower = property_name.lower()
-        
-        # Hostname examples - realistic production data center naming
-        if 'hostname' in name_lower:
-            return 'DC1-CORE-SW01'
-        
-        # Version examples
-        if 'version' in name_lower and not any(x in name_lower for x in ['ip', 'software', 'protocol']):
-            return '17.9'
-        
-        # Config register examples
-        if 'config-register' in name_lower:
-            return '0x2102'
-        
-        # Interface examples - production port numbers
-        if 'interface' in name_lower or 'name' in name_lower:
-            if 'loopback' in name_lower:
-                return 'Loopback0'
-            elif 'vlan' in name_lower:
-                return 'Vlan100'
-            elif 'tunnel' in name_lower:
-                return 'Tunnel10'
-            elif 'port-channel' in name_lower or 'portchannel' in name_lower:
-                return 'Port-channel1'
-            elif 'tengigabit' in name_lower:
-                return 'TenGigabitEthernet1/1/1'
-            else:
-                return 'GigabitEthernet1/0/24'
-        
-        # IP address examples - corporate/private ranges
-        if any(x in name_lower for x in ['ip-address', 'ipaddress', 'address']):
-            if 'ipv6' in name_lower or 'v6' in name_lower:
-                return '2001:db8:1::1'
-            elif 'loopback' in name_lower:
-                return '10.255.255.1'
-            elif 'mgmt' in name_lower or 'management' in name_lower:
-                return '172.16.0.1'
-            return '10.10.10.1'
-        
-        # Network mask examples
-        if 'mask' in name_lower or 'netmask' in name_lower:
-            return '255.255.255.0'
-        
-        # Prefix examples - realistic network addressing
-        if 'prefix' in name_lower:
-            if 'ipv6' in name_lower:
-                return '2001:db8:1::/64'
-            return '10.10.0.0/16'
-        
-        # MAC address examples
-        if 'mac' in name_lower and 'address' in name_lower:
-            return '00:1A:2B:3C:4D:5E'
-        
-        # VLAN examples - common production VLANs
-        if 'vlan' in name_lower and 'id' in name_lower:
-            return 100
-        
-        # VRF examples
-        if 'vrf' in name_lower:
-            return 'PROD-VRF'
-        
-        # AS number examples - private AS range
-        if 'as' in name_lower or 'asn' in name_lower:
-            return 65001
-        
-        # Description examples - network engineer style
-        if 'description' in name_lower or 'descr' in name_lower:
-            if 'interface' in name_lower:
-                return 'UPLINK_TO_DC2_CORE_SW01'
-            elif 'bgp' in name_lower or 'peer' in name_lower:
-                return 'BGP_PEER_AS65002'
-            elif 'vlan' in name_lower:
-                return 'DATA_VLAN_FLOOR2'
-            return 'Managed_via_RESTCONF'
-        
-        # Banner examples
-        if 'banner' in name_lower:
-            if 'motd' in name_lower:
-                return '*** AUTHORIZED ACCESS ONLY - All activity monitored ***'
-            elif 'login' in name_lower:
-                return 'Corporate Network - Authenticate to proceed'
-            return 'Authorized Users Only'
-        
-        # Domain examples
-        if 'domain' in name_lower:
-            return 'corp.example.com'
-        
-        # Username examples
-        if 'username' in name_lower or 'user' in name_lower:
-            return 'netadmin'
-        
-        # Password examples
-        if 'password' in name_lower or 'secret' in name_lower:
-            return '********'
-        
-        # Port examples
-        if 'port' in name_lower:
-            if 'ssh' in name_lower:
-                return 22
-            elif 'https' in name_lower:
-                return 443
-            return 8443
-        
-        # Community string examples
-        if 'community' in name_lower:
-            return 'RO_SNMP_v2c'
-        
-        # Server/host examples
-        if 'server' in name_lower or 'host' in name_lower:
-            if 'ntp' in name_lower:
-                return 'ntp.corp.example.com'
-            elif 'syslog' in name_lower or 'log' in name_lower:
-                return 'syslog.corp.example.com'
-            elif 'tacacs' in name_lower:
-                return 'tacacs.corp.example.com'
-            elif 'radius' in name_lower:
-                return 'radius.corp.example.com'
-            return 'server.corp.example.com'
+        example = NAME_EXAMPLES.match(name_lower)
+        if example is not NO_MATCH:
+            return example
         
         # Handle based on schema type
         if schema_type == 'array':
             items_schema = schema.get('items', {'type': 'string'})
             # Generate 3 example items with production-realistic variations
-            examples = []
-            for i in range(3):
-                item = self.create_example_data(items_schema, property_name)
-                if isinstance(item, dict):
-                    # Vary numeric and interface fields with production patterns
-                    if 'name' in item:
-                        if isinstance(item['name'], str):
-                            if 'GigabitEthernet' in item['name']:
-                                item['name'] = f'GigabitEthernet1/0/{24+i}'
-                            elif 'TenGigabitEthernet' in item['name']:
-                                item['name'] = f'TenGigabitEthernet1/1/{i+1}'
-                            elif 'Vlan' in item['name']:
-                                item['name'] = f'Vlan{100+i*100}'  # 100, 200, 300
-                            elif 'Loopback' in item['name']:
-                                item['name'] = f'Loopback{i}'
-                    if 'vlan' in item and 'id' in str(item.get('vlan', '')):
-                        item['vlan'] = [100, 200, 300][i]
-                    if 'id' in item and isinstance(item['id'], int):
-                        item['id'] = i + 1
-                    if 'address' in item:
-                        if isinstance(item['address'], str):
-                            if '10.10' in item['address']:
-                                item['address'] = f'10.10.{i+1}.1'
-                            elif '2001:db8' in item['address']:
-                                item['address'] = f'2001:db8:{i+1}::1'
-                    if 'description' in item:
-                        if isinstance(item['description'], str):
-                            item['description'] = f'LINK_TO_DEVICE_{chr(65+i)}'  # A, B, C
-                examples.append(item)
-            return examples
+            item = self.create_example_data(items_schema, property_name)
+            return varied_items(item, 3, self._vary_array_item)
         
         elif schema_type == 'object':
             properties = schema.get('properties', {})
@@ -245,26 +227,14 @@ class NativeToOpenAPI:
             return example_obj
         
         elif schema_type == 'integer':
-            minimum = schema.get('minimum', 0)
-            maximum = schema.get('maximum', 100)
-            
             # Context-specific integer values
-            if 'mtu' in name_lower:
-                return 1500
-            elif 'bandwidth' in name_lower:
-                return 1000000
-            elif 'delay' in name_lower:
-                return 100
-            elif 'metric' in name_lower:
-                return 10
-            elif 'cost' in name_lower:
-                return 1
-            elif 'priority' in name_lower:
-                return 100
-            elif 'weight' in name_lower:
-                return 1
+            example = INTEGER_EXAMPLES.match(name_lower)
+            if example is not NO_MATCH:
+                return example
             
             # Use minimum if it's reasonable, otherwise use a sensible default
+            minimum = schema.get('minimum', 0)
+            maximum = schema.get('maximum', 100)
             if minimum >= 0 and minimum <= 1000:
                 return minimum + 1 if minimum < maximum else minimum
             return 1
@@ -289,6 +259,33 @@ class NativeToOpenAPI:
                 return 'example-name'
             return 'example-string'
 
+    @staticmethod
+    def _vary_array_item(item: Dict[str, Any], i: int):
+        """Vary numeric and interface fields of the i-th array item with production patterns"""
+        if 'name' in item:
+            if isinstance(item['name'], str):
+                if 'GigabitEthernet' in item['name']:
+                    item['name'] = f'GigabitEthernet1/0/{24+i}'
+                elif 'TenGigabitEthernet' in item['name']:
+                    item['name'] = f'TenGigabitEthernet1/1/{i+1}'
+                elif 'Vlan' in item['name']:
+                    item['name'] = f'Vlan{100+i*100}'  # 100, 200, 300
+                elif 'Loopback' in item['name']:
+                    item['name'] = f'Loopback{i}'
+        if 'vlan' in item and 'id' in str(item.get('vlan', '')):
+            item['vlan'] = [100, 200, 300][i]
+        if 'id' in item and isinstance(item['id'], int):
+            item['id'] = i + 1
+        if 'address' in item:
+            if isinstance(item['address'], str):
+                if '10.10' in item['address']:
+                    item['address'] = f'10.10.{i+1}.1'
+                elif '2001:db8' in item['address']:
+                    item['address'] = f'2001:db8:{i+1}::1'
+        if 'description' in item:
+            if isinstance(item['description'], str):
+                item['description'] = f'LINK_TO_DEVICE_{chr(65+i)}'  # A, B, C
+
     def find_balanced_braces(self, text: str, start_pos: int) -> int:
         """Find the end position of balanced braces"""
         if start_pos >= len(text) or text[start_pos] != '{':
@@ -388,14 +385,14 @@ class NativeToOpenAPI:
         # Extract description
         desc_match = re.search(r'\bdescription\s+"([^"]+)"', leaf_content)
         if desc_match:
-            schema['description'] = desc_match.group(1).strip()[:500]
+            schema['description'] = sys.intern(desc_match.group(1).strip()[:500])
 
-        return schema
+        return self.schema_pool.intern(schema)
 
     def parse_container_or_list(self, content: str, name: str, depth: int = 0) -> Dict[str, Any]:
         """Recursively parse container/list structure"""
         if depth > 15:
-            return {'type': 'object', 'description': f'{name} (depth limit)'}
+            return self.schema_pool.intern({'type': 'object', 'description': f'{name} (depth limit)'})
 
         properties = {}
 
@@ -479,7 +476,7 @@ class NativeToOpenAPI:
         schema = {'type': 'object'}
         if properties:
             schema['properties'] = properties
-        return schema
+        return self.schema_pool.intern(schema)
 
     def _remove_groupings_and_typedefs(self, content: str) -> str:
         """Remove grouping and typedef blocks"""
@@ -502,6 +499,30 @@ class NativeToOpenAPI:
 
         return result
 
+    def within_path_budget(self, roots: List[Dict[str, Any]], nested_paths: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        nested_paths, or nothing if the subtree under roots (a container, or a
+        list's collection and item paths) emits more than the path budget. The
+        collapse is recorded and noted on the root paths. Subtrees are checked
+        bottom-up, so nested_paths are already within budget themselves.
+        """
+        if not self.path_budget or len(nested_paths) <= self.path_budget:
+            return nested_paths
+
+        root_path = roots[-1]['path']
+        # Collapses inside this subtree are subsumed by this one
+        dropped = len(nested_paths)
+        for path in [p for p in self.collapsed_subtrees if p.startswith(root_path + '/')]:
+            dropped += self.collapsed_subtrees.pop(path)['collapsed_paths']
+        self.collapsed_subtrees[root_path] = {
+            'path': root_path,
+            'depth': roots[-1]['depth'],
+            'collapsed_paths': dropped,
+        }
+        for root in roots:
+            root['collapsed'] = dropped
+        return []
+
     def extract_nested_paths(self, content: str, parent_path: str, depth: int = 0, max_depth: int = 10) -> List[Dict[str, Any]]:
         """Recursively extract all nested paths from YANG content"""
         paths = []
@@ -528,24 +549,25 @@ class NativeToOpenAPI:
             
             # Get description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', cont_body)
-            description = desc_match.group(1)[:200] if desc_match else f"{cont_name} configuration"
+            description = sys.intern(desc_match.group(1)[:200]) if desc_match else f"{cont_name} configuration"
             
             # Parse schema
             schema = self.parse_container_or_list(cont_body, cont_name, 0)
             
             full_path = f"{parent_path}/{cont_name}"
-            paths.append({
+            container_info = {
                 'path': full_path,
                 'name': cont_name,
                 'description': description,
                 'schema': schema,
                 'is_list': False,
                 'depth': depth
-            })
+            }
+            paths.append(container_info)
             
             # Recursively extract nested paths
             nested_paths = self.extract_nested_paths(cont_body, full_path, depth + 1, max_depth)
-            paths.extend(nested_paths)
+            paths.extend(self.within_path_budget([container_info], nested_paths))
             
             pos = cont_end + 1
         
@@ -572,7 +594,7 @@ class NativeToOpenAPI:
             
             # Get description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', list_body)
-            description = desc_match.group(1)[:200] if desc_match else f"{list_name} list"
+            description = sys.intern(desc_match.group(1)[:200]) if desc_match else f"{list_name} list"
             
             # Parse schema
             schema = self.parse_container_or_list(list_body, list_name, 0)
@@ -581,18 +603,19 @@ class NativeToOpenAPI:
             full_path_item = f"{parent_path}/{list_name}={{{key_name}}}"
             
             # Collection endpoint
-            paths.append({
+            collection_info = {
                 'path': full_path_collection,
                 'name': list_name,
                 'description': f"{description} (collection)",
-                'schema': {'type': 'array', 'items': schema},
+                'schema': self.schema_pool.intern({'type': 'array', 'items': schema}),
                 'is_list': True,
                 'is_collection': True,
                 'depth': depth
-            })
+            }
+            paths.append(collection_info)
             
             # Individual item endpoint
-            paths.append({
+            item_info = {
                 'path': full_path_item,
                 'name': f"{list_name}-item",
                 'description': description,
@@ -601,11 +624,12 @@ class NativeToOpenAPI:
                 'is_collection': False,
                 'key': key_name,
                 'depth': depth
-            })
+            }
+            paths.append(item_info)
             
             # Recursively extract nested paths from list items
             nested_paths = self.extract_nested_paths(list_body, full_path_item, depth + 1, max_depth)
-            paths.extend(nested_paths)
+            paths.extend(self.within_path_budget([collection_info, item_info], nested_paths))
             
             pos = list_end + 1
         
@@ -645,7 +669,7 @@ class NativeToOpenAPI:
             
             # Get description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', leaf_body)
-            description = desc_match.group(1)[:200] if desc_match else f"{leaf_name} configuration"
+            description = sys.intern(desc_match.group(1)[:200]) if desc_match else f"{leaf_name} configuration"
             
             # Create schema with validation (Phase 2: add production-quality validation)
             schema = {'type': json_type}
@@ -720,7 +744,7 @@ class NativeToOpenAPI:
                 'path': full_path,
                 'name': leaf_name,
                 'description': description,
-                'schema': schema,
+                'schema': self.schema_pool.intern(schema),
                 'is_list': False,
                 'is_leaf': True,
                 'depth': depth
@@ -840,35 +864,78 @@ class NativeToOpenAPI:
                 'securitySchemes': {
                     'basicAuth': {'type': 'http', 'scheme': 'basic'}
                 },
-                'schemas': {}
+                'schemas': {},
+                'examples': {}
             },
             'security': [{'basicAuth': []}],
             'tags': [{'name': category, 'description': category_titles.get(category, category)}]
         }
         
+        # Structurally identical schemas/examples -> the component that holds them.
+        # Sibling lists built from the same groupings (GigabitEthernet,
+        # TenGigabitEthernet, Loopback, ... under interface) become one component
+        # that every type-specific path references. Schemas come from the schema
+        # pool, so identical structure is the identical object.
+        shared_schemas: Dict[int, str] = {}
+        shared_examples: Dict[bytes, str] = {}
+        used_names = set()
+        operation_names: Dict[str, str] = {}
+        used_operation_names = set()
+        
         for path_info in paths:
             restconf_path = f"/data/Cisco-IOS-XE-native:{path_info['path']}"
             schema_name = f"native-{path_info['name'].replace('/', '-')}"
+            # Names repeat across the tree (e.g. every 'session'), keep them unique
+            if schema_name in used_names:
+                suffix = 2
+                while f"{schema_name}-{suffix}" in used_names:
+                    suffix += 1
+                schema_name = f"{schema_name}-{suffix}"
+            used_names.add(schema_name)
+            # Operation IDs (deep links: #/<tag>/<operationId>) keep the plain name where it
+            # is unique; a repeated name gets one built from its path, whichever suffix its
+            # component got. A path listed twice replaces itself and keeps its name.
+            operation_name = operation_names.get(path_info['path'])
+            if operation_name is None:
+                operation_name = f"native-{path_info['name'].replace('/', '-')}"
+                if operation_name in used_operation_names:
+                    path_name = re.sub(r'[^A-Za-z0-9_.-]+', '-', path_info['path']).strip('-')
+                    operation_name = path_name
+                    suffix = 2
+                    while operation_name in used_operation_names:
+                        operation_name = f"{path_name}-{suffix}"
+                        suffix += 1
+                operation_names[path_info['path']] = operation_name
+                used_operation_names.add(operation_name)
             
-            # Store schema
-            spec['components']['schemas'][schema_name] = path_info['schema']
+            # Store schema and example once; all operations reference them
+            schema_ref = shared_schemas.setdefault(id(path_info['schema']), schema_name)
+            if schema_ref == schema_name:
+                spec['components']['schemas'][schema_name] = path_info['schema']
+            example = self.budgeted_example(restconf_path, path_info['schema'], path_info['name'],
+                                            path_info.get('key'))
+            example_ref = shared_examples.setdefault(self.structure_key(example), schema_name)
+            if example_ref == schema_name:
+                spec['components']['examples'][schema_name] = {
+                    'summary': f"Example {path_info['name']}",
+                    'value': example
+                }
+            media_type = {
+                'schema': {'$ref': f"#/components/schemas/{schema_ref}"},
+                'examples': {'default': {'$ref': f"#/components/examples/{example_ref}"}}
+            }
             
             # Create operations
             operations = {
                 'get': {
                     'summary': f"Get {path_info['name']}",
                     'description': path_info['description'],
-                    'operationId': f"get-{schema_name}",
+                    'operationId': f"get-{operation_name}",
                     'tags': [category],
                     'responses': {
                         '200': {
                             'description': 'Success',
-                            'content': {
-                                'application/yang-data+json': {
-                                    'schema': path_info['schema'],
-                                    'example': self.create_example_data(path_info['schema'], path_info['name'])
-                                }
-                            }
+                            'content': {'application/yang-data+json': media_type}
                         },
                         '401': {'description': 'Unauthorized'},
                         '404': {'description': 'Not found'}
@@ -877,16 +944,11 @@ class NativeToOpenAPI:
                 'put': {
                     'summary': f"Replace {path_info['name']}",
                     'description': f"Replace entire {path_info['name']} configuration",
-                    'operationId': f"put-{schema_name}",
+                    'operationId': f"put-{operation_name}",
                     'tags': [category],
                     'requestBody': {
                         'required': True,
-                        'content': {
-                            'application/yang-data+json': {
-                                'schema': path_info['schema'],
-                                'example': self.create_example_data(path_info['schema'], path_info['name'])
-                            }
-                        }
+                        'content': {'application/yang-data+json': media_type}
                     },
                     'responses': {
                         '201': {'description': 'Created'},
@@ -898,16 +960,11 @@ class NativeToOpenAPI:
                 'patch': {
                     'summary': f"Update {path_info['name']}",
                     'description': f"Merge updates to {path_info['name']} configuration",
-                    'operationId': f"patch-{schema_name}",
+                    'operationId': f"patch-{operation_name}",
                     'tags': [category],
                     'requestBody': {
                         'required': True,
-                        'content': {
-                            'application/yang-data+json': {
-                                'schema': path_info['schema'],
-                                'example': self.create_example_data(path_info['schema'], path_info['name'])
-                            }
-                        }
+                        'content': {'application/yang-data+json': media_type}
                     },
                     'responses': {
                         '204': {'description': 'Updated'},
@@ -918,7 +975,7 @@ class NativeToOpenAPI:
                 'delete': {
                     'summary': f"Delete {path_info['name']}",
                     'description': f"Remove {path_info['name']} configuration",
-                    'operationId': f"delete-{schema_name}",
+                    'operationId': f"delete-{operation_name}",
                     'tags': [category],
                     'responses': {
                         '204': {'description': 'Deleted'},
@@ -928,6 +985,13 @@ class NativeToOpenAPI:
                 }
             }
             
+            # Subtree over the path budget: its nested paths are only reachable through this schema
+            if path_info.get('collapsed'):
+                operations['get']['description'] = (f"{path_info['description']}\n\n"
+                                                    f"Covers {path_info['collapsed']} nested paths that are not "
+                                                    "listed separately; the schema describes the whole subtree.")
+                operations['get']['x-collapsed-paths'] = path_info['collapsed']
+            
             spec['paths'][restconf_path] = operations
             
         return spec
@@ -953,11 +1017,102 @@ class NativeToOpenAPI:
         
         return combined_content
 
+    def collection_size(self, name: str) -> int:
+        """Number of paths in a category or quick-start collection"""
+        return len(self.quick_starts.get(name) or self.categorized_paths[name])
+
+    def write_collection(self, name: str) -> List[Tuple[str, str]]:
+        """
+        Build, size-check and write one category (split into parts when too large)
+        or quick-start collection; returns (spec name, manifest module) per file written
+        """
+        if name in self.quick_starts:
+            return self.write_quick_start(name, self.quick_starts[name])
+        return self.write_category(name, self.categorized_paths[name])
+
+    def write_category(self, category: str, paths: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Write native-<category>.json, or native-<category>-<n>.json parts if it is too large"""
+        # Try generating the spec
+        spec = self.create_openapi_spec(category, paths)
+        spec_bytes = self.writer.serialize(spec)
+        size_mb = len(spec_bytes) / (1024 * 1024)
+
+        # File is small enough, write as single file
+        if size_mb <= self.MAX_FILE_SIZE_MB:
+            # Use 00 prefix for core to ensure it appears first
+            file_prefix = "native-00-core" if category == "core" else f"native-{category}"
+            output_file = self.output_dir / f"{file_prefix}.json"
+            self.writer.write_spec(file_prefix, spec, data=spec_bytes)
+            print(f"  * {category}: {len(paths)} paths ({size_mb:.2f} MB) -> {output_file.name}")
+            return [(file_prefix, file_prefix.replace("native-", ""))]
+
+        # If file is too large, split it alphabetically
+        print(f"  * {category}: {len(paths)} paths ({size_mb:.2f} MB) - SPLITTING...")
+
+        # Sort paths alphabetically by name
+        sorted_paths = sorted(paths, key=lambda p: p['name'].lower())
+
+        # Calculate number of chunks needed (be conservative)
+        num_chunks = int(size_mb / (self.MAX_FILE_SIZE_MB * 0.8)) + 1  # Target 80% of max to be safe
+        chunk_size = len(sorted_paths) // num_chunks
+        if chunk_size == 0:
+            chunk_size = 1
+
+        written = []
+        chunk_num = 0
+        for i in range(num_chunks):
+            start_idx = i * chunk_size
+            end_idx = (i + 1) * chunk_size if i < num_chunks - 1 else len(sorted_paths)
+            chunk_paths = sorted_paths[start_idx:end_idx]
+
+            if not chunk_paths:
+                continue
+
+            chunk_num += 1
+            chunk_spec = self.create_openapi_spec(f"{category} (Part {chunk_num})", chunk_paths)
+            # Update title to indicate split
+            chunk_spec['info']['title'] = chunk_spec['info']['title'].replace(f"Native - {category.title()}",
+                                                                              f"Native - {category.title()} (Part {chunk_num})")
+
+            output_file = self.output_dir / f"native-{category}-{chunk_num}.json"
+            chunk_size_mb = self.writer.write_spec(output_file.stem, chunk_spec) / (1024 * 1024)
+            print(f"    Part {chunk_num}: {len(chunk_paths)} paths ({chunk_size_mb:.2f} MB) -> {output_file.name}")
+            written.append((output_file.stem, f"native-{category}-{chunk_num}"))
+        return written
+
+    def write_quick_start(self, qs_name: str, paths: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Write native-00-<qs_name>.json, a curated subset of the core categories"""
+        # Create spec with special title
+        qs_title_map = {
+            'day0': '⭐ Native - Day-0 Quick Start',
+            'interface-basics': '⭐ Native - Interface Basics Quick Start',
+            'routing-basics': '⭐ Native - Routing Basics Quick Start'
+        }
+
+        spec = self.create_openapi_spec(qs_name, paths)
+        spec['info']['title'] = qs_title_map.get(qs_name, f"Native - {qs_name.title()}")
+        spec['info']['description'] = f"Curated quick-start collection for {qs_name.replace('-', ' ')}.\n\n" + spec['info']['description']
+
+        output_file = self.output_dir / f"native-00-{qs_name}.json"
+        spec_size_mb = self.writer.write_spec(output_file.stem, spec) / (1024 * 1024)
+        print(f"  * {qs_name}: {len(paths)} paths ({spec_size_mb:.2f} MB) -> {output_file.name}")
+        return [(output_file.stem, f"00-{qs_name}")]
+
     def generate_all(self):
         """Generate OpenAPI specs for all native categories"""
         print(f"\n{'='*70}")
         print("Native YANG to OpenAPI 3.0 Generator v2")
         print(f"{'='*70}\n")
+
+        # The native module and its submodules build as one unit
+        native_file = self.yang_dir / "Cisco-IOS-XE-native.yang"
+        reused = self.builds.reuse(native_file) if native_file.exists() else None
+        if reused is not None:
+            self.writer.write_manifest(reused['summary'])
+            self.writer.finalize()
+            self.builds.save()
+            print(f"Sources unchanged: reused {len(reused['specs'])} category specs")
+            return
         
         # Load all content
         print("Loading Cisco-IOS-XE-native module and submodules...")
@@ -978,6 +1133,14 @@ class NativeToOpenAPI:
         print("\nExtracting paths from native container...")
         all_paths = self.extract_paths_from_native(content)
         print(f"  Found {len(all_paths)} total paths")
+        if self.collapsed_subtrees:
+            collapsed = sorted(self.collapsed_subtrees.values(), key=lambda c: -c['collapsed_paths'])
+            print(f"  Collapsed {len(collapsed)} subtrees over the path budget ({self.path_budget}), "
+                  f"{sum(c['collapsed_paths'] for c in collapsed)} nested paths:")
+            for subtree in collapsed[:10]:
+                print(f"    {subtree['path']}: {subtree['collapsed_paths']} paths")
+            if len(collapsed) > 10:
+                print(f"    ... and {len(collapsed) - 10} more")
         
         # Categorize paths
         categorized_paths: Dict[str, List] = {cat: [] for cat in self.category_keywords.keys()}
@@ -1011,76 +1174,11 @@ class NativeToOpenAPI:
         print(f"  * interface-basics: {len(quick_starts['interface-basics'])} paths")
         print(f"  * routing-basics: {len(quick_starts['routing-basics'])} paths")
         
-        # Generate specs per category
-        print("\nGenerating OpenAPI specs by category:")
-        total_specs = 0
-        manifest_modules = []
-        MAX_FILE_SIZE_MB = 5
-        
-        for category, paths in categorized_paths.items():
-            if not paths:
-                continue
-            
-            # Try generating the spec
-            spec = self.create_openapi_spec(category, paths)
-            spec_json = json.dumps(spec, indent=2)
-            size_mb = len(spec_json.encode('utf-8')) / (1024 * 1024)
-            
-            # If file is too large, split it alphabetically
-            if size_mb > MAX_FILE_SIZE_MB:
-                print(f"  * {category}: {len(paths)} paths ({size_mb:.2f} MB) - SPLITTING...")
-                
-                # Sort paths alphabetically by name
-                sorted_paths = sorted(paths, key=lambda p: p['name'].lower())
-                
-                # Calculate number of chunks needed (be conservative)
-                num_chunks = int(size_mb / (MAX_FILE_SIZE_MB * 0.8)) + 1  # Target 80% of max to be safe
-                chunk_size = len(sorted_paths) // num_chunks
-                if chunk_size == 0:
-                    chunk_size = 1
-                
-                chunk_num = 0
-                for i in range(num_chunks):
-                    start_idx = i * chunk_size
-                    end_idx = (i + 1) * chunk_size if i < num_chunks - 1 else len(sorted_paths)
-                    chunk_paths = sorted_paths[start_idx:end_idx]
-                    
-                    if not chunk_paths:
-                        continue
-                    
-                    chunk_num += 1
-                    chunk_spec = self.create_openapi_spec(f"{category} (Part {chunk_num})", chunk_paths)
-                    # Update title to indicate split
-                    chunk_spec['info']['title'] = chunk_spec['info']['title'].replace(f"Native - {category.title()}", 
-                                                                                      f"Native - {category.title()} (Part {chunk_num})")
-                    
-                    output_file = self.output_dir / f"native-{category}-{chunk_num}.json"
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        json.dump(chunk_spec, f, indent=2)
-                    
-                    chunk_size_mb = len(json.dumps(chunk_spec, indent=2).encode('utf-8')) / (1024 * 1024)
-                    print(f"    Part {chunk_num}: {len(chunk_paths)} paths ({chunk_size_mb:.2f} MB) -> {output_file.name}")
-                    total_specs += 1
-                    manifest_modules.append(f"native-{category}-{chunk_num}")
-            else:
-                # File is small enough, write as single file
-                # Use 00 prefix for core to ensure it appears first
-                file_prefix = "native-00-core" if category == "core" else f"native-{category}"
-                output_file = self.output_dir / f"{file_prefix}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(spec, f, indent=2)
-                
-                print(f"  * {category}: {len(paths)} paths ({size_mb:.2f} MB) -> {output_file.name}")
-                total_specs += 1
-                module_name = file_prefix.replace("native-", "").replace("-", "")
-                manifest_modules.append(file_prefix.replace("native-", ""))
-        
-        # PHASE 4: Write Quick-Start Collections (after regular categories)
-        print("\nGenerating quick-start collections:")
+        # Categories and quick-starts build independently; with --jobs they fan out to
+        # worker processes that share the categorized paths read-only
+        self.categorized_paths = {category: paths for category, paths in categorized_paths.items() if paths}
+        self.quick_starts = {}
         for qs_name, qs_paths in quick_starts.items():
-            if not qs_paths:
-                continue
-            
             # Remove duplicates while preserving order
             seen_paths = set()
             unique_paths = []
@@ -1088,53 +1186,73 @@ class NativeToOpenAPI:
                 if path_info['path'] not in seen_paths:
                     seen_paths.add(path_info['path'])
                     unique_paths.append(path_info)
-            
-            # Create spec with special title
-            qs_title_map = {
-                'day0': '⭐ Native - Day-0 Quick Start',
-                'interface-basics': '⭐ Native - Interface Basics Quick Start',
-                'routing-basics': '⭐ Native - Routing Basics Quick Start'
-            }
-            
-            spec = self.create_openapi_spec(qs_name, unique_paths)
-            spec['info']['title'] = qs_title_map.get(qs_name, f"Native - {qs_name.title()}")
-            spec['info']['description'] = f"Curated quick-start collection for {qs_name.replace('-', ' ')}.\n\n" + spec['info']['description']
-            
-            output_file = self.output_dir / f"native-00-{qs_name}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(spec, f, indent=2)
-            
-            spec_size_mb = len(json.dumps(spec, indent=2).encode('utf-8')) / (1024 * 1024)
-            print(f"  * {qs_name}: {len(unique_paths)} paths ({spec_size_mb:.2f} MB) -> {output_file.name}")
-            total_specs += 1
-            manifest_modules.append(f"00-{qs_name}")
+            if unique_paths:
+                self.quick_starts[qs_name] = unique_paths
+
+        print("\nGenerating OpenAPI specs by category and quick-start collections:")
+        collections = self.builds.owned(list(self.categorized_paths) + list(self.quick_starts),
+                                        weight=self.collection_size)
+        manifest_modules = []
+        spec_names = []
+        for written in self.pool.map(self, 'write_collection', collections, weight=self.collection_size):
+            for spec_name, module in written or []:
+                spec_names.append(spec_name)
+                manifest_modules.append(module)
+        self.pool.report()
+        total_specs = len(spec_names)
         
         # Generate manifest
         manifest = {
             'total_modules': total_specs,
             'total_paths': len(all_paths),
             'modules': sorted(manifest_modules),
+            'path_budget': self.path_budget,
+            'collapsed_subtrees': sorted(self.collapsed_subtrees.values(), key=lambda c: c['path']),
             'generator': 'generate_native_openapi_v2.py',
             'source': 'Cisco-IOS-XE-native.yang',
             'version': '17.18.1'
         }
         
-        manifest_file = self.output_dir / 'manifest.json'
-        with open(manifest_file, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+        self.writer.write_manifest(manifest)
+        self.writer.finalize()
+        self.builds.record(native_file, spec_names, manifest)
+        self.builds.save()
         
         print(f"\n{'='*70}")
         print(f"Generation Complete: {total_specs} category specs, {len(all_paths)} total paths")
         print(f"{'='*70}\n")
 
+def merge_shard_manifests(manifests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The manifest of a full build from the manifests of shards that each wrote some categories"""
+    modules = sorted(module for manifest in manifests for module in manifest['modules'])
+    return dict(manifests[0], total_modules=len(modules), modules=modules)
+
 def main():
     """Main entry point"""
     script_dir = Path(__file__).parent
     yang_dir = script_dir.parent / 'references' / '17181-YANG-modules'
     output_dir = script_dir.parent / 'swagger-native-config-model' / 'api'
     
-    converter = NativeToOpenAPI(str(yang_dir), str(output_dir))
+    parser = argparse.ArgumentParser(description='Generate Native config OpenAPI specifications')
+    add_output_arguments(parser)
+    add_jobs_argument(parser)
+    add_example_arguments(parser)
+    parser.add_argument('--path-budget', type=int, default=NativeToOpenAPI.DEFAULT_PATH_BUDGET,
+                        help='Collapse container/list subtrees that would emit more than this many nested '
+                             'paths into their root operation (0 = no limit)')
+    args = parser.parse_args()
+
+    writer = SpecWriter.from_args(output_dir, args)
+    example_budget = ExampleBudget.from_args(args)
+    builds = BuildManifest.from_args(writer, yang_dir, __file__, args,
+                                     options={'example_max_bytes': example_budget.max_bytes,
+                                              'example_max_nodes': example_budget.max_nodes,
+                                              'path_budget': args.path_budget},
+                                     merge_summaries=merge_shard_manifests)
+    converter = NativeToOpenAPI(str(yang_dir), str(output_dir), writer=writer, example_budget=example_budget,
+                                path_budget=args.path_budget, builds=builds, pool=ModulePool.from_args(args))
     converter.generate_all()
+    converter.example_budget.report(args.example_budget_report)
 
 if __name__ == '__main__':
     main()
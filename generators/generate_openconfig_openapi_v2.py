@@ -4,22 +4,38 @@ Convert OpenConfig YANG modules to OpenAPI 3.0 specifications.
 Properly parses YANG structure using tree walking.
 """
 
-import json
 import re
+import argparse
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Optional, Tuple
+
+import spec_io
+from build_manifest import BuildManifest
+from module_pool import ModulePool, add_jobs_argument, track_groupings
+from spec_writer import SpecWriter, add_output_arguments
 
 class OpenConfigToOpenAPI:
     """Convert OpenConfig YANG modules to OpenAPI 3.0 with proper YANG parsing"""
 
-    def __init__(self, yang_dir: str, output_dir: str):
+    def __init__(self, yang_dir: str, output_dir: str, writer: Optional[SpecWriter] = None,
+                 builds: Optional[BuildManifest] = None,
+                 pool: Optional[ModulePool] = None):
         self.yang_dir = Path(yang_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or SpecWriter(self.output_dir)
+        self.builds = builds or BuildManifest.disabled()
+        self.pool = pool or ModulePool()
         self.groupings_cache = {}
         self.processed_modules = []
         self.total_paths = 0
+        # Per-module state, reset in process_module(): parsed schemas by
+        # (body, name, depth), and the shared config leaf-set components
+        self.parse_cache: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+        self.shared_components: Dict[str, Dict[str, Any]] = {}
+        self.shared_component_names: Dict[bytes, str] = {}
 
     def find_balanced_braces(self, text: str, start_pos: int) -> int:
         """Find the end position of balanced braces"""
@@ -68,6 +84,11 @@ class OpenConfigToOpenAPI:
         match = re.search(r'^\s*module\s+([^\s{]+)', content, re.MULTILINE)
         return match.group(1) if match else ""
 
+    def caches_groupings(self, content: str) -> bool:
+        """Whether process_module() adds this module's groupings to groupings_cache (see module_pool)"""
+        module_name = self.extract_module_name(content)
+        return module_name.startswith('openconfig-')
+
     def extract_description(self, content: str) -> str:
         """Extract module description"""
         # Get the first description after module declaration
@@ -154,7 +175,7 @@ class OpenConfigToOpenAPI:
         # Extract description
         desc_match = re.search(r'\bdescription\s+"([^"]+)"', leaf_content)
         if desc_match:
-            schema['description'] = desc_match.group(1).strip()
+            schema['description'] = sys.intern(desc_match.group(1).strip())
 
         # Check if mandatory
         if re.search(r'\bmandatory\s+true\b', leaf_content):
@@ -163,7 +184,20 @@ class OpenConfigToOpenAPI:
         return schema
 
     def parse_container_or_grouping(self, content: str, name: str, depth: int = 0) -> Dict[str, Any]:
-        """Recursively parse container/grouping"""
+        """
+        Recursively parse container/grouping.
+        Results are cached per module: every path re-parses its subtree, and
+        groupings are instantiated many times. Cached schemas are shared - copy
+        before modifying.
+        """
+        key = (content, name, depth)
+        schema = self.parse_cache.get(key)
+        if schema is None:
+            schema = self.parse_cache[key] = self._parse_container_or_grouping(content, name, depth)
+        return schema
+
+    def _parse_container_or_grouping(self, content: str, name: str, depth: int) -> Dict[str, Any]:
+        """Uncached body of parse_container_or_grouping"""
         if depth > 20:
             return {'type': 'object', 'description': f'{name} (max depth reached)'}
 
@@ -249,11 +283,11 @@ class OpenConfigToOpenAPI:
 
             cont_body = content[cont_start + 1:cont_end]
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', cont_body)
-            description = desc_match.group(1) if desc_match else None
+            description = sys.intern(desc_match.group(1)) if desc_match else None
 
             nested_schema = self.parse_container_or_grouping(cont_body, cont_name, depth + 1)
             if description:
-                nested_schema['description'] = description
+                nested_schema = dict(nested_schema, description=description)
 
             properties[cont_name] = nested_schema
             pos = cont_end + 1
@@ -297,6 +331,8 @@ class OpenConfigToOpenAPI:
 
             pos = choice_end + 1
 
+        self._share_config_state(properties, name)
+
         schema = {'type': 'object'}
         if properties:
             schema['properties'] = properties
@@ -305,6 +341,56 @@ class OpenConfigToOpenAPI:
 
         return schema
 
+    def shared_component(self, schema: Dict[str, Any], base_name: str) -> str:
+        """Name of the module component holding schema, adding it on first use"""
+        key = spec_io.dumpb(schema, pretty=False, sort_keys=True)
+        name = self.shared_component_names.get(key)
+        if name is None:
+            name = base_name
+            suffix = 2
+            while name in self.shared_components:
+                name = f"{base_name}-{suffix}"
+                suffix += 1
+            self.shared_components[name] = schema
+            self.shared_component_names[key] = name
+        return name
+
+    def _share_config_state(self, properties: Dict[str, Any], name: str):
+        """
+        OpenConfig pairs each 'config' container with a 'state' container holding
+        the same leaves plus read-only counters. Store the config leaf set once as
+        a component: config references it, state references it plus its extra leaves.
+        """
+        config = properties.get('config')
+        state = properties.get('state')
+        if not (isinstance(config, dict) and isinstance(state, dict)):
+            return
+        config_props = config.get('properties')
+        state_props = state.get('properties', {})
+        if not config_props or any(state_props.get(leaf) != schema for leaf, schema in config_props.items()):
+            return
+
+        leaf_set = {'type': 'object', 'properties': config_props}
+        if config.get('required'):
+            leaf_set['required'] = config['required']
+        ref = {'$ref': f"#/components/schemas/{self.shared_component(leaf_set, f'{name}-config')}"}
+
+        properties['config'] = {'allOf': [ref]}
+        if 'description' in config:
+            properties['config']['description'] = config['description']
+
+        extra = {leaf: schema for leaf, schema in state_props.items() if leaf not in config_props}
+        state_schema = {'allOf': [ref]}
+        if extra:
+            extra_schema = {'type': 'object', 'properties': extra}
+            extra_required = [leaf for leaf in state.get('required', []) if leaf in extra]
+            if extra_required:
+                extra_schema['required'] = extra_required
+            state_schema['allOf'].append(extra_schema)
+        if 'description' in state:
+            state_schema['description'] = state['description']
+        properties['state'] = state_schema
+
     def extract_paths(self, content: str, module_name: str) -> List[Dict[str, Any]]:
         """Extract all top-level containers and lists to create RESTCONF paths
         
@@ -442,7 +528,7 @@ class OpenConfigToOpenAPI:
 
             # Extract description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', cont_body)
-            description = desc_match.group(1) if desc_match else f"{cont_name} container"
+            description = sys.intern(desc_match.group(1)) if desc_match else f"{cont_name} container"
 
             # Create path for this container
             current_path = path_parts + [cont_name]
@@ -483,7 +569,7 @@ class OpenConfigToOpenAPI:
 
             # Extract description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', list_body)
-            description = desc_match.group(1) if desc_match else f"{list_name} list"
+            description = sys.intern(desc_match.group(1)) if desc_match else f"{list_name} list"
 
             # Extract key
             key_match = re.search(r'\bkey\s+"([^"]+)"', list_body)
@@ -550,13 +636,27 @@ class OpenConfigToOpenAPI:
             'tags': [{'name': module_name, 'description': description}]
         }
 
+        # Shared config leaf sets referenced from the config/state containers
+        openapi_spec['components']['schemas'].update(self.shared_components)
+
         # Create OpenAPI paths
+        schema_names: Dict[bytes, str] = {}
         for path_info in paths:
             path = f"/data/{module_name}:{path_info['path']}"
-            schema_name = f"{module_name}-{path_info['name']}"
-
-            # Store schema in components
-            openapi_spec['components']['schemas'][schema_name] = path_info['schema']
+            # Names like 'config' and 'state' repeat at every level: keep a component per
+            # distinct schema, with a unique name, so each path references its own structure
+            schema_key = spec_io.dumpb(path_info['schema'], pretty=False, sort_keys=True)
+            schema_name = schema_names.get(schema_key)
+            if schema_name is None:
+                base_name = schema_name = f"{module_name}-{path_info['name']}"
+                suffix = 2
+                while schema_name in openapi_spec['components']['schemas']:
+                    schema_name = f"{base_name}-{suffix}"
+                    suffix += 1
+                schema_names[schema_key] = schema_name
+
+                # Store schema in components
+                openapi_spec['components']['schemas'][schema_name] = path_info['schema']
 
             # Create operations
             operations = {}
@@ -660,21 +760,25 @@ class OpenConfigToOpenAPI:
 
         return openapi_spec
 
-    def process_module(self, yang_file: Path) -> bool:
-        """Process a single OpenConfig YANG module"""
+    def process_module(self, yang_file: Path) -> Optional[Dict[str, Any]]:
+        """Process a single OpenConfig YANG module; returns its build entry (specs and summary)"""
         try:
             content = self.read_yang_file(yang_file)
             if not content:
-                return False
+                return None
 
             module_name = self.extract_module_name(content)
             if not module_name or not module_name.startswith('openconfig-'):
-                return False
+                return None
 
             print(f"Processing {module_name}...")
 
             # Extract groupings first
             self.extract_groupings(content)
+            # Parsed schemas depend on the groupings seen so far; start fresh per module
+            self.parse_cache.clear()
+            self.shared_components = {}
+            self.shared_component_names.clear()
 
             # Extract description
             description = self.extract_description(content)
@@ -684,7 +788,7 @@ class OpenConfigToOpenAPI:
 
             if not paths:
                 print(f"  ⚠️  No paths found for {module_name}")
-                return False
+                return None
 
             print(f"  ✓ Found {len(paths)} paths")
 
@@ -693,17 +797,15 @@ class OpenConfigToOpenAPI:
 
             # Write to file
             output_file = self.output_dir / f"{module_name}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(openapi_spec, f, indent=2)
+            self.writer.write_spec(module_name, openapi_spec)
+            built = self.builds.record(yang_file, [module_name], {'paths': len(paths)})
 
             print(f"  ✓ Generated {output_file}")
-            self.processed_modules.append(module_name)
-            self.total_paths += len(paths)
-            return True
+            return built
 
         except Exception as e:
             print(f"  ✗ Error processing {yang_file.name}: {e}")
-            return False
+            return None
 
     def generate_all(self):
         """Process all OpenConfig modules"""
@@ -721,9 +823,24 @@ class OpenConfigToOpenAPI:
         print(f"Found {len(yang_files)} OpenConfig modules\n")
 
         success_count = 0
-        for yang_file in yang_files:
-            if self.process_module(yang_file):
+        # Modules reuse their specs only if the groupings they resolve from earlier ones are unchanged
+        track_groupings(self, yang_files)
+        pending = []
+        for yang_file in self.builds.owned(yang_files):
+            reused = self.builds.reuse(yang_file)
+            if reused is None:
+                pending.append(yang_file)
+                continue
+            self.processed_modules.extend(reused['specs'])
+            self.total_paths += reused['summary']['paths']
+            success_count += 1
+
+        for built in self.pool.map(self, 'process_module', pending, sources=yang_files):
+            if built:
+                self.processed_modules.extend(built['specs'])
+                self.total_paths += built['summary']['paths']
                 success_count += 1
+        self.pool.report()
 
         print(f"\n{'='*70}")
         print(f"Generation Complete: {success_count}/{len(yang_files)} modules")
@@ -738,9 +855,9 @@ class OpenConfigToOpenAPI:
             'timestamp': '2026-01-30'
         }
 
-        manifest_file = self.output_dir / 'manifest.json'
-        with open(manifest_file, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_file = self.writer.write_manifest(manifest)
+        self.writer.finalize()
+        self.builds.save()
 
         print(f"Manifest: {manifest_file}")
 
@@ -750,7 +867,15 @@ def main():
     yang_dir = script_dir.parent / 'references' / '17181-YANG-modules'
     output_dir = script_dir.parent / 'swagger-openconfig-model' / 'api'
 
-    converter = OpenConfigToOpenAPI(str(yang_dir), str(output_dir))
+    parser = argparse.ArgumentParser(description='Generate OpenConfig OpenAPI specifications')
+    add_output_arguments(parser)
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    writer = SpecWriter.from_args(output_dir, args)
+    converter = OpenConfigToOpenAPI(str(yang_dir), str(output_dir), writer=writer,
+                                    builds=BuildManifest.from_args(writer, yang_dir, __file__, args),
+                                    pool=ModulePool.from_args(args))
     converter.generate_all()
 
 if __name__ == '__main__':
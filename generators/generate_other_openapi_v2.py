@@ -4,19 +4,26 @@ Convert misc/other YANG modules to OpenAPI 3.0 specifications.
 Handles standalone Cisco and vendor-specific modules not in other categories.
 """
 
-import json
+import argparse
 import re
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from build_manifest import BuildManifest
+from spec_writer import SpecWriter, add_output_arguments
 
 class OtherToOpenAPI:
     """Convert misc/other YANG modules to OpenAPI 3.0 with proper YANG parsing"""
 
-    def __init__(self, yang_dir: str, output_dir: str, module_list: List[str]):
+    def __init__(self, yang_dir: str, output_dir: str, module_list: List[str],
+                 writer: Optional[SpecWriter] = None, builds: Optional[BuildManifest] = None):
         self.yang_dir = Path(yang_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or SpecWriter(self.output_dir)
+        self.builds = builds or BuildManifest.disabled()
         self.module_list = module_list
         self.groupings_cache = {}
         self.processed_modules = []
@@ -87,7 +94,7 @@ class OtherToOpenAPI:
         # Extract description
         desc_match = re.search(r'description\s+"([^"]+)"', leaf_content)
         if desc_match:
-            schema["description"] = desc_match.group(1).strip()
+            schema["description"] = sys.intern(desc_match.group(1).strip())
 
         # Extract type
         type_match = re.search(r'type\s+([^;\s{]+)', leaf_content)
@@ -145,7 +152,7 @@ class OtherToOpenAPI:
         # Extract description
         desc_match = re.search(r'description\s+"([^"]+)"', content[:500])
         if desc_match:
-            schema["description"] = desc_match.group(1).strip()
+            schema["description"] = sys.intern(desc_match.group(1).strip())
 
         # Parse nested elements
         properties_target = schema["items"]["properties"] if is_list else schema["properties"]
@@ -596,6 +603,8 @@ class OtherToOpenAPI:
 
         processed_count = 0
         skipped_count = 0
+        owned = set(self.builds.owned([self.yang_dir / f"{name}.yang" for name in self.module_list
+                                       if (self.yang_dir / f"{name}.yang").exists()]))
 
         for module_name in self.module_list:
             yang_file = self.yang_dir / f"{module_name}.yang"
@@ -605,14 +614,27 @@ class OtherToOpenAPI:
                 skipped_count += 1
                 continue
 
+            if yang_file not in owned:
+                # Another shard builds it; later modules still resolve 'uses' against its groupings
+                self.extract_groupings(self.read_yang_file(yang_file))
+                continue
+
+            reused = self.builds.reuse(yang_file)
+            if reused is not None:
+                # Later modules resolve 'uses' against the groupings cached from earlier ones
+                self.extract_groupings(self.read_yang_file(yang_file))
+                self.processed_modules.append(reused['summary'])
+                processed_count += 1
+                continue
+
             print(f"Processing: {yang_file.name}...")
 
             openapi_spec = self.convert_to_openapi(yang_file)
 
             if openapi_spec:
                 output_file = self.output_dir / f"{module_name}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(openapi_spec, f, indent=2)
+                self.writer.write_spec(module_name, openapi_spec)
+                self.builds.record(yang_file, [module_name], self.processed_modules[-1])
                 print(f"  ✓ Generated: {output_file.name} ({len(openapi_spec['paths'])} paths)")
                 processed_count += 1
             else:
@@ -634,9 +656,9 @@ class OtherToOpenAPI:
             "modules": self.processed_modules
         }
 
-        manifest_file = self.output_dir / "manifest.json"
-        with open(manifest_file, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_file = self.writer.write_manifest(manifest)
+        self.writer.finalize()
+        self.builds.save()
 
         print(f"Manifest saved: {manifest_file}")
 
@@ -649,6 +671,10 @@ def main():
     yang_dir = script_dir.parent / 'references' / '17181-YANG-modules'
     output_dir = script_dir.parent / 'swagger-other-model' / 'api'
 
+    parser = argparse.ArgumentParser(description='Generate misc/other OpenAPI specifications')
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
     # List of standalone misc/other modules
     modules = [
         'cisco-bridge-domain',
@@ -665,7 +691,9 @@ def main():
         'confd_dyncfg'
     ]
 
-    converter = OtherToOpenAPI(str(yang_dir), str(output_dir), modules)
+    writer = SpecWriter.from_args(output_dir, args)
+    converter = OtherToOpenAPI(str(yang_dir), str(output_dir), modules, writer=writer,
+                               builds=BuildManifest.from_args(writer, yang_dir, __file__, args))
     processed = converter.process_modules()
 
     print(f"\n✓ Successfully generated {len(processed)} misc/other OpenAPI specifications")
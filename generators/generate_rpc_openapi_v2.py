@@ -4,22 +4,31 @@ Convert Cisco IOS-XE RPC YANG modules to OpenAPI 3.0 specifications.
 RFC 7950 (YANG 1.1) and RFC 8040 (RESTCONF) compliant.
 """
 
-import json
+import argparse
 import re
 import os
+import sys
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+from build_manifest import BuildManifest
+from module_pool import ModulePool, add_jobs_argument
+from spec_writer import SpecWriter, add_output_arguments
+
 class RPCYANGToOpenAPIConverter:
     """
     Converts YANG RPC modules to OpenAPI 3.0 specifications.
     Fully RFC 7950 and RFC 8040 compliant.
     """
     
-    def __init__(self, yang_dir: str, output_dir: str):
+    def __init__(self, yang_dir: str, output_dir: str, writer: Optional[SpecWriter] = None,
+                 builds: Optional[BuildManifest] = None, pool: Optional[ModulePool] = None):
         self.yang_dir = Path(yang_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or SpecWriter(self.output_dir)
+        self.builds = builds or BuildManifest.disabled()
+        self.pool = pool or ModulePool()
         self.groupings_cache = {}
         
     def find_balanced_braces(self, text: str, start_pos: int) -> int:
@@ -136,7 +145,7 @@ class RPCYANGToOpenAPIConverter:
         # Extract description (RFC 7950 Section 7.21.3)
         desc_match = re.search(r'\bdescription\s+"([^"]+)"', leaf_content)
         if desc_match:
-            desc = desc_match.group(1)
+            desc = sys.intern(desc_match.group(1))
             if 'description' in schema:
                 schema['description'] = f"{schema['description']}. {desc}"
             else:
@@ -258,7 +267,7 @@ class RPCYANGToOpenAPIConverter:
             
             # Extract description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', cont_body)
-            description = desc_match.group(1) if desc_match else None
+            description = sys.intern(desc_match.group(1)) if desc_match else None
             
             nested_schema = self.parse_container_or_grouping(cont_body, cont_name, depth + 1)
             if description:
@@ -432,7 +441,7 @@ class RPCYANGToOpenAPIConverter:
         desc_match = re.search(r'module\s+\S+\s*\{[^}]*?description\s+"([^"]+)"', content, re.DOTALL)
         if not desc_match:
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', content)
-        description = desc_match.group(1) if desc_match else f"RPC operations for {module_name}"
+        description = sys.intern(desc_match.group(1)) if desc_match else f"RPC operations for {module_name}"
         
         org_match = re.search(r'\borganization\s+"([^"]+)"', content)
         organization = org_match.group(1) if org_match else "Cisco Systems, Inc."
@@ -476,7 +485,7 @@ class RPCYANGToOpenAPIConverter:
             
             # Extract description
             desc_match = re.search(r'\bdescription\s+"([^"]+)"', rpc_body)
-            description = desc_match.group(1) if desc_match else f"{rpc_name} operation"
+            description = sys.intern(desc_match.group(1)) if desc_match else f"{rpc_name} operation"
             
             # Extract input
             input_schema = {'type': 'object', 'properties': {}}
@@ -589,7 +598,7 @@ class RPCYANGToOpenAPIConverter:
         return openapi_spec
     
     def process_yang_file(self, yang_file: Path) -> Optional[Dict[str, Any]]:
-        """Process a single YANG file and return OpenAPI spec"""
+        """Process a single YANG file and return its build entry (specs and manifest summary)"""
         print(f"Processing {yang_file.name}...")
         
         yang_info = self.parse_yang_file(yang_file)
@@ -604,11 +613,15 @@ class RPCYANGToOpenAPIConverter:
         
         # Save to file
         output_file = self.output_dir / f"{yang_file.stem}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(spec, f, indent=2)
+        self.writer.write_spec(yang_file.stem, spec)
         
         print(f"  Created {output_file.name}")
-        return spec
+        return self.builds.record(yang_file, [yang_file.stem], {
+            'name': spec['info']['title'],
+            'file': f"{yang_file.stem}.json",
+            'version': spec['info']['version'],
+            'operations': len(spec['paths'])
+        })
     
     def run(self):
         """Process all YANG RPC files"""
@@ -625,16 +638,23 @@ class RPCYANGToOpenAPIConverter:
             if full_path.exists() and full_path not in rpc_files:
                 rpc_files.append(full_path)
         
-        results = []
-        for yang_file in sorted(rpc_files):
-            spec = self.process_yang_file(yang_file)
-            if spec:
-                results.append({
-                    'name': spec['info']['title'],
-                    'file': f"{yang_file.stem}.json",
-                    'version': spec['info']['version'],
-                    'operations': len(spec['paths'])
-                })
+        # Each file resets the groupings cache, so modules build independently
+        rpc_files = sorted(rpc_files)
+        entries = {}
+        pending = []
+        for yang_file in self.builds.owned(rpc_files):
+            reused = self.builds.reuse(yang_file)
+            if reused is None:
+                pending.append(yang_file)
+            else:
+                entries[yang_file] = reused
+
+        for yang_file, built in zip(pending, self.pool.map(self, 'process_yang_file', pending)):
+            if built:
+                entries[yang_file] = built
+        self.pool.report()
+
+        results = [entries[yang_file]['summary'] for yang_file in rpc_files if yang_file in entries]
         
         # Create manifest
         manifest = {
@@ -645,20 +665,32 @@ class RPCYANGToOpenAPIConverter:
             'total_operations': sum(r['operations'] for r in results)
         }
         
-        with open(self.output_dir / 'manifest.json', 'w') as f:
-            json.dump(manifest, f, indent=2)
+        manifest_file = self.writer.write_manifest(manifest)
+        self.writer.finalize()
+        self.builds.save()
         
         print(f"\n{'='*70}")
         print(f"Successfully created {len(results)} OpenAPI specifications")
         print(f"Total operations: {manifest['total_operations']}")
         print(f"Output directory: {self.output_dir}")
         print(f"{'='*70}")
-        print(f"\nCreated manifest: {self.output_dir / 'manifest.json'}")
+        print(f"\nCreated manifest: {manifest_file}")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate RPC OpenAPI specifications')
+    add_output_arguments(parser)
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
     script_dir = Path(__file__).parent
+    output_dir = script_dir.parent / 'swagger-rpc-model' / 'api'
+    yang_dir = script_dir.parent / 'references' / '17181-YANG-modules'
+    writer = SpecWriter.from_args(output_dir, args)
     converter = RPCYANGToOpenAPIConverter(
-        yang_dir=str(script_dir.parent / 'references' / '17181-YANG-modules'),
-        output_dir=str(script_dir.parent / 'swagger-rpc-model' / 'api')
+        yang_dir=str(yang_dir),
+        output_dir=str(output_dir),
+        writer=writer,
+        builds=BuildManifest.from_args(writer, yang_dir, __file__, args),
+        pool=ModulePool.from_args(args)
     )
     converter.run()
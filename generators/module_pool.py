@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Per-module generation across worker processes (--jobs N).
+
+ModulePool.map(generator, method, files) calls generator.<method>(file) for
+each file and returns the results in file order. With --jobs 1 (the default)
+it runs in process, exactly as the generators' loops always have; with more
+jobs the generator is handed to a pool of worker processes and the files are
+submitted largest first, so the biggest modules do not end up at the tail of
+the run. Items need not be files (native maps over its categories) if a
+weight function says how large each one is.
+
+Workers start from a copy of the generator (inherited at fork, pickled where
+processes are spawned), so data the parent prepared on it before map() -
+such as native's parsed paths - is shared read-only rather than sent per task.
+
+What a module leaves on the generator's shared helpers (fragment registry,
+build manifest entries, example budget hits) is collected per task and
+merged back in file order, so manifests come out the same whatever order the
+workers finish in. A module that raises is reported and skipped; the rest of
+the run carries on.
+
+Most generators resolve 'uses' against groupings cached from every module
+processed before the current one. Pass sources (all files, in the order the
+sequential run sees them) and each task starts from the groupings of
+sources up to and including its own file - in process, by extracting the
+groupings of files that are not run (reused modules) as the loop passes them;
+in workers, through a view of the memory-mapped corpus in api/build/ (see
+shared_corpus), which is only rebuilt when a source or the generator changes
+and no builder sharing the artifact cache has built it already.
+A generator whose per-module step skips some files before caching their
+groupings (submodules, type-only modules) says which files count with
+caches_groupings(content), so both modes see exactly what the sequential
+run always has.
+
+The groupings a module resolves from earlier modules are not in its import
+closure, so the build manifest cannot see them change; track_groupings()
+records a hash of them per source, and an incremental run rebuilds the
+modules whose resolved groupings changed.
+"""
+
+import bisect
+import hashlib
+import inspect
+import os
+import re
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from artifact_cache import cache_key
+from build_manifest import BUILD_DIR
+from shared_corpus import GroupingsCorpus, corpus_key
+
+CORPUS_NAME = 'groupings.corpus'
+# How the generators find the groupings a module or grouping uses (the name after a prefix)
+USES_PATTERN = re.compile(r'\buses\s+(\S+);')
+
+# (helper attribute, registry) pairs a module adds entries to, merged in file order
+MERGED_STATE = (
+    ('writer', 'fragment_index'),
+    ('builds', 'modules'),
+    ('example_budget', 'hits'),
+)
+
+_worker: Dict[str, Any] = {}
+
+
+def add_jobs_argument(parser):
+    """Register --jobs on a generator's argparse parser"""
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Generate modules in this many worker processes (0 = one per CPU)')
+    return parser
+
+
+def _registries(generator) -> List[Tuple[Any, str]]:
+    registries = []
+    for helper_name, attribute in MERGED_STATE:
+        helper = getattr(generator, helper_name, None)
+        if helper is not None and getattr(helper, attribute, None) is not None:
+            registries.append((helper, attribute))
+    return registries
+
+
+def _caches_groupings(generator, content: str) -> bool:
+    check = getattr(generator, 'caches_groupings', None)
+    return check(content) if check else True
+
+
+def _init_worker(generator, corpus: Optional[GroupingsCorpus]):
+    _worker['generator'] = generator
+    _worker['corpus'] = corpus
+
+
+def _file_size(path: Path) -> int:
+    return path.stat().st_size
+
+
+def _extract_groupings(path: Path) -> Dict[str, str]:
+    generator = _worker['generator']
+    generator.groupings_cache = {}
+    content = generator.read_yang_file(path)
+    if _caches_groupings(generator, content):
+        generator.extract_groupings(content)
+    return generator.groupings_cache
+
+
+def _used_groupings(content: str) -> List[str]:
+    return list(dict.fromkeys(ref.split(':')[-1] for ref in USES_PATTERN.findall(content)))
+
+
+def track_groupings(generator, sources: Sequence[Path]):
+    """
+    Record in generator.builds, for each source, a hash of every grouping its
+    'uses' resolve to, transitively, among those cached from sources up to
+    and including it (None for a name that resolves to nothing), so reusing a
+    module also requires the groupings it was built from to be unchanged.
+    """
+    builds = getattr(generator, 'builds', None)
+    if builds is None or not builds.enabled:
+        return
+    sources = list(sources)
+    # Grouping name -> the source indexes that define it and the body each defines
+    definitions: Dict[str, Tuple[List[int], List[str]]] = {}
+    uses = []
+    saved = generator.groupings_cache
+    try:
+        for index, path in enumerate(sources):
+            generator.groupings_cache = {}
+            content = generator.read_yang_file(path)
+            if _caches_groupings(generator, content):
+                generator.extract_groupings(content)
+            for name, body in generator.groupings_cache.items():
+                indexes, bodies = definitions.setdefault(name, ([], []))
+                indexes.append(index)
+                bodies.append(body)
+            uses.append(_used_groupings(content))
+    finally:
+        generator.groupings_cache = saved
+
+    def visible(name: str, index: int) -> Optional[str]:
+        """The body groupings_cache holds for name when sources[index] is processed"""
+        indexes, bodies = definitions.get(name, ((), ()))
+        position = bisect.bisect_right(indexes, index)
+        return bodies[position - 1] if position else None
+
+    groupings = {}
+    for index, path in enumerate(sources):
+        resolved: Dict[str, Optional[str]] = {}
+        pending = list(uses[index])
+        while pending:
+            name = pending.pop()
+            if name in resolved:
+                continue
+            body = visible(name, index)
+            resolved[name] = hashlib.sha256(body.encode()).hexdigest() if body is not None else None
+            if body is not None:
+                pending.extend(_used_groupings(body))
+        groupings[path.name] = cache_key('uses', resolved)
+    builds.use_groupings(groupings)
+
+
+def _run_task(method: str, item: Any, source_index: Optional[int]):
+    generator = _worker['generator']
+    if source_index is not None:
+        generator.groupings_cache = _worker['corpus'].view(source_index)
+    registries = _registries(generator)
+    for helper, attribute in registries:
+        setattr(helper, attribute, {})
+    try:
+        result = getattr(generator, method)(item)
+    except Exception:
+        return None, traceback.format_exc(), []
+    return result, None, [getattr(helper, attribute) for helper, attribute in registries]
+
+
+class ModulePool:
+    """Runs a generator's per-module step in process or across worker processes"""
+
+    def __init__(self, jobs: int = 1):
+        self.jobs = jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
+        self.failures: List[Tuple[Any, str]] = []
+
+    @classmethod
+    def from_args(cls, args) -> 'ModulePool':
+        """Build a pool from the --jobs option registered by add_jobs_argument()"""
+        return cls(getattr(args, 'jobs', 1))
+
+    @staticmethod
+    def _label(item: Any) -> str:
+        return item.name if isinstance(item, Path) else str(item)
+
+    def _fail(self, item: Any, error: str):
+        self.failures.append((item, error))
+        print(f"  ✗ Error processing {self._label(item)}:\n{error.rstrip()}")
+
+    def map(self, generator, method: str, files: Sequence[Any], sources: Optional[Sequence[Path]] = None,
+            weight: Callable[[Any], float] = _file_size) -> List[Any]:
+        """generator.<method>(file) for each file, in file order (None where it raised)"""
+        files = list(files)
+        jobs = min(self.jobs, len(files))
+        if jobs > 1 and generator.writer.externalize:
+            # Description IDs are assigned build-wide in write order
+            print("  --externalize: generating modules in process")
+            jobs = 1
+        if jobs <= 1:
+            return self._map_in_process(generator, method, files, sources)
+        return self._map_parallel(generator, method, files, sources, weight, jobs)
+
+    def _map_in_process(self, generator, method: str, files: List[Path],
+                        sources: Optional[Sequence[Path]]) -> List[Any]:
+        results = {}
+        pending = set(files)
+        sources = list(sources) if sources is not None else files
+        # Groupings of files after the last one that runs are never used
+        last = max((i for i, path in enumerate(sources) if path in pending), default=-1)
+        for path in sources[:last + 1]:
+            if path not in pending:
+                # Later modules resolve 'uses' against the groupings cached from earlier ones
+                content = generator.read_yang_file(path)
+                if _caches_groupings(generator, content):
+                    generator.extract_groupings(content)
+                continue
+            try:
+                results[path] = getattr(generator, method)(path)
+            except Exception:
+                self._fail(path, traceback.format_exc())
+        return [results.get(path) for path in files]
+
+    def _map_parallel(self, generator, method: str, files: List[Any], sources: Optional[Sequence[Path]],
+                      weight: Callable[[Any], float], jobs: int) -> List[Any]:
+        print(f"Generating {len(files)} items in {jobs} worker processes")
+        corpus = None
+        source_index: Dict[Any, Optional[int]] = {path: None for path in files}
+        if sources is not None:
+            position = {path: i for i, path in enumerate(sources)}
+            source_index = {path: position[path] for path in files}
+            corpus = self._groupings_corpus(generator, list(sources), jobs)
+
+        # Largest first: the longest tasks start right away instead of finishing last
+        order = sorted(range(len(files)), key=lambda i: -weight(files[i]))
+        outcomes: Dict[int, Tuple[Any, Optional[str], List[Dict[str, Any]]]] = {}
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(generator, corpus)) as executor:
+            futures = {executor.submit(_run_task, method, files[i], source_index[files[i]]): i for i in order}
+            for future in as_completed(futures):
+                try:
+                    outcomes[futures[future]] = future.result()
+                except Exception as e:  # the worker process died
+                    outcomes[futures[future]] = (None, f"{type(e).__name__}: {e}", [])
+
+        results = []
+        registries = _registries(generator)
+        for i, path in enumerate(files):
+            result, error, states = outcomes[i]
+            if error:
+                self._fail(path, error)
+            for (helper, attribute), state in zip(registries, states):
+                getattr(helper, attribute).update(state)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _groupings_corpus(generator, sources: List[Path], jobs: int) -> GroupingsCorpus:
+        """The groupings of every source, from api/build/ or extracted by the workers"""
+        corpus_file = Path(generator.writer.output_dir) / BUILD_DIR / CORPUS_NAME
+        key = corpus_key(inspect.getfile(type(generator)), sources)
+        corpus = GroupingsCorpus.open(corpus_file, key)
+        cache = getattr(getattr(generator, 'builds', None), 'cache', None)
+        if corpus is None and cache is not None and cache.get_file(cache_key('groupings', key.hex()), corpus_file):
+            corpus = GroupingsCorpus.open(corpus_file, key)
+        if corpus is None:
+            with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(generator, None)) as executor:
+                groupings = list(executor.map(_extract_groupings, sources, chunksize=8))
+            GroupingsCorpus.write(corpus_file, key, groupings)
+            corpus = GroupingsCorpus(corpus_file)
+            if cache is not None:
+                cache.put_file(cache_key('groupings', key.hex()), corpus_file)
+            print(f"  Groupings corpus: {sum(map(len, groupings))} groupings from {len(sources)} modules")
+        return corpus
+
+    def report(self):
+        """Print the modules (or other items) that failed, if any"""
+        if self.failures:
+            print(f"\n✗ {len(self.failures)} failed: {', '.join(self._label(item) for item, _ in self.failures)}")
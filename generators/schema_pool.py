@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Hash-consed, immutable schema nodes for the generators.
+
+SchemaPool.intern() turns a schema (dicts, lists, scalars) into FrozenSchema
+dicts and tuples, returning the same object for every structurally identical
+subtree. Parsers intern what they return, so children are already canonical
+and interning a node only looks at its own keys. Identical subtrees then share
+memory, and dedup checks are identity checks (`a is b`, `id(a)`).
+
+FrozenSchema subclasses dict so spec_io serializes it directly; it rejects
+mutation - copy with dict(node) before changing a node.
+"""
+
+from typing import Any, Dict, Tuple
+
+
+class FrozenSchema(dict):
+    """Immutable dict node owned by a SchemaPool"""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("schema nodes are shared and immutable - copy with dict(node) first")
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = __ior__ = _immutable
+
+    def __hash__(self) -> int:
+        # Structurally equal nodes are the same object, so identity hashing is exact
+        return id(self)
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class SchemaPool:
+    """Interns schema nodes so identical structure yields the identical object"""
+
+    def __init__(self):
+        self._nodes: Dict[Tuple, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @staticmethod
+    def _key(value: Any) -> Any:
+        # Interned containers are canonical: their identity stands for their structure.
+        # type() keeps 1, 1.0 and True apart.
+        if isinstance(value, (FrozenSchema, tuple)):
+            return id(value)
+        return (type(value), value)
+
+    def intern(self, node: Any) -> Any:
+        """Canonical immutable equivalent of node"""
+        if isinstance(node, FrozenSchema):
+            return node
+        if isinstance(node, dict):
+            items = [(key, self.intern(value)) for key, value in node.items()]
+            key = (dict,) + tuple((name, self._key(value)) for name, value in items)
+            found = self._nodes.get(key)
+            if found is None:
+                found = self._nodes[key] = FrozenSchema(items)
+            return found
+        if isinstance(node, (list, tuple)):
+            values = tuple(self.intern(value) for value in node)
+            key = (tuple,) + tuple(self._key(value) for value in values)
+            found = self._nodes.get(key)
+            if found is None:
+                found = self._nodes[key] = values
+            return found
+        return node
+
+    def clear(self):
+        self._nodes.clear()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Split one generator's modules across several builders (--shard i/N).
+
+Every shard sees the same file list and partitions it the same way: modules
+are taken largest file first (by name on ties) and each goes to the shard
+with the least total size so far, so the partition depends only on the
+checkout, never on the machine or the order the files were listed in.
+
+A shard writes the specs of its own modules, its part of the build manifest
+(api/build/shards/<i>-of-<N>.json) and, for reference, its part of the
+generator's manifest (api/build/shards/manifest-<i>-of-<N>.json). It leaves
+api/manifest.json and the derived output indexes alone, so shards whose api/
+directories are copied into one tree never overwrite each other.
+
+--merge-shards, run once all shards' api/ directories are in place, folds the
+shard build manifests into api/build/manifest.json and runs the generator as
+usual: every module is reused, so it only writes api/manifest.json and the
+indexes, exactly as a single full build would. The search index and the
+post-processing scripts read the specs themselves and run after the merge.
+"""
+
+import argparse
+import re
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence
+
+SHARD_DIR = 'shards'
+SHARD_PATTERN = re.compile(r'^(\d+)/(\d+)$')
+SHARD_FILE_PATTERN = re.compile(r'^(\d+)-of-(\d+)\.json$')
+
+
+def _file_size(path: Path) -> int:
+    return path.stat().st_size
+
+
+def _sort_name(item: Any) -> str:
+    # Absolute paths differ between builders; file names do not
+    return item.name if isinstance(item, Path) else str(item)
+
+
+class Shard:
+    """Shard i (1-based) of N"""
+
+    def __init__(self, index: int, count: int):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"shard {index}/{count} is out of range")
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, text: str) -> 'Shard':
+        """argparse type for --shard i/N"""
+        match = SHARD_PATTERN.match(text.strip())
+        if not match:
+            raise argparse.ArgumentTypeError(f"expected i/N (e.g. 2/4), got {text!r}")
+        try:
+            return cls(int(match.group(1)), int(match.group(2)))
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+    @property
+    def label(self) -> str:
+        return f"{self.index}-of-{self.count}"
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def select(self, items: Sequence[Any], weight: Optional[Callable[[Any], float]] = None) -> List[Any]:
+        """The items this shard builds, in their original order"""
+        weight = weight or _file_size
+        weights = [weight(item) for item in items]
+        loads = [0] * self.count
+        owned = set()
+        # Largest first onto the least loaded shard (lowest index on ties)
+        for i in sorted(range(len(items)), key=lambda i: (-weights[i], _sort_name(items[i]))):
+            shard = min(range(self.count), key=lambda s: (loads[s], s))
+            loads[shard] += weights[i]
+            if shard == self.index - 1:
+                owned.add(i)
+        return [item for i, item in enumerate(items) if i in owned]
+
+
+def shard_files(build_dir: Path) -> List[Path]:
+    """The shard build manifests in build_dir/shards/, by shard index"""
+    found = [(int(match.group(1)), path) for path in (build_dir / SHARD_DIR).glob('*-of-*.json')
+             for match in [SHARD_FILE_PATTERN.match(path.name)] if match]
+    return [path for _, path in sorted(found)]
+
+
+def check_complete(files: Sequence[Path]):
+    """Exit unless files are shards 1..N of a single N"""
+    if not files:
+        raise SystemExit("--merge-shards: no shard build manifests found (api/build/shards/*-of-*.json)")
+    labels = [SHARD_FILE_PATTERN.match(path.name).groups() for path in files]
+    counts = {count for _, count in labels}
+    if len(counts) != 1:
+        raise SystemExit(f"--merge-shards: shards of different splits found ({', '.join(sorted(counts))})")
+    count = int(counts.pop())
+    missing = sorted(set(range(1, count + 1)) - {int(index) for index, _ in labels})
+    if missing:
+        raise SystemExit(f"--merge-shards: missing shard(s) {', '.join(f'{i}/{count}' for i in missing)}")
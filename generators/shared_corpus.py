@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped groupings corpus shared read-only by ModulePool workers.
+
+Generators resolve 'uses' against the groupings of every module before the
+current one (see module_pool). Rather than handing each worker its own copy
+of every module's groupings, the parent writes them once to
+api/build/groupings.corpus and workers mmap that file: opening it costs the
+same however large the corpus is, the pages are shared by all workers
+through the OS page cache, and a grouping body is only decoded when a module
+actually uses it.
+
+Layout: header (magic, corpus key, record count), fixed-size records sorted
+by (name, source index), then the UTF-8 heap of names and bodies. A lookup
+for the groupings visible to source i is a binary search for the name and
+the last record with source index <= i.
+
+The corpus key hashes the generator script, this module and every source
+file in order, so an unchanged corpus is reused by the next run without
+extracting a single grouping.
+"""
+
+import hashlib
+import mmap
+import struct
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+MAGIC = b'YGC1'
+HEADER = struct.Struct('<4s32sI')
+# name offset, name length, source index, body offset, body length
+RECORD = struct.Struct('<QIIQI')
+
+
+def corpus_key(generator_file, sources: Sequence[Path]) -> bytes:
+    sha = hashlib.sha256()
+    for path in [Path(generator_file), Path(__file__)]:
+        sha.update(path.read_bytes())
+    for path in sources:
+        sha.update(path.name.encode() + b'\0' + hashlib.sha256(path.read_bytes()).digest())
+    return sha.digest()
+
+
+class GroupingsCorpus:
+    """Read-only view of a corpus file; pickles as its path so workers re-attach instead of copying"""
+
+    def __init__(self, corpus_file):
+        self.corpus_file = Path(corpus_file)
+        with open(self.corpus_file, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.key, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.corpus_file} is not a groupings corpus")
+
+    def __reduce__(self):
+        return (GroupingsCorpus, (str(self.corpus_file),))
+
+    @staticmethod
+    def write(corpus_file, key: bytes, groupings: Sequence[Dict[str, str]]):
+        """Write the groupings extracted from each source (in source order) to corpus_file"""
+        entries = sorted((name.encode(), index, body.encode())
+                         for index, module_groupings in enumerate(groupings)
+                         for name, body in module_groupings.items())
+        heap_start = HEADER.size + RECORD.size * len(entries)
+        records, heap = [], bytearray()
+        for name, index, body in entries:
+            name_offset = heap_start + len(heap)
+            heap += name
+            body_offset = heap_start + len(heap)
+            heap += body
+            records.append(RECORD.pack(name_offset, len(name), index, body_offset, len(body)))
+        corpus_file = Path(corpus_file)
+        corpus_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = corpus_file.with_suffix('.tmp')
+        temp_file.write_bytes(HEADER.pack(MAGIC, key, len(entries)) + b''.join(records) + heap)
+        temp_file.replace(corpus_file)
+
+    @classmethod
+    def open(cls, corpus_file, key: bytes) -> Optional['GroupingsCorpus']:
+        """The corpus in corpus_file if it was written for key, else None"""
+        try:
+            corpus = cls(corpus_file)
+        except (OSError, ValueError, struct.error):
+            return None
+        return corpus if corpus.key == key else None
+
+    def _record(self, position: int):
+        return RECORD.unpack_from(self._map, HEADER.size + position * RECORD.size)
+
+    def _name(self, position: int) -> bytes:
+        name_offset, name_length = self._record(position)[:2]
+        return self._map[name_offset:name_offset + name_length]
+
+    def lookup(self, name: str, upto: int) -> Optional[str]:
+        """Body of the last definition of name among sources 0..upto"""
+        target = name.encode()
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        found = None
+        while low < self.count and self._name(low) == target:
+            _, _, index, body_offset, body_length = self._record(low)
+            if index > upto:
+                break
+            found = (body_offset, body_length)
+            low += 1
+        if found is None:
+            return None
+        return self._map[found[0]:found[0] + found[1]].decode()
+
+    def names(self, upto: int) -> Iterator[str]:
+        seen = None
+        for position in range(self.count):
+            name_offset, name_length, index = self._record(position)[:3]
+            name = self._map[name_offset:name_offset + name_length]
+            if index <= upto and name != seen:
+                seen = name
+                yield name.decode()
+
+    def view(self, upto: int) -> 'GroupingsView':
+        return GroupingsView(self, upto)
+
+
+class GroupingsView(MutableMapping):
+    """
+    groupings_cache stand-in for one module: the groupings of sources 0..upto,
+    plus whatever the module's own extract_groupings() adds on top
+    """
+
+    def __init__(self, corpus: GroupingsCorpus, upto: int):
+        self.corpus = corpus
+        self.upto = upto
+        self.local: Dict[str, str] = {}
+        self._missing = set()
+
+    def __getitem__(self, name: str) -> str:
+        if name in self.local:
+            return self.local[name]
+        if name not in self._missing:
+            body = self.corpus.lookup(name, self.upto)
+            if body is not None:
+                self.local[name] = body
+                return body
+            self._missing.add(name)
+        raise KeyError(name)
+
+    def __contains__(self, name: Any) -> bool:
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, name: str, body: str):
+        self.local[name] = body
+
+    def __delitem__(self, name: str):
+        del self.local[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict.fromkeys(list(self.corpus.names(self.upto)) + list(self.local)))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Shared JSON serialization layer for the generators and post-processing scripts.
+Uses orjson or msgspec when installed and falls back to the stdlib json module.
+
+Pretty mode (the default) matches the `json.dump(..., indent=2)` layout the
+specs have always been written with; compact mode drops all whitespace.
+Non-ASCII text is written as \\uXXXX escapes, as json.dump does by default,
+whichever backend serializes; ensure_ascii=False writes raw UTF-8 instead
+(for the few outputs that always have), so switching backends never changes
+a committed file's bytes.
+Set SPEC_JSON_BACKEND=json|orjson|msgspec to force a particular backend.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+AVAILABLE_BACKENDS = ['json'] + [name for name, mod in (('orjson', orjson), ('msgspec', msgspec)) if mod]
+
+PathLike = Union[str, Path]
+
+_BOM = b'\xef\xbb\xbf'
+# What json.dumps(ensure_ascii=True) escapes beyond control characters, which every backend escapes
+_NON_ASCII = re.compile('[\x7f-\U0010ffff]')
+
+
+def _default_backend() -> str:
+    """Pick the backend from SPEC_JSON_BACKEND, else the fastest installed one"""
+    requested = os.environ.get('SPEC_JSON_BACKEND', '').strip().lower()
+    if requested:
+        if requested not in AVAILABLE_BACKENDS:
+            raise ValueError(f"SPEC_JSON_BACKEND={requested!r} is not installed "
+                             f"(available: {', '.join(AVAILABLE_BACKENDS)})")
+        return requested
+    if orjson:
+        return 'orjson'
+    if msgspec:
+        return 'msgspec'
+    return 'json'
+
+
+BACKEND = _default_backend()
+
+
+def set_backend(name: str):
+    """Switch the active backend (used by the benchmark)"""
+    global BACKEND
+    if name not in AVAILABLE_BACKENDS:
+        raise ValueError(f"JSON backend {name!r} is not installed (available: {', '.join(AVAILABLE_BACKENDS)})")
+    BACKEND = name
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str"""
+    if isinstance(data, bytes) and data.startswith(_BOM):
+        data = data[len(_BOM):]
+    elif isinstance(data, str) and data.startswith('\ufeff'):
+        data = data[1:]
+
+    if BACKEND == 'orjson':
+        return orjson.loads(data)
+    if BACKEND == 'msgspec':
+        return msgspec.json.decode(data.encode('utf-8') if isinstance(data, str) else data)
+    return json.loads(data)
+
+
+def _escape(match) -> str:
+    code = ord(match.group())
+    if code > 0xffff:
+        code -= 0x10000
+        return '\\u%04x\\u%04x' % (0xd800 | (code >> 10), 0xdc00 | (code & 0x3ff))
+    return '\\u%04x' % code
+
+
+def _ascii(data: bytes) -> bytes:
+    """data with non-ASCII characters escaped exactly as json.dumps(ensure_ascii=True) does"""
+    if data.isascii() and b'\x7f' not in data:
+        return data
+    # Outside strings JSON output is plain ASCII, so only string contents are rewritten
+    return _NON_ASCII.sub(_escape, data.decode('utf-8')).encode('ascii')
+
+
+def dumpb(obj: Any, pretty: bool = True, sort_keys: bool = False, ensure_ascii: bool = True) -> bytes:
+    """
+    Serialize to UTF-8 bytes; pretty uses a 2-space indent, compact has no whitespace.
+    sort_keys orders every object's keys for byte-stable output; ensure_ascii
+    escapes non-ASCII characters like json.dumps.
+    """
+    if BACKEND == 'orjson':
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            data = orjson.dumps(obj, option=option | (orjson.OPT_SORT_KEYS if sort_keys else 0))
+            return _ascii(data) if ensure_ascii else data
+        except (TypeError, orjson.JSONEncodeError):
+            pass  # e.g. integers wider than 64 bits - let stdlib handle it
+    elif BACKEND == 'msgspec':
+        try:
+            encoded = msgspec.json.encode(obj, order='sorted') if sort_keys else msgspec.json.encode(obj)
+            data = msgspec.json.format(encoded, indent=2) if pretty else encoded
+            return _ascii(data) if ensure_ascii else data
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            pass
+
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=ensure_ascii, sort_keys=sort_keys).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=ensure_ascii, sort_keys=sort_keys).encode('utf-8')
+
+
+def dumps(obj: Any, pretty: bool = True, sort_keys: bool = False, ensure_ascii: bool = True) -> str:
+    """Serialize to a str"""
+    return dumpb(obj, pretty, sort_keys, ensure_ascii).decode('utf-8')
+
+
+def load(path: PathLike) -> Any:
+    """Read and parse a JSON file"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump(obj: Any, path: PathLike, pretty: bool = True, sort_keys: bool = False,
+         ensure_ascii: bool = True) -> int:
+    """Serialize obj to path and return the number of bytes written"""
+    data = dumpb(obj, pretty, sort_keys, ensure_ascii)
+    write_bytes(path, data)
+    return len(data)
+
+
+def write_bytes(path: PathLike, data: bytes):
+    """Write already-serialized JSON to path"""
+    with open(path, 'wb') as f:
+        f.write(data)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Post-processing plugins for generated specs, applied in one pass.
+
+The post-generation steps (tree links, GitHub links, MIB tree links, example
+payloads) each used to load every spec, change a few fields and write it back:
+one full read/parse/serialize cycle over all ~80 MB of specs per step. Each
+step now registers its in-memory transform here with @spec_plugin, and
+run_plugins() loads every spec once, applies each plugin that wants it in
+registration order and writes the spec once, only if a plugin changed it. A rewritten spec that the generator
+also split into api/fragments/ (--fragments) is split again, since the model
+pages load the fragments rather than the spec.
+
+A plugin is transform(spec, spec_file) -> bool, True if it changed spec. It
+runs on the api/*.json specs of its models (all by default) whose file names
+match its pattern. Plugins registered with default=False are manual steps run
+only when named (scripts/postprocess_specs.py --plugin NAME). A spec is
+written with ASCII escapes unless the last plugin that changed it was
+registered with ensure_ascii=False, as each step's own json.dump once did.
+"""
+
+import fnmatch
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import spec_io
+from spec_writer import refresh_fragments, update_fragment_index
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MODEL_DIRS = ('swagger-oper-model', 'swagger-rpc-model', 'swagger-events-model', 'swagger-native-config-model',
+              'swagger-cfg-model', 'swagger-ietf-model', 'swagger-openconfig-model', 'swagger-mib-model',
+              'swagger-other-model')
+# Manifests (manifest.json, events-manifest.json, ...) sit next to the specs in api/
+MANIFEST_PATTERN = '*manifest.json'
+
+Transform = Callable[[dict, Path], bool]
+
+
+class SpecPlugin:
+    """One registered spec transform and the spec files it applies to"""
+
+    def __init__(self, name: str, transform: Transform, models: Optional[Sequence[str]] = None,
+                 pattern: str = '*.json', default: bool = True, ensure_ascii: bool = True):
+        self.name = name
+        self.transform = transform
+        self.models = tuple(models) if models else MODEL_DIRS
+        self.pattern = pattern
+        self.default = default
+        self.ensure_ascii = ensure_ascii
+        self.changed = 0
+        self.errors = 0
+
+    def applies(self, model: str, spec_file: Path) -> bool:
+        return model in self.models and fnmatch.fnmatchcase(spec_file.name, self.pattern)
+
+
+PLUGINS: Dict[str, SpecPlugin] = {}
+
+
+def spec_plugin(name: str, models: Optional[Sequence[str]] = None, pattern: str = '*.json',
+                default: bool = True, ensure_ascii: bool = True):
+    """Register the decorated transform(spec, spec_file) -> bool as plugin `name`"""
+    def register(transform: Transform) -> Transform:
+        PLUGINS[name] = SpecPlugin(name, transform, models, pattern, default, ensure_ascii)
+        return transform
+    return register
+
+
+def select_plugins(names: Iterable[str] = ()) -> List[SpecPlugin]:
+    """The named plugins, or every default one, in registration order"""
+    names = set(names)
+    unknown = names - set(PLUGINS)
+    if unknown:
+        raise SystemExit(f"Unknown plugin(s): {', '.join(sorted(unknown))} (known: {', '.join(PLUGINS)})")
+    return [plugin for plugin in PLUGINS.values() if (plugin.name in names if names else plugin.default)]
+
+
+def run_plugins(plugins: Sequence[SpecPlugin], root: Path = REPO_ROOT, verbose: bool = False) -> int:
+    """Apply plugins to every spec under root in one pass; returns the number of specs rewritten"""
+    rewritten = 0
+    for model in MODEL_DIRS:
+        api_dir = root / model / 'api'
+        if not api_dir.is_dir():
+            continue
+        skeletons = {}
+        for spec_file in sorted(api_dir.glob('*.json')):
+            if fnmatch.fnmatchcase(spec_file.name, MANIFEST_PATTERN):
+                continue
+            selected = [plugin for plugin in plugins if plugin.applies(model, spec_file)]
+            if not selected:
+                continue
+            spec = spec_io.load(spec_file)
+            changed = []
+            for plugin in selected:
+                try:
+                    if plugin.transform(spec, spec_file):
+                        plugin.changed += 1
+                        changed.append(plugin)
+                except Exception as e:
+                    plugin.errors += 1
+                    print(f"  ❌ {plugin.name}: error processing {model}/{spec_file.name}: {e}")
+            if changed:
+                spec_io.dump(spec, spec_file, ensure_ascii=changed[-1].ensure_ascii)
+                rewritten += 1
+                skeleton = refresh_fragments(api_dir, spec_file.stem, spec)
+                if skeleton:
+                    skeletons[spec_file.stem] = skeleton
+                if verbose:
+                    print(f"  ✅ {model}/{spec_file.name}: {', '.join(plugin.name for plugin in changed)}")
+        update_fragment_index(api_dir, skeletons)
+    return rewritten
+
+
+def report(plugins: Sequence[SpecPlugin]):
+    """Print how many specs each plugin changed"""
+    for plugin in plugins:
+        errors = f", {plugin.errors} errors" if plugin.errors else ''
+        print(f"  {plugin.name:<16} {plugin.changed} specs updated{errors}")
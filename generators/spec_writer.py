@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+Single output point for the spec generators.
+Every generator hands its finished specs and manifest to a SpecWriter instead of
+writing files itself, so optional output formats are implemented once here.
+
+Optional outputs:
+  --fragments   Also write api/fragments/<spec>/ - a skeleton index.json with one
+                stub per operation plus one self-contained file per path, so the
+                model pages only download the operations a user expands. The
+                post-processing pass splits the specs it changes again.
+  --fingerprint Name fragments and sidecar files by content hash, so they can be
+                cached immutably. The specs themselves are fingerprinted after
+                post-processing (scripts/fingerprint_outputs.py), since that
+                pass still changes them.
+  --externalize Write compact specs: examples become externalValue files and long
+                descriptions move to a per-spec sidecar under api/external/<spec>/,
+                which the model pages fetch when an operation is expanded.
+                Description IDs index the build-level api/external/descriptions.json,
+                which stores each distinct text once.
+  --slim        Also write api/slim/<spec>.json for machine consumers: paths,
+                methods, parameters and schemas only - no examples, descriptions
+                or info/tag prose - compact, with sorted keys.
+  --full        Regenerate every spec; by default generators reuse the specs of
+                modules whose sources are unchanged (see build_manifest).
+  --cache-dir   Also store each module's outputs in a content-addressed artifact
+                cache shared between builders, and restore from it (see artifact_cache).
+  --shard i/N   Build only this shard's modules and leave the manifest and indexes
+                to --merge-shards, which combines all shards (see sharding).
+"""
+
+import itertools
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import spec_io
+from artifact_cache import add_cache_argument
+from build_manifest import BUILD_DIR
+from fingerprint import fingerprinted_name, is_fingerprinted
+from sharding import SHARD_DIR, Shard
+
+FRAGMENTS_DIR = 'fragments'
+EXTERNAL_DIR = 'external'
+DESCRIPTION_TABLE = 'descriptions.json'
+SLIM_DIR = 'slim'
+# Keys dropped from every object in the slim profile (response descriptions are kept -
+# they are required and short)
+SLIM_DROPPED_KEYS = frozenset({'description', 'summary', 'example', 'examples', 'externalDocs',
+                               'x-description-ref', 'x-fragments', 'x-external'})
+# Maps keyed by user-chosen names, whose keys must never be dropped
+NAME_MAPS = frozenset({'properties', 'paths', 'schemas', 'securitySchemes', 'responses',
+                       'content', 'parameters', 'requestBodies', 'headers', 'patternProperties'})
+# Descriptions longer than LONG_DESCRIPTION move to the sidecar; the spec keeps the
+# first DESCRIPTION_STUB characters until the page loads the full text
+LONG_DESCRIPTION = 100
+DESCRIPTION_STUB = 60
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+# Operation keys kept in the skeleton - enough for Swagger UI to render the collapsed list
+STUB_KEYS = ('tags', 'summary', 'operationId', 'deprecated')
+# Maps of objects whose 'content' holds media types (operation responses, components)
+CONTENT_MAPS = frozenset({'responses', 'requestBodies', 'parameters'})
+REF_PATTERN = re.compile(r'^#/components/([^/]+)/(.+)$')
+
+
+def add_output_arguments(parser):
+    """Register the shared output options on a generator's argparse parser"""
+    group = parser.add_argument_group('output options')
+    group.add_argument('--fragments', action='store_true',
+                       help='Also write per-path fragments and a lazily loaded path index per spec')
+    group.add_argument('--fingerprint', action='store_true',
+                       help='Name fragments and sidecar files by content hash (specs: scripts/fingerprint_outputs.py)')
+    group.add_argument('--externalize', action='store_true',
+                       help='Move examples and long descriptions to sidecar files loaded on demand')
+    group.add_argument('--slim', action='store_true',
+                       help='Also write a slim machine-consumer profile of each spec to api/slim/')
+    group.add_argument('--full', action='store_true',
+                       help='Regenerate every spec, even those whose source modules are unchanged')
+    group.add_argument('--shard', type=Shard.parse, metavar='I/N',
+                       help='Build only shard I of N (modules split by file size); combine with --merge-shards')
+    group.add_argument('--merge-shards', action='store_true',
+                       help="Combine the shards' build manifests and write the final manifest and indexes")
+    add_cache_argument(group)
+    return parser
+
+
+def _collect_refs(node: Any, refs: Set[Tuple[str, str]]):
+    """Collect every local components $ref (section, name) inside node"""
+    if isinstance(node, dict):
+        ref = node.get('$ref')
+        if isinstance(ref, str):
+            match = REF_PATTERN.match(ref)
+            if match:
+                refs.add((match.group(1), match.group(2)))
+        for value in node.values():
+            _collect_refs(value, refs)
+    elif isinstance(node, (list, tuple)):
+        for value in node:
+            _collect_refs(value, refs)
+
+
+def referenced_components(node: Any, components: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Transitive closure of the components referenced from node"""
+    pending: Set[Tuple[str, str]] = set()
+    _collect_refs(node, pending)
+    seen: Set[Tuple[str, str]] = set()
+    result: Dict[str, Dict[str, Any]] = {}
+
+    while pending:
+        section, name = pending.pop()
+        if (section, name) in seen:
+            continue
+        seen.add((section, name))
+        target = components.get(section, {}).get(name)
+        if target is None:
+            continue
+        result.setdefault(section, {})[name] = target
+        found: Set[Tuple[str, str]] = set()
+        _collect_refs(target, found)
+        pending |= found - seen
+
+    # Sets iterate in hash order, which varies between processes; sort for stable output
+    return {section: dict(sorted(entries.items())) for section, entries in sorted(result.items())}
+
+
+def _operation_id(method: str, path: str, operation: Dict[str, Any], used: Set[str]) -> str:
+    """The operation's own id, or a deep-link safe one derived from method and path"""
+    op_id = operation.get('operationId') or re.sub(r'[^A-Za-z0-9_]', '_', f"{method}{path}")
+    unique_id = op_id
+    suffix = 2
+    while unique_id in used:
+        unique_id = f"{op_id}_{suffix}"
+        suffix += 1
+    used.add(unique_id)
+    return unique_id
+
+
+def split_into_fragments(spec: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Split a spec into a skeleton and one fragment per path.
+
+    The skeleton keeps info/servers/tags/security, one stub per operation and the
+    securitySchemes; 'x-fragments' maps each path to its fragment file. Every
+    operation gets an operationId so the page can map an expanded operation back
+    to its path. Fragments carry the full path item plus the components it needs.
+    """
+    components = spec.get('components', {})
+    skeleton = {key: value for key, value in spec.items() if key not in ('paths', 'components')}
+    skeleton['paths'] = {}
+    if 'securitySchemes' in components:
+        skeleton['components'] = {'securitySchemes': components['securitySchemes']}
+
+    fragment_files: Dict[str, str] = {}
+    fragments: List[Dict[str, Any]] = []
+    used_ids: Set[str] = set()
+
+    for index, (path, path_item) in enumerate(spec.get('paths', {}).items()):
+        full_item = dict(path_item)
+        stub_item = {}
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if not isinstance(operation, dict):
+                continue
+            op_id = _operation_id(method, path, operation, used_ids)
+            full_item[method] = dict(operation, operationId=op_id)
+            stub_item[method] = {key: operation[key] for key in STUB_KEYS if key in operation}
+            stub_item[method]['operationId'] = op_id
+
+        file_name = f"{index}.json"
+        skeleton['paths'][path] = stub_item
+        fragment_files[path] = file_name
+        fragments.append({
+            'file': file_name,
+            'path': path,
+            'pathItem': full_item,
+            'components': referenced_components(full_item, components)
+        })
+
+    skeleton['x-fragments'] = fragment_files
+    return skeleton, fragments
+
+
+def write_fragments(fragments_dir: Path, name: str, spec: Dict[str, Any], fingerprint: bool = False) -> str:
+    """
+    Write <fragments_dir>/<name>/index.json and one file per path, content-hashed
+    names with fingerprint; returns the skeleton's path relative to fragments_dir
+    """
+    spec_dir = fragments_dir / name
+    if spec_dir.exists():
+        shutil.rmtree(spec_dir)  # drop fragments of paths that no longer exist
+    spec_dir.mkdir(parents=True)
+
+    skeleton, fragments = split_into_fragments(spec)
+    for fragment in fragments:
+        data = spec_io.dumpb({key: value for key, value in fragment.items() if key != 'file'}, pretty=False)
+        file_name = fragment['file']
+        if fingerprint:
+            file_name = fingerprinted_name(file_name[:-len('.json')], '.json', data)
+            skeleton['x-fragments'][fragment['path']] = file_name
+        spec_io.write_bytes(spec_dir / file_name, data)
+
+    data = spec_io.dumpb(skeleton, pretty=False)
+    skeleton_name = fingerprinted_name('index', '.json', data) if fingerprint else 'index.json'
+    spec_io.write_bytes(spec_dir / skeleton_name, data)
+    return f"{name}/{skeleton_name}"
+
+
+def refresh_fragments(output_dir, name: str, spec: Dict[str, Any]) -> Optional[str]:
+    """
+    Split api/<name>.json into fragments again after it changed (see
+    spec_plugins), named as before (fingerprinted or not). Returns the new
+    skeleton path for update_fragment_index(), or None if the spec has no
+    fragments.
+    """
+    fragments_dir = Path(output_dir) / FRAGMENTS_DIR
+    skeletons = sorted((fragments_dir / name).glob('index*.json'))
+    if not skeletons:
+        return None
+    return write_fragments(fragments_dir, name, spec, is_fingerprinted(skeletons[0].name))
+
+
+def update_fragment_index(output_dir, skeletons: Dict[str, str]):
+    """Point api/fragments/index.json at refreshed skeletons ({spec name: path from refresh_fragments()})"""
+    index_file = Path(output_dir) / FRAGMENTS_DIR / 'index.json'
+    if not skeletons or not index_file.exists():
+        return
+    index = spec_io.load(index_file)
+    index['modules'] = dict(sorted({**index['modules'], **skeletons}.items()))
+    spec_io.dump(index, index_file)
+
+
+class DescriptionTable:
+    """Build-level table of distinct description strings, addressed by stable integer IDs"""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def id_for(self, text: str) -> int:
+        """ID of text, adding it on first use"""
+        description_id = self._ids.get(text)
+        if description_id is None:
+            description_id = self._ids[text] = len(self.texts)
+            self.texts.append(sys.intern(text))
+        return description_id
+
+    def subset(self, ids) -> Dict[str, str]:
+        """{id: text} for the given IDs (JSON object keys are strings)"""
+        return {str(description_id): self.texts[description_id] for description_id in sorted(ids)}
+
+
+def externalize_spec(spec: Dict[str, Any], example_url, descriptions: Optional[DescriptionTable] = None,
+                     min_length: int = LONG_DESCRIPTION) -> Tuple[Dict[str, Any], Set[int]]:
+    """
+    Compact copy of spec without example values or long descriptions.
+
+    Every example value (media type 'example', 'examples' entries and
+    components/examples) is replaced by an externalValue from example_url(value).
+    Descriptions longer than min_length are cut to a stub and tagged with
+    'x-description-ref', their ID in the descriptions table; the IDs used are
+    returned with the spec. Operations get operationIds so the page can find an
+    expanded operation's examples. The input spec is not modified.
+    """
+    if descriptions is None:
+        descriptions = DescriptionTable()
+    used_descriptions: Set[int] = set()
+    urls: Dict[int, str] = {}
+
+    def external(value: Any) -> str:
+        # The same example object is often shared by GET/PUT/PATCH; write it once
+        if id(value) not in urls:
+            urls[id(value)] = example_url(value)
+        return urls[id(value)]
+
+    def external_example(example: Dict[str, Any]) -> Dict[str, Any]:
+        if 'value' not in example:
+            return walk(example)
+        result = walk({key: value for key, value in example.items() if key != 'value'})
+        result['externalValue'] = external(example['value'])
+        return result
+
+    def media_type(media: Dict[str, Any]) -> Dict[str, Any]:
+        result = walk({key: value for key, value in media.items() if key not in ('example', 'examples')})
+        if 'examples' in media:
+            result['examples'] = {name: external_example(example) for name, example in media['examples'].items()}
+        elif 'example' in media:
+            result['examples'] = {'default': {'externalValue': external(media['example'])}}
+        return result
+
+    def walk(node: Any, has_content: bool = False) -> Any:
+        # has_content: node is a request body, response or parameter, whose 'content' maps media types
+        if isinstance(node, (list, tuple)):
+            return [walk(value) for value in node]
+        if not isinstance(node, dict):
+            return node
+        result = {}
+        for key, value in node.items():
+            if has_content and key == 'content' and isinstance(value, dict):
+                result[key] = {name: media_type(media) if isinstance(media, dict) else media
+                               for name, media in value.items()}
+            elif key == 'requestBody':
+                result[key] = walk(value, True)
+            elif key in CONTENT_MAPS and isinstance(value, dict):
+                result[key] = {name: walk(item, True) for name, item in value.items()}
+            elif key == 'parameters' and isinstance(value, list):
+                result[key] = [walk(item, True) for item in value]
+            elif key in NAME_MAPS and isinstance(value, dict):
+                # Keys here are names (a property may well be called 'content'), not keywords
+                result[key] = {name: walk(item) for name, item in value.items()}
+            elif key == 'description' and isinstance(value, str) and len(value) > min_length:
+                description_id = descriptions.id_for(value)
+                used_descriptions.add(description_id)
+                result[key] = value[:DESCRIPTION_STUB].rstrip() + '…'
+                result['x-description-ref'] = description_id
+            else:
+                result[key] = walk(value)
+        return result
+
+    compact = {key: value if key in ('info', 'paths', 'components') else walk(value)
+               for key, value in spec.items()}
+
+    used_ids: Set[str] = set()
+    compact['paths'] = {}
+    for path, path_item in spec.get('paths', {}).items():
+        item = walk(path_item)
+        for method in HTTP_METHODS:
+            if isinstance(item.get(method), dict):
+                item[method]['operationId'] = _operation_id(method, path, path_item[method], used_ids)
+        compact['paths'][path] = item
+
+    if 'components' in spec:
+        components = dict(spec['components'])
+        examples = components.pop('examples', None)
+        compact['components'] = walk(components)
+        if examples is not None:
+            compact['components']['examples'] = {name: external_example(example)
+                                                 for name, example in examples.items()}
+
+    return compact, used_descriptions
+
+
+def slim_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Machine-consumer profile of spec: examples, descriptions, summaries and info/tag
+    prose removed; info keeps title and version, tags keep their names.
+    """
+    def walk(node: Any, names: bool = False) -> Any:
+        if isinstance(node, (list, tuple)):
+            return [walk(value) for value in node]
+        if not isinstance(node, dict):
+            return node
+        if names:
+            return {name: walk(value) for name, value in node.items()}
+        return {key: walk(value, key in NAME_MAPS and isinstance(value, dict))
+                for key, value in node.items() if key not in SLIM_DROPPED_KEYS}
+
+    slim = walk({key: value for key, value in spec.items() if key not in ('info', 'tags')})
+    info = spec.get('info', {})
+    slim['info'] = {key: info[key] for key in ('title', 'version') if key in info}
+    if 'tags' in spec:
+        slim['tags'] = [{'name': tag['name']} for tag in spec['tags'] if 'name' in tag]
+
+    # Response objects require a description; keep the (short) original
+    for path, path_item in spec.get('paths', {}).items():
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if not isinstance(operation, dict) or not isinstance(operation.get('responses'), dict):
+                continue
+            for code, response in operation['responses'].items():
+                if isinstance(response, dict) and 'description' in response:
+                    slim['paths'][path][method]['responses'][code]['description'] = response['description']
+    return slim
+
+
+class SpecWriter:
+    """Writes generated specs, manifests and optional derived outputs for one api/ directory"""
+
+    def __init__(self, output_dir, fragments: bool = False, fingerprint: bool = False,
+                 externalize: bool = False, slim: bool = False, pretty: bool = True,
+                 shard: Optional[Shard] = None):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.fragments = fragments
+        self.fingerprint = fingerprint
+        self.externalize = externalize
+        self.slim = slim
+        self.descriptions = DescriptionTable()
+        self.pretty = pretty
+        self.shard = shard
+        self.fragment_index: Dict[str, str] = {}
+
+    @classmethod
+    def from_args(cls, output_dir, args) -> 'SpecWriter':
+        """Build a writer from the options registered by add_output_arguments()"""
+        shard = getattr(args, 'shard', None)
+        externalize = getattr(args, 'externalize', False)
+        if externalize and (shard or getattr(args, 'merge_shards', False)):
+            # Description IDs are assigned build-wide in write order
+            raise SystemExit("--externalize cannot be combined with --shard or --merge-shards")
+        return cls(output_dir,
+                   fragments=getattr(args, 'fragments', False),
+                   fingerprint=getattr(args, 'fingerprint', False),
+                   externalize=externalize,
+                   slim=getattr(args, 'slim', False),
+                   shard=shard)
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """The options that change what write_spec() produces"""
+        return {'fragments': self.fragments, 'fingerprint': self.fingerprint,
+                'externalize': self.externalize, 'slim': self.slim, 'pretty': self.pretty}
+
+    @property
+    def fragments_dir(self) -> Path:
+        return self.output_dir / FRAGMENTS_DIR
+
+    @property
+    def external_dir(self) -> Path:
+        return self.output_dir / EXTERNAL_DIR
+
+    @property
+    def slim_dir(self) -> Path:
+        return self.output_dir / SLIM_DIR
+
+    def serialize(self, spec: Dict[str, Any]) -> bytes:
+        """Serialize a spec exactly as write_spec() would write it"""
+        return spec_io.dumpb(spec, self.pretty)
+
+    def write_spec(self, name: str, spec: Dict[str, Any], data: Optional[bytes] = None) -> int:
+        """
+        Write api/<name>.json (plus any enabled derived outputs).
+        Pass data from serialize() when the caller already needed the bytes
+        (e.g. for a size check). Returns bytes written.
+        """
+        if self.slim:
+            self.slim_dir.mkdir(exist_ok=True)
+            spec_io.dump(slim_spec(spec), self.slim_dir / f"{name}.json", pretty=False, sort_keys=True)
+
+        if self.externalize:
+            spec = self._write_external(name, spec)
+            data = None
+        if data is None:
+            data = self.serialize(spec)
+        spec_io.write_bytes(self.output_dir / f"{name}.json", data)
+
+        if self.fragments:
+            self.fragment_index[name] = write_fragments(self.fragments_dir, name, spec, self.fingerprint)
+
+        return len(data)
+
+    def reuse_spec(self, name: str) -> bool:
+        """
+        Keep api/<name>.json from an earlier run with the same options, registering
+        its derived outputs as write_spec() would. False if the spec or one of its
+        enabled derived outputs is missing, and always with --externalize, whose
+        build-wide description IDs are assigned afresh on every run.
+        """
+        spec_file = self.output_dir / f"{name}.json"
+        if self.externalize or not spec_file.exists():
+            return False
+        if self.slim and not (self.slim_dir / f"{name}.json").exists():
+            return False
+
+        if self.fragments:
+            skeletons = sorted((self.fragments_dir / name).glob('index*.json'))
+            if not skeletons:
+                return False
+            self.fragment_index[name] = f"{name}/{skeletons[0].name}"
+        return True
+
+    def spec_outputs(self, name: str) -> Dict[str, bytes]:
+        """
+        The files reuse_spec() needs for api/<name>.json ({path relative to api/:
+        content}): the spec, its slim copy and its fragments, as enabled
+        """
+        paths = [self.output_dir / f"{name}.json"]
+        if self.slim:
+            paths.append(self.slim_dir / f"{name}.json")
+        if self.fragments:
+            paths.extend(sorted((self.fragments_dir / name).glob('*.json')))
+        return {path.relative_to(self.output_dir).as_posix(): path.read_bytes()
+                for path in paths if path.exists()}
+
+    def restore_outputs(self, files: Dict[str, bytes]):
+        """Write back files from spec_outputs(), replacing the fragments of the specs they cover"""
+        for path in files:
+            parts = Path(path).parts
+            if parts[0] == FRAGMENTS_DIR and (self.fragments_dir / parts[1]).exists():
+                shutil.rmtree(self.fragments_dir / parts[1])
+        for path, data in files.items():
+            (self.output_dir / path).parent.mkdir(parents=True, exist_ok=True)
+            spec_io.write_bytes(self.output_dir / path, data)
+
+    def _write_external(self, name: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write api/external/<name>/ (examples/ plus descriptions.json holding the
+        {id: text} entries this spec uses) and return the compact spec. Sidecar
+        URLs are relative to the api/ directory.
+        """
+        spec_dir = self.external_dir / name
+        if spec_dir.exists():
+            shutil.rmtree(spec_dir)
+        (spec_dir / 'examples').mkdir(parents=True)
+        counter = itertools.count()
+
+        def example_url(value: Any) -> str:
+            data = spec_io.dumpb(value, pretty=False)
+            file_name = f"{next(counter)}.json"
+            if self.fingerprint:
+                file_name = fingerprinted_name(file_name[:-len('.json')], '.json', data)
+            spec_io.write_bytes(spec_dir / 'examples' / file_name, data)
+            return f"{EXTERNAL_DIR}/{name}/examples/{file_name}"
+
+        compact, used_descriptions = externalize_spec(spec, example_url, self.descriptions)
+
+        data = spec_io.dumpb({'descriptions': self.descriptions.subset(used_descriptions)}, pretty=False)
+        descriptions_name = fingerprinted_name('descriptions', '.json', data) if self.fingerprint \
+            else 'descriptions.json'
+        spec_io.write_bytes(spec_dir / descriptions_name, data)
+        compact['x-external'] = {
+            'descriptions': f"{EXTERNAL_DIR}/{name}/{descriptions_name}",
+            'descriptionTable': f"{EXTERNAL_DIR}/{DESCRIPTION_TABLE}"
+        }
+        return compact
+
+    def write_manifest(self, manifest: Dict[str, Any], name: str = 'manifest') -> Path:
+        """
+        Write api/<name>.json and return its path.
+        A shard writes its part to api/build/shards/<name>-<i>-of-<N>.json instead.
+        """
+        if self.shard:
+            manifest_file = self.output_dir / BUILD_DIR / SHARD_DIR / f"{name}-{self.shard.label}.json"
+            manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            spec_io.dump(manifest, manifest_file, self.pretty)
+            return manifest_file
+        manifest_file = self.output_dir / f"{name}.json"
+        spec_io.dump(manifest, manifest_file, self.pretty)
+        if self.slim:
+            self.slim_dir.mkdir(exist_ok=True)
+            spec_io.dump({key: value for key, value in manifest.items() if key != 'files'},
+                         self.slim_dir / f"{name}.json", pretty=False, sort_keys=True)
+        return manifest_file
+
+    def finalize(self):
+        """
+        Write the index files for the enabled outputs.
+        A run without --fragments/--externalize/--slim removes
+        what an earlier run left so the pages never serve a copy that is older
+        than the full spec. A shard only sees its own specs and leaves the
+        indexes to --merge-shards.
+        """
+        if self.shard:
+            return
+        if self.fragments:
+            spec_io.dump({'modules': dict(sorted(self.fragment_index.items()))},
+                         self.fragments_dir / 'index.json')
+        elif self.fragments_dir.exists():
+            shutil.rmtree(self.fragments_dir)
+
+        if self.externalize:
+            self.external_dir.mkdir(exist_ok=True)
+            spec_io.dump({'descriptions': self.descriptions.texts},
+                         self.external_dir / DESCRIPTION_TABLE, pretty=False)
+        elif self.external_dir.exists():
+            shutil.rmtree(self.external_dir)
+        if not self.slim and self.slim_dir.exists():
+            shutil.rmtree(self.slim_dir)
@@ -4,9 +4,12 @@ Rebuild the Events model manifest.json file.
 Scans all Event notification spec files and creates an updated manifest.
 """
 
-import json
 import os
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'generators'))
+import spec_io  # noqa: E402
 
 def main():
     # Define the directory
@@ -32,13 +35,8 @@ def main():
         module_name = json_file.stem
         
         try:
-            # Try utf-8-sig first to handle BOM, fallback to utf-8
-            try:
-                with open(json_file, 'r', encoding='utf-8-sig') as f:
-                    spec = json.load(f)
-            except:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    spec = json.load(f)
+            # spec_io strips a leading BOM if present
+            spec = spec_io.load(json_file)
             
             # Count paths that start with /ws/event-streams/
             path_count = 0
@@ -77,8 +75,7 @@ def main():
     
     # Save manifest
     manifest_path = api_dir / "manifest.json"
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    spec_io.dump(manifest, manifest_path, ensure_ascii=False)
     
     print("\n" + "="*70)
     print("  MANIFEST GENERATION COMPLETE")
@@ -90,8 +87,7 @@ def main():
     
     # Validate JSON
     try:
-        with open(manifest_path, 'r', encoding='utf-8') as f:
-            json.load(f)
+        spec_io.load(manifest_path)
         print(f"\n✓ manifest.json validated successfully")
     except Exception as e:
         print(f"\n✗ Validation error: {e}")
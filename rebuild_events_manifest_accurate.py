@@ -4,16 +4,18 @@ Rebuild Events Model Manifest with Accurate Notification Path Counts
 Scans all Event spec files and counts WebSocket notification paths
 """
 
-import json
 import os
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'generators'))
+import spec_io  # noqa: E402
 
 def count_notification_paths(spec_file):
     """Count all notification paths in a spec file"""
     try:
         # Try utf-8-sig first to handle BOM, then fall back to utf-8
-        with open(spec_file, 'r', encoding='utf-8-sig') as f:
-            spec = json.load(f)
+        spec = spec_io.load(spec_file)
         
         # Count ALL paths - this includes:
         # - WebSocket paths: /ws/event-streams/...
@@ -70,8 +72,7 @@ def rebuild_events_manifest():
     
     # Write manifest
     manifest_path = api_dir / 'manifest.json'
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2)
+    spec_io.dump(manifest, manifest_path)
     
     # Print summary
     print(f"\n{'='*60}")
@@ -85,8 +86,7 @@ def rebuild_events_manifest():
     # Validation
     print("🔍 Validating JSON...")
     try:
-        with open(manifest_path, 'r', encoding='utf-8') as f:
-            json.load(f)
+        spec_io.load(manifest_path)
         print("✅ manifest.json is valid JSON\n")
     except Exception as e:
         print(f"❌ Validation error: {e}\n")
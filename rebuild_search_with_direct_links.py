@@ -1,7 +1,11 @@
-import json
 import glob
 import os
 from datetime import datetime
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'generators'))
+import spec_io  # noqa: E402
 
 # Initialize the search index
 search_data = {
@@ -92,8 +96,7 @@ for model_dir, info in model_dirs.items():
             continue
         
         try:
-            with open(filepath, 'r', encoding='utf-8-sig') as f:
-                spec = json.load(f)
+            spec = spec_io.load(filepath)
             
             # Extract module name
             module_name = filename.replace('.json', '')
@@ -190,8 +193,7 @@ search_data["stats"]["total_modules"] = len(search_data["modules"])
 search_data["stats"]["total_endpoints"] = total_endpoints
 
 # Write the search index
-with open('search-index.json', 'w', encoding='utf-8') as f:
-    json.dump(search_data, f, indent=2)
+spec_io.dump(search_data, 'search-index.json')
 
 print(f"\n✅ Generated search index with direct spec links:")
 print(f"   - {search_data['stats']['total_modules']} modules")
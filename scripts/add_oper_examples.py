@@ -7,11 +7,16 @@ operational data examples. Examples are based on actual Cisco device outputs
 and provide meaningful, production-like values.
 
 Phase 5 Week 2: Production Examples
+Registered as the oper-examples plugin of the post-processing pass (spec_plugins);
+not part of the default pass.
 """
 
-import json
 from pathlib import Path
 import re
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+from spec_plugins import run_plugins, select_plugins, spec_plugin  # noqa: E402
 
 def get_example_for_field(field_name, category):
     """
@@ -220,10 +225,14 @@ def add_examples_to_schema(schema, category, path=""):
         schema: Schema object to enhance
         category: Category name (interfaces, routing, etc.)
         path: Current path in schema for context
+    
+    Returns the number of examples added
     """
     
     if not isinstance(schema, dict):
-        return
+        return 0
+    
+    added = 0
     
     # Add example to leaf properties
     if 'type' in schema and 'example' not in schema:
@@ -231,60 +240,54 @@ def add_examples_to_schema(schema, category, path=""):
         
         if schema['type'] == 'string':
             schema['example'] = str(get_example_for_field(field_name, category))
+            added += 1
         elif schema['type'] == 'integer':
             example = get_example_for_field(field_name, category)
             schema['example'] = int(example) if isinstance(example, (int, float, str)) and str(example).replace('-', '').isdigit() else 1
+            added += 1
         elif schema['type'] == 'number':
             example = get_example_for_field(field_name, category)
             schema['example'] = float(example) if isinstance(example, (int, float)) else 1.0
+            added += 1
         elif schema['type'] == 'boolean':
             example = get_example_for_field(field_name, category)
             schema['example'] = bool(example) if isinstance(example, bool) else True
+            added += 1
         elif schema['type'] == 'array' and 'items' in schema:
-            add_examples_to_schema(schema['items'], category, path + '/items')
+            added += add_examples_to_schema(schema['items'], category, path + '/items')
     
     # Recurse into properties
     if 'properties' in schema:
         for prop_name, prop_schema in schema['properties'].items():
-            add_examples_to_schema(prop_schema, category, f"{path}/{prop_name}")
+            added += add_examples_to_schema(prop_schema, category, f"{path}/{prop_name}")
     
     # Recurse into allOf/anyOf/oneOf
     for key in ['allOf', 'anyOf', 'oneOf']:
         if key in schema:
             for i, sub_schema in enumerate(schema[key]):
-                add_examples_to_schema(sub_schema, category, f"{path}/{key}[{i}]")
+                added += add_examples_to_schema(sub_schema, category, f"{path}/{key}[{i}]")
+    
+    return added
 
 
-def process_oper_file(file_path):
+@spec_plugin('oper-examples', models=['swagger-oper-model'], pattern='oper-*.json', default=False)
+def add_oper_examples(spec, spec_file):
     """
-    Process a single consolidated oper-*.json file to add examples
+    Add examples to the schemas of a consolidated oper-*.json spec
     
     Args:
-        file_path: Path to the OpenAPI JSON file
+        spec: The OpenAPI spec, changed in place
+        spec_file: Its path; the category comes from the file name
     """
     
-    print(f"\nProcessing: {file_path.name}")
-    
-    # Read JSON
-    with open(file_path, 'r', encoding='utf-8') as f:
-        spec = json.load(f)
-    
     # Extract category from filename (e.g., oper-interfaces.json -> interfaces)
-    category = file_path.stem.replace('oper-', '')
+    category = spec_file.stem.replace('oper-', '')
     
     # Process all schemas
-    if 'components' in spec and 'schemas' in spec['components']:
-        schemas = spec['components']['schemas']
-        print(f"  Enhancing {len(schemas)} schemas with production examples...")
-        
-        for schema_name, schema_def in schemas.items():
-            add_examples_to_schema(schema_def, category, schema_name)
-    
-    # Write enhanced JSON
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(spec, f, indent=2)
-    
-    print(f"  ✓ Enhanced with realistic operational data examples")
+    added = 0
+    for schema_name, schema_def in spec.get('components', {}).get('schemas', {}).items():
+        added += add_examples_to_schema(schema_def, category, schema_name)
+    return added > 0
 
 
 def main():
@@ -294,27 +297,13 @@ def main():
     print("PHASE 5 WEEK 2: Add Production-Realistic Examples to Oper Model")
     print("=" * 70)
     
-    # Find swagger-oper-model/api directory
-    api_dir = Path(__file__).parent.parent / 'swagger-oper-model' / 'api'
-    
-    if not api_dir.exists():
-        print(f"ERROR: Directory not found: {api_dir}")
-        return
-    
-    # Process all oper-*.json files (excluding manifest)
-    oper_files = sorted([f for f in api_dir.glob('oper-*.json') if f.name != 'manifest.json'])
-    
-    print(f"\nFound {len(oper_files)} consolidated Oper files to enhance\n")
-    
-    for file_path in oper_files:
-        process_oper_file(file_path)
+    # Same pass as scripts/postprocess_specs.py, with only this plugin
+    plugins = select_plugins(['oper-examples'])
+    updated = run_plugins(plugins, verbose=True)
     
     print("\n" + "=" * 70)
-    print("COMPLETE: All Oper files enhanced with production examples")
+    print(f"COMPLETE: {updated} Oper files enhanced with production examples")
     print("=" * 70)
-    print(f"\nEnhanced files:")
-    for f in oper_files:
-        print(f"  - {f.name}")
 
 
 if __name__ == '__main__':
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Analyze RPC model structure"""
 
-import json
 from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
 
 api_dir = Path('swagger-rpc-model/api')
 files = sorted(api_dir.glob('*.json'))
@@ -16,8 +19,7 @@ data = []
 total_paths = 0
 
 for f in files:
-    with open(f, 'r', encoding='utf-8') as file:
-        spec = json.load(file)
+    spec = spec_io.load(f)
     
     path_count = len(spec.get('paths', {}))
     total_paths += path_count
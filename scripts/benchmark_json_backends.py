@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON backends available to spec_io against the generated spec tree.
+Times read+parse, pretty dump (the on-disk format) and compact dump for every
+swagger-*-model/api/*.json file with each installed backend.
+
+Usage: python scripts/benchmark_json_backends.py [--repeat N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def find_spec_files() -> list:
+    """All generated spec files across the model directories"""
+    return sorted(REPO_ROOT.glob('swagger-*-model/api/*.json'))
+
+
+def bench_backend(backend: str, raw_files: list, repeat: int) -> dict:
+    """Best-of-N timings for one backend over the whole tree"""
+    spec_io.set_backend(backend)
+    best = {'parse': float('inf'), 'pretty': float('inf'), 'compact': float('inf')}
+    pretty_bytes = compact_bytes = 0
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        specs = [spec_io.loads(raw) for raw in raw_files]
+        best['parse'] = min(best['parse'], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        pretty_bytes = sum(len(spec_io.dumpb(spec)) for spec in specs)
+        best['pretty'] = min(best['pretty'], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        compact_bytes = sum(len(spec_io.dumpb(spec, pretty=False)) for spec in specs)
+        best['compact'] = min(best['compact'], time.perf_counter() - start)
+
+    best['pretty_mb'] = pretty_bytes / (1024 * 1024)
+    best['compact_mb'] = compact_bytes / (1024 * 1024)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark spec_io JSON backends')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per backend (best time is reported)')
+    args = parser.parse_args()
+
+    files = find_spec_files()
+    if not files:
+        print("No spec files found under swagger-*-model/api/")
+        return
+
+    # Read from disk once so the numbers measure parsing, not I/O
+    raw_files = [f.read_bytes() for f in files]
+    total_mb = sum(len(raw) for raw in raw_files) / (1024 * 1024)
+    print(f"Spec tree: {len(files)} files, {total_mb:.1f} MB")
+    print(f"Backends: {', '.join(spec_io.AVAILABLE_BACKENDS)} (best of {args.repeat})\n")
+
+    results = {backend: bench_backend(backend, raw_files, args.repeat) for backend in spec_io.AVAILABLE_BACKENDS}
+    baseline = results['json']
+
+    print(f"{'Backend':<10} {'Parse':>9} {'Pretty':>9} {'Compact':>9} {'Total':>9} {'Speedup':>8}  {'Pretty MB':>9} {'Compact MB':>10}")
+    print("-" * 84)
+    for backend, r in results.items():
+        total = r['parse'] + r['pretty'] + r['compact']
+        base_total = baseline['parse'] + baseline['pretty'] + baseline['compact']
+        print(f"{backend:<10} {r['parse']:>8.2f}s {r['pretty']:>8.2f}s {r['compact']:>8.2f}s {total:>8.2f}s "
+              f"{base_total / total:>7.1f}x  {r['pretty_mb']:>9.1f} {r['compact_mb']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
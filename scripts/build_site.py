@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Build the whole site: generators, pyang trees, link injection, manifests,
+search index and GitHub Pages preparation, in dependency order.
+
+Each stage is a script with declared inputs and outputs (glob patterns relative
+to the repository root). A stage depends on every earlier stage whose outputs it
+reads, or whose inputs it overwrites, so the stage list below is the one
+canonical build order; independent stages run concurrently (--jobs).
+
+A stage is skipped when it ran successfully before, its source inputs (inputs
+no stage writes, e.g. YANG files and the scripts themselves) are unchanged,
+none of its dependencies ran in this build and its outputs exist. Source
+fingerprints are kept in .build/state.json.
+
+Usage:
+    python scripts/build_site.py                  # full build
+    python scripts/build_site.py search-index     # one stage and what it needs
+    python scripts/build_site.py --list           # show stages and dependencies
+    python scripts/build_site.py --force --jobs 4
+    python scripts/build_site.py --shard 2/4      # this runner's part of every generator
+    python scripts/build_site.py --merge-shards   # after copying all shards' api/ directories in
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
+from sharding import Shard  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STATE_FILE = REPO_ROOT / '.build' / 'state.json'
+
+YANG_SOURCES = 'references/17181-YANG-modules/**'
+GENERATOR_LIBS = ['generators/spec_io.py', 'generators/spec_writer.py', 'generators/fingerprint.py',
+                  'generators/example_rules.py', 'generators/schema_pool.py', 'generators/build_manifest.py',
+                  'generators/module_pool.py', 'generators/shared_corpus.py', 'generators/sharding.py',
+                  'generators/artifact_cache.py']
+TREE_LIBS = ['scripts/pyang_context.py', 'scripts/tree_cache.py', 'scripts/tree_data.py', 'scripts/tree_page.py',
+             'tree-viewer.js', 'tree-page.css', 'generators/artifact_cache.py', 'generators/build_manifest.py']
+SPECS = 'swagger-*-model/api/*.json'
+POSTPROCESS_LIBS = ['generators/spec_plugins.py', 'generators/spec_io.py', 'generators/spec_writer.py',
+                    'scripts/add_yang_tree_links.py', 'scripts/add_yang_github_links.py',
+                    'scripts/add_mib_tree_links.py', 'scripts/add_oper_examples.py', 'generators/generate_examples.py']
+
+
+class Stage:
+    """One build step: a script run with the repository root as working directory"""
+
+    def __init__(self, name: str, script: str, inputs: Sequence[str], outputs: Sequence[str],
+                 args: Sequence[str] = (), default: bool = True, shardable: bool = False):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        # The script itself is always an input
+        self.inputs = [script] + [pattern for pattern in inputs if pattern != script]
+        self.outputs = list(outputs)
+        self.default = default
+        # Generators accept --shard i/N and --merge-shards
+        self.shardable = shardable
+        self.deps: List['Stage'] = []
+
+    @property
+    def command(self) -> List[str]:
+        return [sys.executable, self.script] + self.args
+
+
+def generator(kind: str, script: str, model: str) -> Stage:
+    return Stage(kind, f'generators/{script}', [YANG_SOURCES] + GENERATOR_LIBS, [f'{model}/api/**'],
+                 shardable=True)
+
+
+# Canonical build order; dependencies are derived from inputs/outputs
+STAGES = [
+    Stage('pyang-trees', 'scripts/generate_pyang_trees.py',
+          ['references/17181-YANG-modules/*.yang'] + TREE_LIBS, ['yang-trees/*.html']),
+    Stage('mib-pyang-trees', 'scripts/generate_mib_pyang_trees.py',
+          ['references/17181-YANG-modules/MIBS/*.yang'] + TREE_LIBS, ['yang-trees/*-MIB.html', 'yang-trees/mib-trees-index.html']),
+    generator('oper', 'generate_oper_openapi_v2.py', 'swagger-oper-model'),
+    generator('rpc', 'generate_rpc_openapi_v2.py', 'swagger-rpc-model'),
+    generator('cfg', 'generate_cfg_openapi_v2.py', 'swagger-cfg-model'),
+    generator('openconfig', 'generate_openconfig_openapi_v2.py', 'swagger-openconfig-model'),
+    generator('ietf', 'generate_ietf_openapi_v2.py', 'swagger-ietf-model'),
+    generator('mib', 'generate_mib_openapi_v2.py', 'swagger-mib-model'),
+    generator('events', 'generate_events_openapi.py', 'swagger-events-model'),
+    generator('native', 'generate_native_openapi_v2.py', 'swagger-native-config-model'),
+    generator('other', 'generate_other_openapi_v2.py', 'swagger-other-model'),
+    Stage('events-manifest', 'rebuild_events_manifest_accurate.py',
+          ['swagger-events-model/api/*.json'], ['swagger-events-model/api/manifest.json']),
+    # Link injection rewrites the specs in place, all plugins in one pass, and re-splits their fragments
+    Stage('postprocess', 'scripts/postprocess_specs.py', [SPECS, 'yang-trees/*.html'] + POSTPROCESS_LIBS,
+          [SPECS, 'swagger-*-model/api/fragments/**']),
+    Stage('search-index', 'rebuild_search_with_direct_links.py', [SPECS], ['search-index.json']),
+    Stage('accountability', 'scripts/analyze_yang_accountability.py', [YANG_SOURCES, SPECS],
+          ['YANG_MODULE_ACCOUNTABILITY.md', 'yang_accountability.json']),
+    Stage('validate', 'scripts/validate_quality.py', [SPECS], []),
+    Stage('pages', 'scripts/prepare_github_pages.py', [SPECS, '*.html'],
+          ['*.html', '.nojekyll', 'GITHUB_PAGES_DEPLOY.md']),
+    # Specs are fingerprinted only once post-processing is done with them
+    Stage('fingerprint', 'scripts/fingerprint_outputs.py',
+          [SPECS, 'yang-trees/*.html', 'search-index.json', 'generators/fingerprint.py'],
+          ['swagger-*-model/api/hashed/*.json', 'swagger-*-model/api/manifest.json', 'yang-trees/*.html',
+           'yang-trees/manifest.json', 'search-index.*.json', 'search-manifest.json']),
+]
+
+
+def _segments_overlap(a: str, b: str) -> bool:
+    """Could the single path segments a and b (either may hold wildcards) name the same file?"""
+    wild_a = any(c in a for c in '*?[')
+    wild_b = any(c in b for c in '*?[')
+    if not wild_a and not wild_b:
+        return a == b
+    if not wild_b:
+        return fnmatch.fnmatchcase(b, a)
+    if not wild_a:
+        return fnmatch.fnmatchcase(a, b)
+    # Both wildcards: their literal prefixes and suffixes must be compatible
+    prefix_a, prefix_b = a.split('*')[0].split('?')[0], b.split('*')[0].split('?')[0]
+    suffix_a, suffix_b = a.split('*')[-1], b.split('*')[-1]
+    return (prefix_a.startswith(prefix_b) or prefix_b.startswith(prefix_a)) and \
+        (suffix_a.endswith(suffix_b) or suffix_b.endswith(suffix_a))
+
+
+def patterns_overlap(a: str, b: str) -> bool:
+    """Could glob patterns a and b (relative paths, '**' = any depth) match a common file?"""
+    parts_a, parts_b = a.split('/'), b.split('/')
+    for i, (seg_a, seg_b) in enumerate(zip(parts_a, parts_b)):
+        if seg_a == '**' or seg_b == '**':
+            return True
+        if not _segments_overlap(seg_a, seg_b):
+            return False
+    return len(parts_a) == len(parts_b) or '**' in parts_a[len(parts_b):] + parts_b[len(parts_a):]
+
+
+def _any_overlap(patterns_a: Iterable[str], patterns_b: Iterable[str]) -> bool:
+    patterns_b = list(patterns_b)
+    return any(patterns_overlap(a, b) for a in patterns_a for b in patterns_b)
+
+
+def link_stages(stages: List[Stage]):
+    """Derive each stage's dependencies from the declared inputs/outputs of the stages before it"""
+    for i, stage in enumerate(stages):
+        stage.deps = [earlier for earlier in stages[:i]
+                      if _any_overlap(earlier.outputs, stage.inputs) or _any_overlap(earlier.inputs, stage.outputs)]
+
+
+def select_stages(stages: List[Stage], names: Sequence[str]) -> List[Stage]:
+    """The named stages (default stages if none) plus everything they depend on, in build order"""
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)} (see --list)")
+
+    wanted: Set[str] = set()
+    pending = [by_name[name] for name in names] if names else [s for s in stages if s.default]
+    while pending:
+        stage = pending.pop()
+        if stage.name not in wanted:
+            wanted.add(stage.name)
+            pending.extend(stage.deps)
+    return [stage for stage in stages if stage.name in wanted]
+
+
+def expand(patterns: Iterable[str]) -> Set[str]:
+    """Existing files matching the patterns, as repository-relative paths"""
+    files = set()
+    for pattern in patterns:
+        for match in glob.glob(pattern, root_dir=REPO_ROOT, recursive=True):
+            if (REPO_ROOT / match).is_file():
+                files.add(Path(match).as_posix())
+    return files
+
+
+class FileHashes:
+    """Content hashes of source files, reused across builds while size and mtime match"""
+
+    def __init__(self, cached: Dict[str, list]):
+        self.entries = cached
+
+    def digest(self, path: str) -> str:
+        stat = (REPO_ROOT / path).stat()
+        entry = self.entries.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        digest = hashlib.sha256((REPO_ROOT / path).read_bytes()).hexdigest()
+        self.entries[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+
+def source_fingerprint(stage: Stage, hashes: FileHashes, generated: Set[str]) -> str:
+    """Hash of the command and of the stage inputs that no stage writes"""
+    sha = hashlib.sha256(' '.join([stage.script] + stage.args).encode())
+    for path in sorted(expand(stage.inputs) - generated):
+        sha.update(f"{path}\0{hashes.digest(path)}\0".encode())
+    return sha.hexdigest()
+
+
+def outputs_exist(stage: Stage) -> bool:
+    """Every literal output exists and every output pattern matches something"""
+    return all(expand([pattern]) for pattern in stage.outputs)
+
+
+def run_stage(stage: Stage, verbose: bool) -> Tuple[bool, float, str]:
+    """Run one stage, returning (ok, seconds, captured output)"""
+    start = time.perf_counter()
+    result = subprocess.run(stage.command, cwd=REPO_ROOT, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONUNBUFFERED='1'))
+    output = result.stdout + result.stderr
+    if verbose:
+        print(f"\n--- {stage.name} ---\n{output}")
+    return result.returncode == 0, time.perf_counter() - start, output
+
+
+def build(stages: List[Stage], jobs: int, force: bool, verbose: bool) -> bool:
+    """Run the stages concurrently in dependency order; True if none failed"""
+    state = spec_io.load(STATE_FILE) if STATE_FILE.exists() else {}
+    fingerprints: Dict[str, str] = state.get('stages', {})
+    hashes = FileHashes(state.get('files', {}))
+    # Anything a stage writes is tracked through its producer, not by content
+    generated = expand(pattern for stage in STAGES for pattern in stage.outputs)
+
+    status: Dict[str, str] = {}
+    seconds: Dict[str, float] = {}
+    selected = {stage.name for stage in stages}
+    pending = list(stages)
+    running = {}
+    build_start = time.perf_counter()
+
+    def save_state():
+        STATE_FILE.parent.mkdir(exist_ok=True)
+        spec_io.dump({'stages': fingerprints, 'files': hashes.entries}, STATE_FILE)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for stage in list(pending):
+                deps = [dep for dep in stage.deps if dep.name in selected]
+                if any(status.get(dep.name) in ('failed', 'blocked') for dep in deps):
+                    status[stage.name] = 'blocked'
+                    pending.remove(stage)
+                    print(f"  ⏭️  {stage.name}: blocked by a failed dependency")
+                    continue
+                if not all(dep.name in status for dep in deps) or len(running) >= jobs:
+                    continue
+                pending.remove(stage)
+
+                fingerprint = source_fingerprint(stage, hashes, generated)
+                dirty_deps = [dep.name for dep in deps if status[dep.name] == 'ran']
+                if not force and not dirty_deps and fingerprints.get(stage.name) == fingerprint \
+                        and outputs_exist(stage):
+                    status[stage.name] = 'skipped'
+                    print(f"  ·  {stage.name}: unchanged, skipped")
+                    continue
+
+                print(f"  ▶  {stage.name}: {' '.join(stage.command[1:])}")
+                running[pool.submit(run_stage, stage, verbose)] = (stage, fingerprint)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, fingerprint = running.pop(future)
+                ok, elapsed, output = future.result()
+                seconds[stage.name] = elapsed
+                if ok:
+                    status[stage.name] = 'ran'
+                    fingerprints[stage.name] = fingerprint
+                    print(f"  ✓  {stage.name}: {elapsed:.1f}s")
+                else:
+                    status[stage.name] = 'failed'
+                    fingerprints.pop(stage.name, None)
+                    tail = '\n'.join(output.rstrip().splitlines()[-20:])
+                    print(f"  ❌ {stage.name}: failed after {elapsed:.1f}s\n{tail}")
+                save_state()
+
+    save_state()
+    total = time.perf_counter() - build_start
+
+    print(f"\n{'Stage':<18} {'Status':<8} {'Time':>8}")
+    print('-' * 36)
+    for stage in stages:
+        elapsed = f"{seconds[stage.name]:.1f}s" if stage.name in seconds else '-'
+        print(f"{stage.name:<18} {status.get(stage.name, '-'):<8} {elapsed:>8}")
+    print('-' * 36)
+    print(f"{'wall':<18} {'':<8} {total:>7.1f}s   (stage total {sum(seconds.values()):.1f}s)")
+    return not any(value in ('failed', 'blocked') for value in status.values())
+
+
+def list_stages(stages: List[Stage]):
+    for stage in stages:
+        deps = ', '.join(dep.name for dep in stage.deps) or '-'
+        optional = '' if stage.default else '  (optional)'
+        print(f"{stage.name:<18} <- {deps}{optional}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the site as a DAG of generator and post-processing stages')
+    parser.add_argument('stages', nargs='*', help='Stages to build (with their dependencies); default: all default stages')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Stages to run concurrently (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Run every selected stage even if unchanged')
+    parser.add_argument('--list', action='store_true', help='List stages and their dependencies, then exit')
+    parser.add_argument('--verbose', '-v', action='store_true', help="Print each stage's output")
+    shards = parser.add_mutually_exclusive_group()
+    shards.add_argument('--shard', type=Shard.parse, metavar='I/N',
+                        help='Run only the generators, building shard I of N of their modules')
+    shards.add_argument('--merge-shards', action='store_true',
+                        help="Merge the generators' shards (copied into this tree), then build the rest")
+    args = parser.parse_args()
+
+    link_stages(STAGES)
+    if args.list:
+        list_stages(STAGES)
+        return
+
+    stages = select_stages(STAGES, args.stages)
+    if args.shard or args.merge_shards:
+        shard_args = ['--shard', str(args.shard)] if args.shard else ['--merge-shards']
+        for stage in STAGES:
+            if stage.shardable:
+                stage.args += shard_args
+        if args.shard:
+            # Everything downstream needs all shards; it runs after --merge-shards
+            stages = [stage for stage in stages if stage.shardable]
+    print("\n" + "=" * 70)
+    print(f"Building {len(stages)} stages with {args.jobs} jobs")
+    print("=" * 70)
+    ok = build(stages, max(1, args.jobs), args.force, args.verbose)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,9 +8,12 @@ event category groupings.
 Phase 6: Events Model Enhancement
 """
 
-import json
 from pathlib import Path
 from collections import defaultdict
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
 
 # Event category mappings based on module names
 CATEGORY_KEYWORDS = {
@@ -217,8 +220,7 @@ def main():
         module_name = json_file.stem.replace('Cisco-IOS-XE-', '').replace('-events', '').replace('-oper', '')
         
         # Read JSON
-        with open(json_file, 'r', encoding='utf-8') as f:
-            spec = json.load(f)
+        spec = spec_io.load(json_file)
         
         # Get category
         category = get_category(module_name)
@@ -261,8 +263,7 @@ def main():
         
         # Write to file
         output_file = output_dir / f"events-{category}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(spec, f, indent=2)
+        spec_io.dump(spec, output_file)
         
         # Get module count
         modules = set(p['source_module'] for p in paths_data)
@@ -280,8 +281,7 @@ def main():
     
     # Write manifest
     manifest_file = output_dir / 'events-manifest.json'
-    with open(manifest_file, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2)
+    spec_io.dump(manifest, manifest_file)
     
     print(f"\n{'='*70}")
     print("CONSOLIDATION COMPLETE")
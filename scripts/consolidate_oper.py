@@ -4,9 +4,12 @@ Phase 5: Consolidate Oper Model - Post-Processor
 Consolidates 197 individual module files into 12-15 category files
 """
 
-import json
 from pathlib import Path
 from collections import defaultdict
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
 
 def get_category(module_name: str) -> str:
     """Categorize module based on name patterns"""
@@ -96,8 +99,7 @@ def consolidate_specs():
     
     for module_file in module_files:
         module_name = module_file.stem
-        with open(module_file, 'r', encoding='utf-8') as f:
-            spec = json.load(f)
+        spec = spec_io.load(module_file)
         
         category = get_category(module_name)
         
@@ -175,8 +177,7 @@ def consolidate_specs():
         
         # Write consolidated file
         output_file = api_dir / f"oper-{category}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(spec, f, indent=2)
+        spec_io.dump(spec, output_file)
         
         file_size_mb = output_file.stat().st_size / (1024 * 1024)
         print(f"  * {category}: {len(paths_list)} paths, {len(category_modules[category])} modules ({file_size_mb:.2f} MB) -> {output_file.name}")
@@ -194,8 +195,7 @@ def consolidate_specs():
     }
     
     manifest_file = api_dir / 'manifest.json'
-    with open(manifest_file, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2)
+    spec_io.dump(manifest, manifest_file)
     
     print(f"\n{'='*70}")
     print(f"Consolidation Complete:")
@@ -7,9 +7,12 @@ Consolidates 54 individual RPC/actions files into logical operation category gro
 Phase 6: RPC Model Enhancement
 """
 
-import json
 from pathlib import Path
 from collections import defaultdict
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
 
 # RPC category mappings based on module names and action types
 CATEGORY_KEYWORDS = {
@@ -213,8 +216,7 @@ def main():
         module_name = json_file.stem.replace('Cisco-IOS-XE-', '').replace('-rpc', '').replace('-actions', '').replace('-cmd', '').replace('-cfg', '').replace('-oper', '').replace('cisco-', '').replace('tailf-netconf-', '')
         
         # Read JSON
-        with open(json_file, 'r', encoding='utf-8') as f:
-            spec = json.load(f)
+        spec = spec_io.load(json_file)
         
         # Get category
         category = get_category(module_name)
@@ -257,8 +259,7 @@ def main():
         
         # Write to file
         output_file = output_dir / f"rpc-{category}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(spec, f, indent=2)
+        spec_io.dump(spec, output_file)
         
         # Get module count
         modules = set(p['source_module'] for p in paths_data)
@@ -276,8 +277,7 @@ def main():
     
     # Write manifest
     manifest_file = output_dir / 'rpc-manifest.json'
-    with open(manifest_file, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2)
+    spec_io.dump(manifest, manifest_file)
     
     print(f"\n{'='*70}")
     print("CONSOLIDATION COMPLETE")
@@ -10,9 +10,12 @@ Generates 3 curated quick-start collections with production-realistic examples:
 Phase 5 Week 3: Quick-Start Collections
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
 
 def create_troubleshooting_quickstart():
     """
@@ -734,8 +737,7 @@ def main():
     for filename, spec in quick_starts.items():
         filepath = output_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(spec, f, indent=2)
+        spec_io.dump(spec, filepath)
         
         paths_count = len(spec['paths'])
         size_kb = filepath.stat().st_size / 1024
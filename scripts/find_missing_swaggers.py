@@ -11,6 +11,10 @@ Usage: python find_missing_swaggers.py
 import json
 from pathlib import Path
 from collections import defaultdict
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+from fingerprint import is_fingerprinted  # noqa: E402
 
 # Configuration
 BASE_DIR = Path(__file__).parent.parent
@@ -44,7 +48,7 @@ def get_tree_modules():
     tree_modules = set()
     if TREES_DIR.exists():
         for tree_file in TREES_DIR.glob("*.html"):
-            if tree_file.stem != "index":
+            if tree_file.stem != "index" and not is_fingerprinted(tree_file.name):
                 tree_modules.add(tree_file.stem)
     return tree_modules
 
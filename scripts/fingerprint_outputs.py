@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Fingerprint all published outputs after the post-processing scripts have run.
+
+Writes content-hashed copies of:
+  - every swagger-*-model/api/*.json spec -> api/hashed/<spec>.<hash>.json,
+    mapped under 'files' in that model's api/manifest.json
+  - every yang-trees/<module>.html -> yang-trees/<module>.<hash>.html,
+    mapped in yang-trees/manifest.json
+  - search-index.json -> search-index.<hash>.json (with tree links pointing at
+    the fingerprinted trees), mapped in search-manifest.json
+
+The logical files are left in place for tooling and old links. Serve the
+fingerprinted names with `Cache-Control: public, max-age=31536000, immutable`
+and the manifests with `Cache-Control: no-cache`.
+
+This is the only place specs are fingerprinted: the post-processing pass
+still changes them after generation. build_site.py runs it as the
+fingerprint stage after postprocess; run it again whenever specs change.
+(A generator's --fingerprint only names its fragments and sidecars by hash.)
+"""
+
+import fnmatch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
+from fingerprint import SPEC_SUBDIR, fingerprint_files, is_fingerprinted, write_fingerprinted  # noqa: E402
+from spec_plugins import MANIFEST_PATTERN  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def fingerprint_model(api_dir: Path) -> int:
+    """Fingerprint one model's specs and record them in its manifest"""
+    manifest_file = api_dir / 'manifest.json'
+    if not manifest_file.exists():
+        print(f"  ⚠️  {api_dir.parent.name}: no manifest.json, skipping")
+        return 0
+
+    # Manifests (manifest.json, events-manifest.json, ...) are not specs
+    specs = {f.stem: f for f in sorted(api_dir.glob('*.json')) if not fnmatch.fnmatchcase(f.name, MANIFEST_PATTERN)}
+    files = fingerprint_files(api_dir, specs, '.json', subdir=SPEC_SUBDIR)
+
+    # Remove fingerprints of specs that no longer exist
+    live = {Path(path).name for path in files.values()}
+    for old_file in (api_dir / SPEC_SUBDIR).glob('*.json'):
+        if old_file.name not in live:
+            old_file.unlink()
+
+    manifest = spec_io.load(manifest_file)
+    manifest['files'] = files
+    spec_io.dump(manifest, manifest_file)
+    print(f"  ✓ {api_dir.parent.name}: {len(files)} specs")
+    return len(files)
+
+
+def fingerprint_trees(trees_dir: Path) -> dict:
+    """Fingerprint the YANG tree pages and write yang-trees/manifest.json"""
+    trees = {f.stem: f for f in sorted(trees_dir.glob('*.html'))
+             if f.name != 'index.html' and not is_fingerprinted(f.name)}
+    files = fingerprint_files(trees_dir, trees, '.html')
+    spec_io.dump({'files': files}, trees_dir / 'manifest.json')
+    print(f"  ✓ yang-trees: {len(files)} trees")
+    return files
+
+
+def fingerprint_search_index(tree_files: dict):
+    """Fingerprint search-index.json, pointing tree links at the fingerprinted trees"""
+    index_file = REPO_ROOT / 'search-index.json'
+    if not index_file.exists():
+        print("  ⚠️  search-index.json not found, skipping")
+        return
+
+    search_data = spec_io.load(index_file)
+    for module in search_data.get('modules', []):
+        tree_url = module.get('yangTreeUrl', '')
+        tree_name = Path(tree_url).stem
+        if tree_url.startswith('yang-trees/') and tree_name in tree_files:
+            module['yangTreeUrl'] = f"yang-trees/{tree_files[tree_name]}"
+
+    name = write_fingerprinted(REPO_ROOT, 'search-index', '.json', spec_io.dumpb(search_data, pretty=False))
+    spec_io.dump({'files': {'search-index.json': name}}, REPO_ROOT / 'search-manifest.json')
+    print(f"  ✓ search-index.json -> {name}")
+
+
+def main():
+    print("\n" + "=" * 70)
+    print("Fingerprinting published outputs")
+    print("=" * 70)
+
+    total = 0
+    for api_dir in sorted(REPO_ROOT.glob('swagger-*-model/api')):
+        total += fingerprint_model(api_dir)
+
+    tree_files = {}
+    trees_dir = REPO_ROOT / 'yang-trees'
+    if trees_dir.exists():
+        tree_files = fingerprint_trees(trees_dir)
+
+    fingerprint_search_index(tree_files)
+
+    print(f"\n✅ Fingerprinted {total} specs and {len(tree_files)} trees")
+
+
+if __name__ == '__main__':
+    main()
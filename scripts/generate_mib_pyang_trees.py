@@ -4,198 +4,55 @@ Generate pyang tree visualizations for all MIB YANG modules.
 Creates HTML files with formatted tree output for easy viewing.
 """
 
-import subprocess
+import argparse
 import os
 from pathlib import Path
-import html
+from typing import Tuple
 
-def generate_tree_html(yang_file: Path, output_dir: Path) -> bool:
-    """Generate pyang tree HTML for a single MIB YANG file"""
+from pyang_context import add_pool_arguments, render_trees
+from tree_cache import ArtifactCache, TreeCache, add_tree_cache_argument
+from tree_page import write_page
+
+def generate_tree_html(yang_file: Path, output_dir: Path, tree: Tuple[str, bool]) -> bool:
+    """Generate pyang tree HTML for a single MIB YANG file from its (pyang output, ok)"""
     module_name = yang_file.stem
     
     try:
-        # Run pyang to get tree output
-        result = subprocess.run(
-            ['pyang', '-f', 'tree', str(yang_file)],
-            capture_output=True,
-            text=True,
-            cwd=yang_file.parent,
-            timeout=30
-        )
+        tree_output, ok = tree
         
         # Check if pyang succeeded
-        if result.returncode != 0:
+        if not ok:
             print(f"  ⚠️  Error generating tree for {module_name}")
             return False
         
-        tree_output = result.stdout
-        
         # Skip if output is empty or trivial
         if not tree_output or len(tree_output.strip()) < 20:
             print(f"  ⚠️  Skipping {module_name} (empty or trivial output)")
             return False
         
-        # Create HTML content
-        html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{module_name} - YANG Tree</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px 40px;
-            border-bottom: 4px solid #5a67d8;
-        }}
-        .header h1 {{
-            font-size: 28px;
-            margin-bottom: 8px;
-            font-weight: 600;
-        }}
-        .header p {{
-            opacity: 0.9;
-            font-size: 14px;
-        }}
-        .nav-links {{
-            background: #f7fafc;
-            padding: 16px 40px;
-            border-bottom: 1px solid #e2e8f0;
-            display: flex;
-            gap: 20px;
-            flex-wrap: wrap;
-        }}
-        .nav-links a {{
-            color: #5a67d8;
-            text-decoration: none;
-            font-size: 14px;
-            padding: 8px 16px;
-            border-radius: 6px;
-            transition: all 0.2s;
-            background: white;
-            border: 1px solid #e2e8f0;
-        }}
-        .nav-links a:hover {{
-            background: #5a67d8;
-            color: white;
-            transform: translateY(-1px);
-            box-shadow: 0 4px 12px rgba(90, 103, 216, 0.2);
-        }}
-        .tree-container {{
-            padding: 40px;
-            background: #1a202c;
-        }}
-        .tree-output {{
-            background: #2d3748;
-            border: 1px solid #4a5568;
-            border-radius: 8px;
-            padding: 24px;
-            overflow-x: auto;
-            box-shadow: inset 0 2px 4px rgba(0,0,0,0.2);
-        }}
-        pre {{
-            color: #e2e8f0;
-            font-size: 13px;
-            line-height: 1.6;
-            margin: 0;
-            white-space: pre;
-            font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-        }}
-        .tree-output pre {{
-            color: #68d391;
-        }}
-        .info-box {{
-            background: #edf2f7;
-            padding: 20px 40px;
-            border-top: 1px solid #e2e8f0;
-        }}
-        .info-box p {{
-            color: #4a5568;
-            font-size: 13px;
-            line-height: 1.6;
-        }}
-        .info-box a {{
-            color: #5a67d8;
-            text-decoration: none;
-            font-weight: 500;
-        }}
-        .info-box a:hover {{
-            text-decoration: underline;
-        }}
-        @media (max-width: 768px) {{
-            body {{ padding: 10px; }}
-            .header {{ padding: 20px; }}
-            .tree-container {{ padding: 20px; }}
-            .tree-output {{ padding: 16px; }}
-            pre {{ font-size: 11px; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📊 {module_name}</h1>
-            <p>MIB YANG Tree Visualization - IOS-XE 17.18.1</p>
-        </div>
-        
-        <div style="background: #f0f4ff; padding: 16px 40px; border-bottom: 1px solid #e2e8f0;">
-            <p style="color: #4c51bf; font-size: 14px; margin-bottom: 12px;"><strong>📚 API Documentation & Navigation</strong></p>
-            <div style="display: flex; gap: 12px; flex-wrap: wrap;">
-                <a href="../swagger-mib-model/?url=api/{module_name}.json" style="color: white; background: #5a67d8; text-decoration: none; font-size: 13px; padding: 8px 16px; border-radius: 6px; font-weight: 500;">📄 Swagger API Spec</a>
-                <a href="../swagger-mib-model/" style="color: #5a67d8; text-decoration: none; font-size: 13px; padding: 8px 16px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">📂 Browse All MIB APIs</a>
-                <a href="https://github.com/YangModels/yang/blob/main/vendor/cisco/xe/17181/MIBS/{module_name}.yang" target="_blank" style="color: #5a67d8; text-decoration: none; font-size: 13px; padding: 8px 16px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">📄 YANG Source</a>
-                <a href="mib-trees-index.html" style="color: #666; text-decoration: none; font-size: 13px; padding: 8px 16px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">🌳 All MIB Trees</a>
-                <a href="index.html" style="color: #666; text-decoration: none; font-size: 13px; padding: 8px 16px; background: white; border-radius: 6px; border: 1px solid #e2e8f0;">🏠 Main Tree Browser</a>
-            </div>
-        </div>
-        
-        <div class="tree-container">
-            <div class="tree-output">
-                <pre>{html.escape(tree_output)}</pre>
-            </div>
-        </div>
-        
-        <div class="info-box">
-            <p>
+        # Write the page from the shared template
+        links = [
+            (f"../swagger-mib-model/?url=api/{module_name}.json", '📄 Swagger API Spec', 'primary'),
+            ('../swagger-mib-model/', '📂 Browse All MIB APIs', ''),
+            (f"https://github.com/YangModels/yang/blob/main/vendor/cisco/xe/17181/MIBS/{module_name}.yang",
+             '📄 YANG Source', ''),
+            ('mib-trees-index.html', '🌳 All MIB Trees', 'secondary'),
+            ('index.html', '🏠 Main Tree Browser', 'secondary'),
+        ]
+        footer = f"""<p>
                 <strong>About this tree:</strong> This visualization shows the hierarchical structure of the {module_name} MIB YANG module.
                 Generated using <code>pyang -f tree</code> command.
                 • <strong>+--rw</strong> = read-write node
                 • <strong>+--ro</strong> = read-only node
                 • <strong>+--</strong> = configuration data
                 • <strong>x--</strong> = deprecated node
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-        
-        # Write HTML file
-        output_file = output_dir / f"{module_name}.html"
-        output_file.write_text(html_content, encoding='utf-8')
+            </p>"""
+        write_page(output_dir / f"{module_name}.html", f"{module_name} - YANG Tree", f"📊 {module_name}",
+                   'MIB YANG Tree Visualization - IOS-XE 17.18.1', links, tree_output, footer, theme='mib')
         
         print(f"  ✓ Generated {module_name}.html")
         return True
         
-    except subprocess.TimeoutExpired:
-        print(f"  ⚠️  Timeout generating tree for {module_name}")
-        return False
     except Exception as e:
         print(f"  ⚠️  Error processing {module_name}: {e}")
         return False
@@ -470,6 +327,11 @@ def generate_mib_tree_index(output_dir: Path, generated_files: list):
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='Generate pyang tree pages for all MIB YANG modules')
+    add_tree_cache_argument(parser)
+    add_pool_arguments(parser)
+    args = parser.parse_args()
+
     script_dir = Path(__file__).parent
     yang_dir = script_dir.parent / 'references' / '17181-YANG-modules' / 'MIBS'
     output_dir = script_dir.parent / 'yang-trees'
@@ -487,17 +349,23 @@ def main():
     
     print(f"Found {total_files} MIB YANG files\n")
     
+    cache = ArtifactCache.from_args(args)
+    # MIBs share pyang contexts across --jobs workers; unchanged ones come from the cache
+    trees = render_trees(yang_dir, yang_files, TreeCache(cache, yang_dir), args.jobs, args.timeout)
     generated_files = []
     skipped = 0
     
     for i, yang_file in enumerate(yang_files, 1):
         print(f"[{i}/{total_files}] Processing {yang_file.stem}...")
         
-        if generate_tree_html(yang_file, output_dir):
+        if generate_tree_html(yang_file, output_dir, trees[yang_file]):
             generated_files.append(f"{yang_file.stem}.html")
         else:
             skipped += 1
     
+    if cache:
+        cache.report('pyang tree cache')
+
     # Generate index
     if generated_files:
         generate_mib_tree_index(output_dir, generated_files)
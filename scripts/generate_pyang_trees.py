@@ -4,10 +4,14 @@ Generate pyang tree outputs for all YANG modules
 Creates HTML files with formatted tree output for web viewing
 """
 
-import subprocess
+import argparse
 from pathlib import Path
 import re
 
+from pyang_context import add_pool_arguments, render_trees
+from tree_cache import ArtifactCache, TreeCache, add_tree_cache_argument
+from tree_page import write_page
+
 def get_swagger_category(module_name: str) -> tuple:
     """Determine which swagger category a module belongs to"""
     # Check for specific patterns
@@ -33,131 +37,32 @@ def get_swagger_category(module_name: str) -> tuple:
         # Default - likely in native config or other
         return ('swagger-native-config-model', 'Native Config APIs')
 
-def generate_pyang_tree(yang_file: Path, output_dir: Path) -> bool:
-    """Generate pyang tree for a single YANG module"""
+def generate_pyang_tree(yang_file: Path, output_dir: Path, tree_output: str) -> bool:
+    """Generate the tree page for a single YANG module from its pyang tree output"""
     try:
         module_name = yang_file.stem
         
         # Get swagger category for this module
         swagger_dir, swagger_label = get_swagger_category(module_name)
         
-        # Run pyang tree command
-        result = subprocess.run(
-            ['pyang', '-f', 'tree', str(yang_file)],
-            cwd=yang_file.parent,
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
-        
         # Check if tree output is empty (types-only modules)
-        tree_output = result.stdout.strip()
+        tree_output = tree_output.strip()
         if not tree_output or len(tree_output) < 50:
             print(f"  ⏭️  Skipping {module_name} (no tree structure)")
             return False
         
-        # Create HTML file with formatted tree
-        html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{module_name} - YANG Tree</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: 'Courier New', monospace;
-            background: #f5f5f5;
-            padding: 20px;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #049fd9 0%, #0070c9 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-        }}
-        .header h1 {{
-            font-size: 24px;
-            margin-bottom: 8px;
-        }}
-        .header p {{
-            opacity: 0.9;
-            font-size: 14px;
-        }}
-        .header a {{
-            color: white;
-            text-decoration: underline;
-            opacity: 0.9;
-        }}
-        .header a:hover {{
-            opacity: 1;
-        }}
-        .tree-container {{
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            overflow-x: auto;
-        }}
-        pre {{
-            font-size: 13px;
-            line-height: 1.4;
-            white-space: pre;
-            color: #333;
-        }}
-        .footer {{
-            margin-top: 20px;
-            padding: 15px;
-            background: #e3f2fd;
-            border-radius: 8px;
-            text-align: center;
-            font-size: 13px;
-        }}
-        .footer a {{
-            color: #0070c9;
-            text-decoration: none;
-        }}
-        .footer a:hover {{
-            text-decoration: underline;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>{module_name}</h1>
-        <p>YANG Data Model Tree Structure</p>
-        <p style="margin-top: 8px;">
-            <a href="https://github.com/YangModels/yang/blob/main/vendor/cisco/xe/17181/{module_name}.yang" target="_blank">View YANG Source on GitHub →</a>
-        </p>
-    </div>
-    
-    <div style="background: #e3f2fd; padding: 15px; margin-bottom: 20px; border-radius: 8px; border-left: 4px solid #0070c9;">
-        <p style="color: #01579b; font-size: 14px; margin-bottom: 10px;"><strong>📚 API Documentation & Navigation</strong></p>
-        <div style="display: flex; gap: 15px; flex-wrap: wrap;">
-            <a href="../{swagger_dir}/?url=api/{module_name}.json" style="color: white; background: #0070c9; text-decoration: none; font-size: 13px; padding: 6px 12px; border-radius: 4px; font-weight: 500;">📄 Swagger API Spec</a>
-            <a href="../{swagger_dir}/" style="color: #0070c9; text-decoration: none; font-size: 13px; padding: 6px 12px; background: white; border-radius: 4px; border: 1px solid #e0e0e0;">📂 Browse {swagger_label}</a>
-            <a href="index.html" style="color: #666; text-decoration: none; font-size: 13px; padding: 6px 12px; background: white; border-radius: 4px; border: 1px solid #e0e0e0;">🌳 All Trees</a>
-        </div>
-    </div>
-    
-    <div class="tree-container">
-        <pre>{tree_output}</pre>
-    </div>
-    
-    <div class="footer">
-        Generated with pyang | 
-        <a href="../index.html">← Back to Main Page</a> | 
-        <a href="https://github.com/mbj4668/pyang" target="_blank">About pyang</a>
-    </div>
-</body>
-</html>
-"""
-        
-        # Write HTML file
-        output_file = output_dir / f"{module_name}.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Write the page from the shared template
+        github_url = f"https://github.com/YangModels/yang/blob/main/vendor/cisco/xe/17181/{module_name}.yang"
+        links = [
+            (f"../{swagger_dir}/?url=api/{module_name}.json", '📄 Swagger API Spec', 'primary'),
+            (f"../{swagger_dir}/", f"📂 Browse {swagger_label}", ''),
+            (github_url, '💻 YANG Source', ''),
+            ('index.html', '🌳 All Trees', 'secondary'),
+        ]
+        footer = ('Generated with pyang | <a href="../index.html">← Back to Main Page</a> | '
+                  '<a href="https://github.com/mbj4668/pyang" target="_blank">About pyang</a>')
+        write_page(output_dir / f"{module_name}.html", f"{module_name} - YANG Tree", module_name,
+                   'YANG Data Model Tree Structure', links, tree_output, footer)
         
         print(f"  ✅ Generated tree for {module_name}")
         return True
@@ -291,6 +196,11 @@ def generate_index_page(output_dir: Path, modules: list):
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='Generate pyang tree pages for all YANG modules')
+    add_tree_cache_argument(parser)
+    add_pool_arguments(parser)
+    args = parser.parse_args()
+
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     yang_dir = project_root / 'references' / '17181-YANG-modules'
@@ -313,10 +223,15 @@ def main():
     print(f"\nFound {len(yang_files)} YANG modules")
     print(f"Output directory: {output_dir}\n")
     
+    cache = ArtifactCache.from_args(args)
+    # Modules share pyang contexts across --jobs workers; unchanged ones come from the cache
+    trees = render_trees(yang_dir, yang_files, TreeCache(cache, yang_dir), args.jobs, args.timeout)
     generated_modules = []
     for yang_file in yang_files:
-        if generate_pyang_tree(yang_file, output_dir):
+        if generate_pyang_tree(yang_file, output_dir, trees[yang_file][0]):
             generated_modules.append(yang_file.stem)
+    if cache:
+        cache.report('pyang tree cache')
     
     # Generate index page
     if generated_modules:
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Post-process all generated specs in one pass (see generators/spec_plugins.py).
+
+Loads each spec once, applies every selected plugin in memory and writes the
+spec once if anything changed. Without --plugin the default plugins run, in
+this order:
+  tree-links      pyang tree page link (scripts/add_yang_tree_links.py)
+  github-links    YANG source link on GitHub (scripts/add_yang_github_links.py)
+  mib-tree-links  tree link for MIB specs without a tree page check (scripts/add_mib_tree_links.py)
+Manual plugins, run only when named:
+  oper-examples   realistic examples for the consolidated oper-*.json specs (scripts/add_oper_examples.py)
+  yang-examples   request body examples from the YANG modules (generators/generate_examples.py)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+from spec_plugins import MODEL_DIRS, PLUGINS, report, run_plugins, select_plugins  # noqa: E402
+
+# Importing a plugin module registers its plugins; the import order is the run order
+import add_yang_tree_links  # noqa: E402,F401
+import add_yang_github_links  # noqa: E402,F401
+import add_mib_tree_links  # noqa: E402,F401
+import add_oper_examples  # noqa: E402,F401
+import generate_examples  # noqa: E402,F401
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply the spec post-processing plugins in one pass')
+    parser.add_argument('--plugin', action='append', default=[], metavar='NAME',
+                        help='Run this plugin (repeatable; default: every default plugin)')
+    parser.add_argument('--list', action='store_true', help='List the registered plugins and exit')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Report every spec rewritten')
+    args = parser.parse_args()
+
+    if args.list:
+        for plugin in PLUGINS.values():
+            models = 'all models' if plugin.models == MODEL_DIRS else ', '.join(plugin.models)
+            print(f"{plugin.name:<16} {'default' if plugin.default else 'manual '}  {models}")
+        return
+
+    plugins = select_plugins(args.plugin)
+    print(f"Post-processing specs: {', '.join(plugin.name for plugin in plugins)}")
+    start = time.time()
+    rewritten = run_plugins(plugins, verbose=args.verbose)
+    report(plugins)
+    print(f"Rewrote {rewritten} specs in {time.time() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
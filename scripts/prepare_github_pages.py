@@ -12,6 +12,10 @@ import os
 import re
 from pathlib import Path
 from typing import List, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
 
 class GitHubPagesPreparer:
     """Prepare project for GitHub Pages deployment"""
@@ -106,9 +110,8 @@ class GitHubPagesPreparer:
                                                'all-mibs.json', 'all-other.json']:
                         spec_count += 1
                         try:
-                            with open(json_file, 'r', encoding='utf-8') as f:
-                                spec = json.load(f)
-                                path_count += len(spec.get('paths', {}))
+                            spec = spec_io.load(json_file)
+                            path_count += len(spec.get('paths', {}))
                         except:
                             pass
         
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+pyang tree output rendered in process from shared pyang contexts.
+
+Running `pyang -f tree` once per module starts a new interpreter, re-imports
+pyang and re-parses every imported module each time. TreeContext instead
+parses the requested modules into one repository and context, so common
+imports (ietf-yang-types, Cisco-IOS-XE-types, SNMPv2-TC, ...) are parsed and
+validated once, and then renders every module's tree from that context.
+render_trees() spreads the contexts over a bounded pool of worker processes
+(--jobs) and gives up on a module pyang spends longer than --timeout on.
+Building a context is capped at CONTEXT_TIMEOUT, so a stuck parse is noticed
+within minutes however many modules share the context.
+
+Each tree matches what `pyang -f tree <file>` prints for the module on its own:
+nodes other loaded modules augment into it are hidden unless the module
+imports them, and a module is reported as failed (pyang's non-zero exit) only
+for errors in the module or its submodules.
+"""
+
+import contextlib
+import functools
+import io
+import optparse
+import os
+import re
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Set, Tuple
+
+from pyang import context, error, plugin, repository, syntax
+
+from tree_cache import TreeCache
+from sharding import Shard  # from generators/, which importing tree_cache puts on sys.path
+
+DEFAULT_TIMEOUT = 60
+# Building a context (parsing and validating its modules) gets timeout seconds
+# per module, up to CONTEXT_TIMEOUT; the ~760 modules without deviations take
+# about 3 minutes together
+CONTEXT_TIMEOUT = 600
+# A context that runs out of time is retried in parts of at most this many
+# modules, and a part that runs out of time one module at a time
+RETRY_PART_MODULES = 25
+
+DEVIATION_PATTERN = re.compile(r'^\s*deviation\s+["\']?([^\s"\';{]+)', re.MULTILINE)
+IMPORT_PATTERN = re.compile(r'\bimport\s+([\w.-]+)\s*\{[^}]*?\bprefix\s+["\']?([\w.-]+)')
+PREFIX_PATTERN = re.compile(r'^\s*prefix\s+["\']?([\w.-]+)', re.MULTILINE)
+PATH_PREFIX_PATTERN = re.compile(r'/([\w.-]+):')
+
+_plugins_ready = False
+
+
+class RenderTimeout(Exception):
+    """pyang took longer than it was given"""
+
+
+def _init_plugins():
+    global _plugins_ready
+    if not _plugins_ready:
+        plugin.init([])
+        _plugins_ready = True
+
+
+def _default_options() -> optparse.Values:
+    """The options pyang's command line would have with no flags but -f tree"""
+    parser = optparse.OptionParser(add_help_option=False)
+    for p in plugin.plugins:
+        p.add_opts(parser)
+    options, _ = parser.parse_args([])
+    options.format = 'tree'
+    return options
+
+
+class TreeContext:
+    """One pyang repository and context rendering the trees of many modules"""
+
+    def __init__(self, search_dir, yang_files: Sequence[Path]):
+        _init_plugins()
+        formats = {}
+        for p in plugin.plugins:
+            p.add_output_format(formats)
+
+        # Like pyang run from the module's directory: search it (recursively) and the standard paths
+        self.ctx = context.Context(repository.FileRepository(str(Path(search_dir).resolve())))
+        self.ctx.opts = _default_options()
+        for p in plugin.plugins:
+            p.setup_ctx(self.ctx)
+        self.emitter = formats['tree']
+        self.emitter.setup_fmt(self.ctx)
+        for p in plugin.plugins:
+            p.pre_load_modules(self.ctx)
+
+        self.modules: Dict[Path, Optional[object]] = {}
+        for yang_file in yang_files:
+            self.modules[yang_file] = self._add(Path(yang_file).resolve())
+        modules = [module for module in self.modules.values() if module is not None]
+
+        for p in plugin.plugins:
+            p.pre_validate_ctx(self.ctx, modules)
+        self.emitter.pre_validate(self.ctx, modules)
+        self.ctx.validate()
+        for module in modules:
+            module.prune()
+        self.emitter.post_validate(self.ctx, modules)
+        for p in plugin.plugins:
+            p.post_validate_ctx(self.ctx, modules)
+
+    def _add(self, yang_file: Path):
+        try:
+            text = yang_file.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            return None
+        match = syntax.re_filename.search(yang_file.name)
+        if match is None:
+            return self.ctx.add_module(str(yang_file), text, primary_module=True)
+        name, revision, in_format = match.groups()
+        return self.ctx.add_module(str(yang_file), text, in_format, name, revision,
+                                   expect_failure_error=False, primary_module=True)
+
+    def _closure(self, module) -> Set[str]:
+        """Names of module, its submodules and everything they import, transitively"""
+        names: Set[str] = set()
+        pending = [module]
+        while pending:
+            current = pending.pop()
+            if current.arg in names:
+                continue
+            names.add(current.arg)
+            for statement in current.search('import') + current.search('include'):
+                dependency = self.ctx.get_module(statement.arg)
+                if dependency is not None:
+                    pending.append(dependency)
+                else:
+                    names.add(statement.arg)
+        return names
+
+    @staticmethod
+    def _hide_foreign(node, visible: Set[str], hidden: List[Tuple[object, list]]):
+        """Drop children other modules augmented into node's subtree, remembering them in hidden"""
+        children = getattr(node, 'i_children', None)
+        if not children:
+            return
+        kept = [child for child in children
+                if getattr(getattr(child, 'i_module', None), 'i_modulename', None) in visible
+                or not hasattr(child, 'i_module')]
+        if len(kept) != len(children):
+            hidden.append((node, children))
+            node.i_children = kept
+        for child in kept:
+            TreeContext._hide_foreign(child, visible, hidden)
+
+    def _failed(self, module) -> bool:
+        """Would `pyang -f tree` exit non-zero for module?
+
+        Like pyang, only errors in the module and its submodules count; the
+        tree plugin ignores those in modules loaded by import.
+        """
+        names = {module.arg} | {include.arg for include in module.search('include')}
+        for position, tag, args in self.ctx.errors:
+            if error.is_warning(error.err_level(tag)):
+                continue
+            top = position.top
+            if (top is not None and top.arg not in names
+                    and getattr(top, 'i_modulename', None) not in names and position.ref != module.pos.ref):
+                continue
+            # Other modules sharing the namespace are only loaded here, not by pyang on its own
+            if tag == 'DUPLICATE_NAMESPACE' and not set(args[1].split()) <= self._closure(module):
+                continue
+            return True
+        return False
+
+    def render(self, yang_file: Path) -> Tuple[str, bool]:
+        """(tree text, ok) for one of the modules given to the constructor"""
+        module = self.modules.get(yang_file)
+        if module is None:
+            return '', False
+        visible = self._closure(module)
+        hidden: List[Tuple[object, list]] = []
+        roots = [module] + [self.ctx.get_module(include.arg) for include in module.search('include')]
+        for root in roots:
+            if root is None:
+                continue
+            self._hide_foreign(root, visible, hidden)
+            for augment in root.search('augment'):
+                self._hide_foreign(augment, visible, hidden)
+        output = io.StringIO()
+        try:
+            self.emitter.emit(self.ctx, [module], output)
+        finally:
+            for node, children in reversed(hidden):
+                node.i_children = children
+        return output.getvalue(), not self._failed(module)
+
+
+def _module_name(yang_file: Path) -> str:
+    return Path(yang_file).stem.split('@')[0]
+
+
+@functools.lru_cache(maxsize=None)
+def _deviations(yang_file: Path) -> Tuple[FrozenSet[Tuple[str, ...]], Tuple[str, ...]]:
+    """(the schema nodes yang_file deviates, as ('module:node', ...) paths; the modules it imports)"""
+    try:
+        text = yang_file.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return frozenset(), ()
+    modules = {prefix: name for name, prefix in IMPORT_PATTERN.findall(text)}
+    imports = tuple(sorted(set(modules.values())))
+    own = PREFIX_PATTERN.search(text)
+    if own:
+        modules[own.group(1)] = _module_name(yang_file)
+    deviated = set()
+    for path in DEVIATION_PATTERN.findall(text):
+        steps = [step.partition(':') for step in path.strip('/').split('/')]
+        deviated.add(tuple(f"{modules.get(prefix, prefix)}:{node}" for prefix, _, node in steps))
+    return frozenset(deviated), imports
+
+
+def _deviation_paths(yang_file: Path) -> Set[Tuple[str, ...]]:
+    """What yang_file and the modules it imports deviate: deviations apply as soon as a module is loaded"""
+    deviated: Set[Tuple[str, ...]] = set()
+    seen = {_module_name(yang_file)}
+    pending = [Path(yang_file)]
+    while pending:
+        paths, imports = _deviations(pending.pop())
+        deviated |= paths
+        for name in imports:
+            imported = Path(yang_file).parent / f"{name}.yang"
+            if name not in seen and imported.exists():
+                seen.add(name)
+                pending.append(imported)
+    return deviated
+
+
+def _conflicts(paths: Set[Tuple[str, ...]], name: str, other_paths: Set[Tuple[str, ...]], other_name: str) -> bool:
+    """Would two deviating modules affect each other in one context?"""
+    for path in paths:
+        if any(step.startswith(other_name + ':') for step in path):
+            return True
+        for other in other_paths:
+            if path[:len(other)] == other[:len(path)]:
+                return True
+    return any(step.startswith(name + ':') for other in other_paths for step in other)
+
+
+def _context_groups(yang_files: Sequence[Path]) -> List[List[Path]]:
+    """Split yang_files into groups that can share a context
+
+    pyang applies a loaded module's deviations wherever the target appears,
+    so modules with deviation statements are kept apart from the rest, and
+    from each other when one deviates a node another deviates, or the other
+    module itself.
+    """
+    plain: List[Path] = []
+    groups: List[List[Tuple[Path, Set[Tuple[str, ...]]]]] = []
+    for yang_file in yang_files:
+        paths = _deviation_paths(yang_file)
+        if not paths:
+            plain.append(yang_file)
+            continue
+        name = _module_name(yang_file)
+        for group in groups:
+            if not any(_conflicts(paths, name, other_paths, _module_name(other))
+                       for other, other_paths in group):
+                break
+        else:
+            group = []
+            groups.append(group)
+        group.append((yang_file, paths))
+    return ([plain] if plain else []) + [[yang_file for yang_file, _ in group] for group in groups]
+
+
+def add_pool_arguments(parser):
+    """Register --jobs and --timeout on a tree script's argparse parser"""
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Render trees in this many worker processes (0 = one per CPU)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, metavar='SECONDS',
+                        help=f'Give up on a module whose tree takes longer than this to render, and on a '
+                             f'shared context that takes longer than this per module (at most {CONTEXT_TIMEOUT}s) '
+                             f'to parse; 0 = no limit (default: {DEFAULT_TIMEOUT:g})')
+    return parser
+
+
+@contextlib.contextmanager
+def _time_limit(seconds: Optional[float]):
+    """Raise RenderTimeout in the block after seconds (where SIGALRM is available)"""
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise RenderTimeout(f"timed out after {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _render_group(search_dir, group: List[Path], timeout: Optional[float]
+                  ) -> Dict[Path, Optional[Tuple[str, bool]]]:
+    """Trees of one group of modules from a context of their own; None for a module that ran out of time
+
+    Building the context raises RenderTimeout after timeout seconds per
+    module (at most CONTEXT_TIMEOUT); each tree then gets timeout seconds.
+    """
+    # Not under the time limit: a plugin setup cut short cannot be redone
+    _init_plugins()
+    with _time_limit(min(timeout * len(group), CONTEXT_TIMEOUT) if timeout else None):
+        tree_context = TreeContext(search_dir, group)
+    trees: Dict[Path, Optional[Tuple[str, bool]]] = {}
+    for yang_file in group:
+        try:
+            with _time_limit(timeout):
+                trees[yang_file] = tree_context.render(yang_file)
+        except RenderTimeout:
+            trees[yang_file] = None
+    return trees
+
+
+def _split(groups: List[List[Path]], jobs: int, part_size: Optional[int] = None) -> List[List[Path]]:
+    """Split each group into one part per worker (or parts of at most part_size), largest parts first"""
+    tasks = []
+    for group in groups:
+        count = min(-(-len(group) // part_size) if part_size else jobs, len(group))
+        tasks.extend(Shard(index, count).select(group) for index in range(1, count + 1))
+    return sorted(tasks, key=lambda task: -sum(yang_file.stat().st_size for yang_file in task))
+
+
+def _run(search_dir, tasks: List[List[Path]], jobs: int, timeout: Optional[float]
+         ) -> Iterator[Tuple[List[Path], Optional[Dict[Path, Optional[Tuple[str, bool]]]], Optional[str]]]:
+    """(group, its trees or None, why not) for each task, in process or across worker processes"""
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            try:
+                yield task, _render_group(search_dir, task, timeout), None
+            except Exception as e:
+                yield task, None, str(e) if isinstance(e, RenderTimeout) else f"{type(e).__name__}: {e}"
+        return
+    with ProcessPoolExecutor(min(jobs, len(tasks))) as executor:
+        futures = {executor.submit(_render_group, search_dir, task, timeout): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:  # a timeout, or the worker process died
+                yield futures[future], None, str(e) if isinstance(e, RenderTimeout) else f"{type(e).__name__}: {e}"
+
+
+def render_trees(search_dir, yang_files: Sequence[Path], trees: TreeCache, jobs: int = 1,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT) -> Dict[Path, Tuple[str, bool]]:
+    """(tree text, ok) per module: from the cache, or rendered from shared contexts
+
+    With jobs > 1 the contexts are split across worker processes. Each tree
+    gets timeout seconds to render. A context that takes longer than timeout
+    seconds per module (at most CONTEXT_TIMEOUT) to build is retried in parts
+    of at most RETRY_PART_MODULES, and a part that runs out of time one module
+    at a time, so only the module pyang is stuck on is given up on. That
+    module, and one whose tree runs out of time, comes back as ('', False)
+    and is not cached.
+    """
+    results: Dict[Path, Tuple[str, bool]] = {}
+    missing = []
+    for yang_file in yang_files:
+        cached = trees.get(yang_file)
+        if cached is None:
+            missing.append(yang_file)
+        else:
+            results[yang_file] = cached
+    if not missing:
+        return results
+
+    jobs = jobs if jobs and jobs > 0 else (os.cpu_count() or 1)
+    tasks = _split(_context_groups(missing), jobs)
+    print(f"Parsing {len(missing)} modules with pyang ({len(results)} cached) "
+          f"in {len(tasks)} contexts, {min(jobs, len(tasks))} at a time...")
+    while tasks:
+        retry = []
+        for task, rendered, problem in _run(search_dir, tasks, jobs, timeout):
+            if rendered is None and len(task) > RETRY_PART_MODULES:
+                print(f"  ⚠️  {len(task)} modules: {problem}; retrying them in parts")
+                retry.extend(_split([task], jobs, RETRY_PART_MODULES))
+            elif rendered is None and len(task) > 1:
+                print(f"  ⚠️  {len(task)} modules: {problem}; retrying them one at a time")
+                retry.extend([yang_file] for yang_file in task)
+            elif rendered is None:
+                print(f"  ⚠️  {task[0].stem}: {problem}")
+                results[task[0]] = ('', False)
+            else:
+                for yang_file, tree in rendered.items():
+                    if tree is None:
+                        print(f"  ⚠️  {yang_file.stem}: tree timed out after {timeout:g}s")
+                        results[yang_file] = ('', False)
+                    else:
+                        results[yang_file] = tree
+                        trees.put(yang_file, *tree)
+        tasks = retry
+    return results
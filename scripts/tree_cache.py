@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+pyang tree output kept in the shared artifact cache (generators/artifact_cache.py).
+
+A module's tree is keyed by the pyang version, the code that renders it
+(RENDERER_LIBS: the in-process contexts, augment hiding and error filtering
+in pyang_context.py), the pyang options and the content hashes of the module
+and every module it imports or includes, so on any builder sharing the cache
+an unchanged module never runs pyang again, and a renderer change re-renders
+every tree.
+The cache holds pyang's text output and whether pyang reported errors, not
+the HTML pages, so page template changes do not invalidate it. Without
+--cache-dir or BUILD_CACHE_DIR the tree scripts use .build/cache in the
+repository (add_tree_cache_argument()).
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+from artifact_cache import ArtifactCache, add_cache_argument, cache_key  # noqa: E402
+from build_manifest import ModuleSources  # noqa: E402
+
+TREE_OPTIONS = ('-f', 'tree')
+# Scripts whose code affects the cached trees
+RENDERER_LIBS = ('pyang_context.py', 'tree_cache.py')
+# Used without --cache-dir or BUILD_CACHE_DIR, so a local build only renders changed modules
+LOCAL_CACHE_DIR = Path(__file__).resolve().parent.parent / '.build' / 'cache'
+
+
+def add_tree_cache_argument(parser):
+    """Register --cache-dir on a tree script's parser, defaulting to LOCAL_CACHE_DIR"""
+    return add_cache_argument(parser, LOCAL_CACHE_DIR)
+
+
+def pyang_version() -> str:
+    """The installed pyang's version, or 'missing' when pyang is not installed"""
+    try:
+        import pyang
+    except ImportError:
+        return 'missing'
+    return f"pyang {pyang.__version__}"
+
+
+def renderer_version() -> str:
+    """Hash of the scripts that render the cached trees (RENDERER_LIBS)"""
+    scripts_dir = Path(__file__).resolve().parent
+    sha = hashlib.sha256()
+    for name in RENDERER_LIBS:
+        sha.update(name.encode() + b'\0' + (scripts_dir / name).read_bytes())
+    return sha.hexdigest()
+
+
+class TreeCache:
+    """Cached pyang output per module; a no-op without a cache directory"""
+
+    def __init__(self, cache: Optional[ArtifactCache], yang_dir, options: Sequence[str] = TREE_OPTIONS):
+        self.cache = cache
+        self.options = list(options)
+        self.sources = ModuleSources(yang_dir)
+        self.version = pyang_version() if cache else ''
+        self.renderer = renderer_version() if cache else ''
+
+    def _key(self, yang_file: Path) -> str:
+        return cache_key('pyang-tree', self.version, self.renderer, self.options, self.sources.hashes(yang_file))
+
+    def get(self, yang_file: Path) -> Optional[Tuple[str, bool]]:
+        """The cached (output, ok) for yang_file, or None"""
+        if self.cache is None:
+            return None
+        entry = self.cache.get(self._key(yang_file))
+        return (entry['files']['tree'].decode('utf-8'), entry['meta']['ok']) if entry else None
+
+    def put(self, yang_file: Path, output: str, ok: bool):
+        """Cache pyang's output for yang_file and whether it succeeded"""
+        if self.cache is not None:
+            self.cache.put(self._key(yang_file), {'tree': output.encode('utf-8')},
+                           {'module': yang_file.stem, 'ok': ok})
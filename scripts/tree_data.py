@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+pyang tree output as compact JSON for the shared tree viewer (tree-viewer.js).
+
+A tree page used to hold pyang's text in one <pre>: Cisco-IOS-XE-native alone
+is 115,000 lines, which the browser lays out in full before the page can be
+scrolled, and none of it can be collapsed. parse_tree() turns the text into a
+flat node table instead, which the page embeds and tree-viewer.js renders,
+drawing only the rows in view and expanding subtrees on demand.
+
+  {"format": 1, "fields": [...FIELDS], "nodes": [[name, kind, flags, type, size, opts, status, keys, features], ...]}
+
+Nodes are listed in document order with the number of descendants they have
+(`size`), so a node's subtree is the `size` rows after it, its first child is
+the next row and each further child follows the previous one's subtree.
+Trailing empty fields are left off each row.
+  name      node name, with the module prefix when another module defines it;
+            the argument of a section (augment target path, grouping name, ...)
+  kind      container, list, leaf, leaf-list, choice, case, anydata, anyxml,
+            rpc, action, notification, input, output or uses; module or
+            submodule for the first row; augment, rpcs, notifications,
+            grouping, yang-data, structure or augment-structure for sections
+  flags     rw, ro, -w, -x, -n, -u (pyang's flags column)
+  type      the type column (a submodule row holds the module it belongs to)
+  opts      '?' optional leaf/choice, '!' presence container
+  status    'x' deprecated, 'o' obsolete (empty for current)
+  keys      list keys, space separated
+  features  if-feature names, comma separated
+
+render_text() prints the table back exactly as pyang did, column alignment
+included; write_tree_markup() uses it to check every tree and falls back to
+the plain text for one it cannot represent.
+"""
+
+import html
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
+
+FORMAT_VERSION = 1
+FIELDS = ('name', 'kind', 'flags', 'type', 'size', 'opts', 'status', 'keys', 'features')
+NAME, KIND, FLAGS, TYPE, SIZE, OPTS, STATUS, KEYS, FEATURES = range(len(FIELDS))
+
+SECTIONS = ('augment', 'rpcs', 'notifications', 'grouping', 'yang-data', 'structure', 'augment-structure')
+HEADER_PATTERN = re.compile(r'^(module|submodule): (\S+)(?: \(belongs-to (\S+)\))?$')
+SECTION_PATTERN = re.compile(r'^  (%s)(?: (.+))?:$' % '|'.join(re.escape(s) for s in SECTIONS))
+NODE_PATTERN = re.compile(r'^([ |]*)([+xo])--(.*)$')
+CASE_PATTERN = re.compile(r'^:\(([^)]+)\)(?: \{([^{}]*)\}\?)?$')
+CHOICE_PATTERN = re.compile(r'^([-\w]*) \(([^)]+)\)(\?)?(?: \{([^{}]*)\}\?)?$')
+FEATURES_PATTERN = re.compile(r'^(.*?)(?: \{([^{}]*)\}\?)?$')
+# Section children sit two columns further in than the module's own data nodes
+SECTION_COLUMN = 2
+
+
+def _row(name: str, kind: str, flags: str = '', type_: str = '', opts: str = '', status: str = '',
+         keys: str = '', features: str = '') -> List[Any]:
+    row = [name, kind, flags, type_, 0, opts, status, keys, features]
+    while len(row) > SIZE + 1 and row[-1] == '':
+        row.pop()
+    return row
+
+
+def _node(body: str, status: str, parent_kind: str) -> Optional[List[Any]]:
+    """The row for one node line (what follows 'status--'), or None if it cannot be read"""
+    status = '' if status == '+' else status
+    case = CASE_PATTERN.match(body)
+    if case:
+        return _row(case.group(1), 'case', status=status, features=case.group(2) or '')
+    choice = CHOICE_PATTERN.match(body)
+    if choice:
+        return _row(choice.group(2), 'choice', choice.group(1), opts=choice.group(3) or '',
+                    status=status, features=choice.group(4) or '')
+
+    flags, _, rest = body.partition(' ')
+    rest, features = FEATURES_PATTERN.match(rest).groups()
+    features = features or ''
+    name, _, column = rest.partition(' ')
+    column = column.strip()
+    if not name:
+        return None
+    if column.startswith('[') and column.endswith(']') and name.endswith('*'):
+        return _row(name[:-1], 'list', flags, status=status, keys=column[1:-1], features=features)
+    if column:
+        if name.endswith('*'):
+            return _row(name[:-1], 'leaf-list', flags, column, status=status, features=features)
+        opts = '?' if name.endswith('?') else ''
+        kind = {'<anydata>': 'anydata', '<anyxml>': 'anyxml'}.get(column, 'leaf')
+        return _row(name.rstrip('?'), kind, flags, column, opts, status, features=features)
+    if flags == '-x':
+        kind = 'rpc' if parent_kind == 'rpcs' else 'action'
+    elif flags == '-n':
+        kind = 'notification'
+    elif flags == '-u':
+        kind = 'uses'
+    elif name in ('input', 'output') and parent_kind in ('rpc', 'action'):
+        kind = name
+    elif name.endswith(('?', '*')):
+        # Typed nodes always have a type column; keyless lists print ' []'
+        return None
+    else:
+        kind = 'container'
+    opts = '!' if name.endswith('!') else ''
+    return _row(name.rstrip('!'), kind, flags, opts=opts, status=status, features=features)
+
+
+def parse_tree(text: str) -> Optional[Dict[str, Any]]:
+    """The node table for `pyang -f tree` output of one module, or None if it cannot be read"""
+    lines = [line for line in text.splitlines() if line.strip()]
+    header = HEADER_PATTERN.match(lines[0]) if lines else None
+    if header is None:
+        return None
+    nodes = [_row(header.group(2), header.group(1), type_=header.group(3) or '')]
+    parents = [-1]
+    stack = [(-1, 0)]  # (column, node index) of the open ancestors
+
+    for line in lines[1:]:
+        section = SECTION_PATTERN.match(line)
+        match = None if section else NODE_PATTERN.match(line)
+        if section:
+            column = SECTION_COLUMN
+        elif match:
+            column = len(match.group(1))
+        else:
+            return None
+        while stack[-1][0] >= column:
+            stack.pop()
+        parent = stack[-1][1]
+        row = (_row(section.group(2) or '', section.group(1)) if section
+               else _node(match.group(3), match.group(2), nodes[parent][KIND]))
+        if row is None:
+            return None
+        stack.append((column, len(nodes)))
+        nodes.append(row)
+        parents.append(parent)
+
+    for i in range(len(nodes) - 1, 0, -1):
+        nodes[parents[i]][SIZE] += nodes[i][SIZE] + 1
+    return {'format': FORMAT_VERSION, 'fields': list(FIELDS), 'nodes': nodes}
+
+
+def _field(row: List[Any], index: int) -> str:
+    return row[index] if index < len(row) else ''
+
+
+def _children(nodes: List[List[Any]], index: int) -> List[int]:
+    children = []
+    child, end = index + 1, index + 1 + nodes[index][SIZE]
+    while child < end:
+        children.append(child)
+        child += nodes[child][SIZE] + 1
+    return children
+
+
+def render_text(tree: Dict[str, Any]) -> str:
+    """The `pyang -f tree` text a node table was read from (without the trailing newline)"""
+    nodes = tree['nodes']
+    lines: List[str] = []
+
+    def width(children: List[int]) -> int:
+        # pyang's column for types: the longest name among siblings, choices and cases counting their contents
+        return max([3 + width(_children(nodes, child)) if nodes[child][KIND] in ('choice', 'case')
+                    else len(nodes[child][NAME]) for child in children], default=0)
+
+    def render_children(children: List[int], prefix: str, column: int):
+        column = column or width(children)
+        for child in children:
+            render_node(child, prefix + ('   ' if child == children[-1] else '  |'), column)
+
+    def render_node(index: int, prefix: str, column: int):
+        row = nodes[index]
+        name, kind, flags, type_ = row[NAME], row[KIND], row[FLAGS], row[TYPE]
+        opts, keys = _field(row, OPTS), _field(row, KEYS)
+        line = prefix[:-1] + (_field(row, STATUS) or '+') + '--'
+        if kind == 'case':
+            line += f":({name})"
+        elif kind == 'choice':
+            line += f"{flags} ({name}){opts}"
+        elif kind == 'list':
+            line += f"{flags} {name}* [{keys}]"
+        elif kind == 'container':
+            line += f"{flags} {name}{opts}"
+        else:
+            name += ('*' if kind == 'leaf-list' else '') + opts
+            line += f"{flags} {name:<{column + 1}}   {type_}" if type_ else f"{flags} {name}"
+        if _field(row, FEATURES):
+            line += f" {{{row[FEATURES]}}}?"
+        lines.append(line)
+        children = _children(nodes, index)
+        if kind in ('choice', 'case'):
+            render_children(children, prefix, column - 3)
+        else:
+            render_children(children, prefix, 0)
+
+    root = nodes[0]
+    lines.append(f"{root[KIND]}: {root[NAME]}" + (f" (belongs-to {root[TYPE]})" if root[TYPE] else ''))
+    top = _children(nodes, 0)
+    render_children([child for child in top if nodes[child][KIND] not in SECTIONS], '', 0)
+    previous = None
+    for section in (child for child in top if nodes[child][KIND] in SECTIONS):
+        kind, argument = nodes[section][KIND], nodes[section][NAME]
+        if kind != previous:
+            lines.append('')
+        previous = kind
+        lines.append(f"  {kind} {argument}:" if argument else f"  {kind}:")
+        render_children(_children(nodes, section), '  ', 0)
+    return '\n'.join(lines)
+
+
+def write_tree_markup(out: TextIO, text: str) -> bool:
+    """
+    Write the tree part of a page to out: the node table for the viewer, or
+    plain text if the tree cannot be read. Rows are written one at a time, so
+    the table for a large module is never held as one string. True if the page
+    needs the viewer script.
+    """
+    text = text.strip()
+    tree = parse_tree(text)
+    if tree is None or render_text(tree) != text:
+        out.write(f"<pre>{html.escape(text)}</pre>")
+        return False
+    out.write('<div class="tree-view" data-tree="tree-data"></div>\n'
+              '<script type="application/json" id="tree-data">')
+    out.write(spec_io.dumps({'format': tree['format'], 'fields': tree['fields']}, pretty=False)[:-1])
+    out.write(',"nodes":[')
+    for i, row in enumerate(tree['nodes']):
+        # '<' only occurs inside JSON strings; escaping it keeps '</script>' out of the data
+        out.write((',' if i else '') + spec_io.dumps(row, pretty=False).replace('<', '\\u003c'))
+    out.write(']}</script>')
+    return True
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+The shared page template for yang-trees/ (YANG and MIB tree pages alike).
+
+Each page used to carry its own few KB of CSS and navigation styling, repeated
+across some 720 pages. Pages now link tree-page.css and tree-viewer.js from
+the repository root, versioned by content hash, so a browser downloads them
+once for every tree and only refetches them when they change. write_page()
+streams a page straight to its file: the template pieces, then the tree's
+node table row by row (tree_data.write_tree_markup()).
+"""
+
+import functools
+import hashlib
+import html
+from pathlib import Path
+from typing import Sequence, Tuple
+
+from tree_data import write_tree_markup
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STYLESHEET = REPO_ROOT / 'tree-page.css'
+VIEWER_SCRIPT = REPO_ROOT / 'tree-viewer.js'
+
+# (href, label, style): style is '' or one of the .nav-links classes in tree-page.css
+Link = Tuple[str, str, str]
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href="{stylesheet}">
+</head>
+<body class="{theme}">
+    <div class="page">
+        <div class="header">
+            <h1>{heading}</h1>
+            <p>{subtitle}</p>
+        </div>
+
+        <div class="nav">
+            <p class="nav-title"><strong>📚 API Documentation &amp; Navigation</strong></p>
+            <div class="nav-links">
+{links}
+            </div>
+        </div>
+
+        <div class="tree-container">
+            <div class="tree-output">
+"""
+
+PAGE_FOOT = """
+            </div>
+        </div>
+
+        <div class="footer">
+            {footer}
+        </div>
+    </div>
+{scripts}</body>
+</html>
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def asset_src(path: Path) -> str:
+    """URL of a shared repository-root asset from a tree page, versioned by its content"""
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    return f"../{path.name}?v={digest}"
+
+
+def _link(href: str, label: str, style: str) -> str:
+    target = ' target="_blank"' if href.startswith('http') else ''
+    css_class = f' class="{style}"' if style else ''
+    return f'                <a href="{html.escape(href)}"{css_class}{target}>{label}</a>'
+
+
+def write_page(path: Path, title: str, heading: str, subtitle: str, links: Sequence[Link],
+               tree_text: str, footer: str, theme: str = 'yang'):
+    """Write one tree page; heading, subtitle, link labels and footer are HTML"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(PAGE_HEAD.format(title=html.escape(title), stylesheet=asset_src(STYLESHEET), theme=theme,
+                                 heading=heading, subtitle=subtitle,
+                                 links='\n'.join(_link(*link) for link in links)))
+        viewer = write_tree_markup(f, tree_text)
+        scripts = f'    <script src="{asset_src(VIEWER_SCRIPT)}"></script>\n' if viewer else ''
+        f.write(PAGE_FOOT.format(footer=footer, scripts=scripts))
@@ -4,11 +4,14 @@ Quality Validation Script for Generated OpenAPI Specifications
 Analyzes path coverage, schema completeness, and identifies sparse modules.
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 from collections import defaultdict
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generators'))
+import spec_io  # noqa: E402
 
 class QualityValidator:
     """Validate quality of generated OpenAPI specifications"""
@@ -27,8 +30,7 @@ class QualityValidator:
     def analyze_spec(self, spec_path: Path) -> Dict[str, Any]:
         """Analyze a single OpenAPI spec"""
         try:
-            with open(spec_path, 'r', encoding='utf-8') as f:
-                spec = json.load(f)
+            spec = spec_io.load(spec_path)
             
             paths = spec.get('paths', {})
             schemas = spec.get('components', {}).get('schemas', {})
@@ -218,8 +220,7 @@ class QualityValidator:
     
     def save_report(self, output_file: str):
         """Save validation report to JSON"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2)
+        spec_io.dump(self.results, output_file)
         print(f"\nReport saved to: {output_file}")
 
 
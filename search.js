@@ -22,13 +22,29 @@ let advancedFilters = {
 let autocompleteIndex = [];
 let selectedSuggestionIndex = -1;
 
+// Resolve search-index.json to its fingerprinted copy when search-manifest.json lists one
+async function resolveSearchIndexUrl() {
+    try {
+        const response = await fetch('search-manifest.json', { cache: 'no-cache' });
+        if (response.ok) {
+            const manifest = await response.json();
+            if (manifest.files && manifest.files['search-index.json']) {
+                return manifest.files['search-index.json'];
+            }
+        }
+    } catch (error) {
+        // No manifest - use the logical file
+    }
+    return 'search-index.json';
+}
+
 // Load search index
 async function loadSearchIndex() {
     if (searchReadyPromise) return searchReadyPromise;
     
     searchReadyPromise = (async () => {
         try {
-            const response = await fetch('search-index.json');
+            const response = await fetch(await resolveSearchIndexUrl());
             if (!response.ok) throw new Error(`HTTP ${response.status}`);
             
             const data = await response.json();
@@ -0,0 +1,225 @@
+// Shared spec loading for the swagger-*-model pages
+// Opens a module in Swagger UI, using the per-path fragments written by
+// `--fragments` when they exist: the page first loads a small skeleton with one
+// stub per operation, and only fetches an operation's full definition when the
+// user expands it. Otherwise loads the fingerprinted copy listed under 'files'
+// in api/manifest.json (scripts/fingerprint_outputs.py), falling back to api/<module>.json.
+// Manifests and indexes are always revalidated; everything they point to is
+// content-addressed and safe to cache forever.
+// Specs written with `--externalize` keep their examples (externalValue) and
+// long descriptions ('x-description-ref') in sidecar files under
+// api/external/<module>/; those are fetched the first time an operation is
+// expanded. Sidecar URLs are relative to the api/ directory.
+
+const fragmentIndexCache = {};
+const manifestCache = {};
+const sidecarCache = {};
+
+// Split 'api/Foo.json?v=1' into its directory ('api/') and module stem ('Foo')
+function parseSpecUrl(specUrl) {
+    const path = specUrl.split(/[?#]/)[0];
+    const slash = path.lastIndexOf('/');
+    const dir = path.substring(0, slash + 1);
+    const stem = path.substring(slash + 1).replace(/\.json$/, '');
+    return { dir, stem };
+}
+
+// Fetch a manifest-like JSON file, bypassing stale cached copies
+function fetchManifest(url, fallback) {
+    return fetch(url, { cache: 'no-cache' })
+        .then(response => response.ok ? response.json() : fallback)
+        .catch(() => fallback);
+}
+
+// Load (once per api directory) the list of modules that have fragments
+async function getFragmentIndex(dir) {
+    if (!(dir in fragmentIndexCache)) {
+        fragmentIndexCache[dir] = fetchManifest(`${dir}fragments/index.json`, { modules: {} });
+    }
+    return fragmentIndexCache[dir];
+}
+
+// Load (once per api directory) the model manifest
+async function getManifest(dir) {
+    if (!(dir in manifestCache)) {
+        manifestCache[dir] = fetchManifest(`${dir}manifest.json`, {});
+    }
+    return manifestCache[dir];
+}
+
+// Resolve the URL Swagger UI should load for a spec
+async function resolveSpecUrl(specUrl) {
+    const { dir, stem } = parseSpecUrl(specUrl);
+    const index = await getFragmentIndex(dir);
+    const skeleton = (index.modules || {})[stem];
+    if (skeleton) return `${dir}fragments/${skeleton}`;
+
+    const manifest = await getManifest(dir);
+    const fingerprinted = (manifest.files || {})[stem];
+    return fingerprinted ? dir + fingerprinted : specUrl;
+}
+
+// Path of the operation with operationId in the loaded spec, or null
+function findOperationPath(specJson, operationId) {
+    let found = null;
+    (specJson.get('paths') || new Map()).forEach((pathItem, path) => {
+        if (found) return;
+        pathItem.forEach(operation => {
+            if (operation && operation.get && operation.get('operationId') === operationId) {
+                found = path;
+            }
+        });
+    });
+    return found;
+}
+
+// Fetch a sidecar file once per URL
+function fetchSidecar(url) {
+    if (!(url in sidecarCache)) {
+        sidecarCache[url] = fetch(url).then(response => {
+            if (!response.ok) throw new Error(`${response.status} ${url}`);
+            return response.json();
+        });
+        sidecarCache[url].catch(() => delete sidecarCache[url]);
+    }
+    return sidecarCache[url];
+}
+
+// Fetch the fragment holding operationId and merge it into the loaded spec
+function loadFragmentForOperation(system, operationId, loaded) {
+    const specJson = system.specSelectors.specJson();
+    const fragmentFiles = specJson.get('x-fragments');
+    if (!fragmentFiles) return Promise.resolve();
+
+    const fragmentPath = findOperationPath(specJson, operationId);
+    if (!fragmentPath || loaded.has(fragmentPath)) return Promise.resolve();
+    loaded.add(fragmentPath);
+
+    const specUrl = system.specSelectors.url();
+    const baseUrl = specUrl.substring(0, specUrl.lastIndexOf('/') + 1);
+
+    return fetch(baseUrl + fragmentFiles.get(fragmentPath))
+        .then(response => response.json())
+        .then(fragment => {
+            const spec = system.specSelectors.specJson().toJS();
+            spec.paths[fragment.path] = fragment.pathItem;
+            spec.components = spec.components || {};
+            Object.entries(fragment.components || {}).forEach(([section, entries]) => {
+                spec.components[section] = Object.assign({}, spec.components[section], entries);
+            });
+            system.specActions.updateJsonSpec(spec);
+            // Re-resolve the now complete operations so refs render
+            Object.keys(fragment.pathItem).forEach(method => {
+                system.specActions.requestResolvedSubtree(['paths', fragment.path, method]);
+            });
+        })
+        .catch(error => {
+            loaded.delete(fragmentPath);
+            console.error('Error loading fragment for', fragmentPath, error);
+        });
+}
+
+// Collect the externalValue URLs not yet loaded inside node, following
+// references to components/examples
+function collectExternalValues(node, urls, componentExamples) {
+    if (Array.isArray(node)) {
+        node.forEach(value => collectExternalValues(value, urls, componentExamples));
+    } else if (node && typeof node === 'object') {
+        if (typeof node.externalValue === 'string' && !('value' in node)) urls.add(node.externalValue);
+        const ref = typeof node.$ref === 'string' && node.$ref.match(/^#\/components\/examples\/(.+)$/);
+        if (ref && componentExamples[ref[1]]) collectExternalValues(componentExamples[ref[1]], urls, {});
+        Object.values(node).forEach(value => collectExternalValues(value, urls, componentExamples));
+    }
+}
+
+// True if a description in node still points into the description sidecar
+function hasDescriptionRefs(node) {
+    if (Array.isArray(node)) return node.some(hasDescriptionRefs);
+    if (!node || typeof node !== 'object') return false;
+    return 'x-description-ref' in node || Object.values(node).some(hasDescriptionRefs);
+}
+
+// Fill in loaded example values and full descriptions throughout node
+function applySidecars(node, examples, descriptions) {
+    if (Array.isArray(node)) {
+        node.forEach(value => applySidecars(value, examples, descriptions));
+    } else if (node && typeof node === 'object') {
+        if (typeof node.externalValue === 'string' && node.externalValue in examples) {
+            node.value = examples[node.externalValue];
+            delete node.externalValue;
+        }
+        if (descriptions && 'x-description-ref' in node) {
+            node.description = descriptions[node['x-description-ref']];
+            delete node['x-description-ref'];
+        }
+        Object.values(node).forEach(value => applySidecars(value, examples, descriptions));
+    }
+}
+
+// Fetch the examples an expanded operation uses, plus the module's description
+// sidecar, and merge them into the loaded spec
+async function loadExternalForOperation(system, operationId, apiDir) {
+    const specJson = system.specSelectors.specJson();
+    const external = specJson.get('x-external');
+    if (!external) return;
+    const path = findOperationPath(specJson, operationId);
+    if (!path) return;
+
+    // The operation's own examples and the shared components/examples it references
+    const spec = specJson.toJS();
+    const urls = new Set();
+    collectExternalValues(spec.paths[path], urls, (spec.components || {}).examples || {});
+
+    const descriptionsUrl = external.get('descriptions');
+    const loadDescriptions = Boolean(descriptionsUrl) && hasDescriptionRefs(spec);
+    if (!urls.size && !loadDescriptions) return;
+
+    try {
+        const examples = {};
+        await Promise.all([...urls].map(url =>
+            fetchSidecar(apiDir + url).then(value => { examples[url] = value; })));
+        const descriptions = loadDescriptions
+            ? (await fetchSidecar(apiDir + descriptionsUrl)).descriptions
+            : null;
+
+        // Apply to a fresh copy: other operations may have been merged meanwhile
+        const current = system.specSelectors.specJson().toJS();
+        applySidecars(current, examples, descriptions);
+        system.specActions.updateJsonSpec(current);
+        Object.keys(current.paths[path] || {}).forEach(method => {
+            system.specActions.requestResolvedSubtree(['paths', path, method]);
+        });
+    } catch (error) {
+        console.error('Error loading sidecars for', path, error);
+    }
+}
+
+// Swagger UI plugin: load an operation's fragment and sidecars the first time it is expanded
+function LazyFragmentsPlugin(apiDir) {
+    const loaded = new Set();
+    return () => ({
+        statePlugins: {
+            layout: {
+                wrapActions: {
+                    show: (oriAction, system) => (isShownKey, isShown) => {
+                        const key = isShownKey && isShownKey.toJS ? isShownKey.toJS() : isShownKey;
+                        if (isShown && Array.isArray(key) && key[0] === 'operations' && key[2]) {
+                            loadFragmentForOperation(system, key[2], loaded)
+                                .then(() => loadExternalForOperation(system, key[2], apiDir));
+                        }
+                        return oriAction(isShownKey, isShown);
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Drop-in replacement for SwaggerUIBundle(config) used by the model pages
+async function openSpec(config) {
+    const url = await resolveSpecUrl(config.url);
+    return SwaggerUIBundle(Object.assign({}, config, {
+        url: url,
+        plugins: (config.plugins || []).concat([LazyFragmentsPlugin(parseSpecUrl(config.url).dir)])
+    }));
+}
@@ -0,0 +1,294 @@
+// Shared YANG tree viewer for the yang-trees/ pages
+// Each page embeds its tree as a node table (see scripts/tree_data.py for the
+// format) in <script type="application/json" id="tree-data">, next to an empty
+// <div class="tree-view" data-tree="tree-data">. The viewer draws the tree as
+// pyang prints it, but only the rows scrolled into view, and it lists a
+// subtree's rows only when the subtree is expanded, so even
+// Cisco-IOS-XE-native (115,000 nodes) opens at once. Small trees start fully
+// expanded; large ones show their top levels. Styles live in tree-page.css.
+
+const TREE_ROW_HEIGHT = 18;          // px; the .tree-row height in tree-page.css
+const TREE_OVERSCAN = 30;            // rows drawn beyond each edge of the viewport
+const TREE_EXPAND_ALL_LIMIT = 3000;  // trees up to this many nodes open fully expanded
+const TREE_OPEN_DEPTH = 3;           // larger ones open this many levels deep
+const TREE_SECTIONS = new Set(['augment', 'rpcs', 'notifications', 'grouping', 'yang-data',
+                               'structure', 'augment-structure']);
+const [T_NAME, T_KIND, T_FLAGS, T_TYPE, T_SIZE, T_OPTS, T_STATUS, T_KEYS, T_FEATURES] = [0, 1, 2, 3, 4, 5, 6, 7, 8];
+
+// A node table plus what drawing needs: parents, connector prefixes and type columns
+class TreeModel {
+    constructor(tree) {
+        this.nodes = tree.nodes;
+        const count = this.nodes.length;
+        this.parent = new Int32Array(count);
+        this.prefixes = new Array(count);
+        this.columns = new Map();
+        const open = [-1];
+        for (let i = 0; i < count; i++) {
+            while (open.length > 1 && i >= this.end(open[open.length - 1])) open.pop();
+            this.parent[i] = open[open.length - 1];
+            if (this.size(i) > 0) open.push(i);
+        }
+    }
+
+    size(i) { return this.nodes[i][T_SIZE]; }
+    end(i) { return i + 1 + this.size(i); }
+    field(i, index) { return this.nodes[i][index] || ''; }
+    kind(i) { return this.nodes[i][T_KIND]; }
+    isSection(i) { return TREE_SECTIONS.has(this.kind(i)); }
+
+    children(i) {
+        const children = [];
+        for (let child = i + 1; child < this.end(i); child = this.end(child)) children.push(child);
+        return children;
+    }
+
+    // The module's own data nodes are one group, each section's nodes another
+    siblings(i) {
+        const children = this.children(i);
+        return i === 0 ? children.filter(child => !this.isSection(child)) : children;
+    }
+
+    isLast(i) {
+        const next = this.end(i);
+        const parent = this.parent[i];
+        return next >= this.end(parent) || (parent === 0 && this.isSection(next));
+    }
+
+    // pyang's connector prefix for node i (its line starts with all but the last character)
+    prefix(i) {
+        if (this.prefixes[i] === undefined) {
+            const parent = this.parent[i];
+            const base = parent === 0 ? '' : this.isSection(parent) ? '  ' : this.prefix(parent);
+            this.prefixes[i] = base + (this.isLast(i) ? '   ' : '  |');
+        }
+        return this.prefixes[i];
+    }
+
+    // pyang's type column: the longest name among siblings, choices and cases counting their contents
+    width(children) {
+        let width = 0;
+        for (const child of children) {
+            const kind = this.kind(child);
+            const length = kind === 'choice' || kind === 'case'
+                ? 3 + this.width(this.children(child)) : this.nodes[child][T_NAME].length;
+            width = Math.max(width, length);
+        }
+        return width;
+    }
+
+    // The type column of node i's sibling group (choices and cases hand theirs down, less 3)
+    column(i) {
+        const parent = this.parent[i];
+        if (!this.columns.has(parent)) {
+            const kind = this.kind(parent);
+            const column = kind === 'choice' || kind === 'case' ? this.column(parent) - 3 : 0;
+            this.columns.set(parent, column || this.width(this.siblings(parent)));
+        }
+        return this.columns.get(parent);
+    }
+
+    // Node i's line, exactly as pyang prints it
+    line(i) {
+        const node = this.nodes[i];
+        const name = node[T_NAME];
+        const kind = node[T_KIND];
+        if (i === 0) {
+            const belongsTo = node[T_TYPE] ? ` (belongs-to ${node[T_TYPE]})` : '';
+            return `${kind}: ${name}${belongsTo}`;
+        }
+        if (TREE_SECTIONS.has(kind)) return name ? `  ${kind} ${name}:` : `  ${kind}:`;
+
+        const flags = node[T_FLAGS];
+        const opts = this.field(i, T_OPTS);
+        let line = this.prefix(i).slice(0, -1) + (this.field(i, T_STATUS) || '+') + '--';
+        if (kind === 'case') {
+            line += `:(${name})`;
+        } else if (kind === 'choice') {
+            line += `${flags} (${name})${opts}`;
+        } else if (kind === 'list') {
+            line += `${flags} ${name}* [${this.field(i, T_KEYS)}]`;
+        } else if (kind === 'container') {
+            line += `${flags} ${name}${opts}`;
+        } else {
+            const label = name + (kind === 'leaf-list' ? '*' : '') + opts;
+            const type = node[T_TYPE];
+            line += type ? `${flags} ${label.padEnd(this.column(i) + 1)}   ${type}` : `${flags} ${label}`;
+        }
+        const features = this.field(i, T_FEATURES);
+        return features ? `${line} {${features}}?` : line;
+    }
+
+    // The whole tree as pyang's text output
+    text() {
+        const lines = [];
+        let previous = null;
+        for (let i = 0; i < this.nodes.length; i++) {
+            if (this.isSection(i)) {
+                if (this.kind(i) !== previous) lines.push('');
+                previous = this.kind(i);
+            }
+            lines.push(this.line(i));
+        }
+        return lines.join('\n');
+    }
+}
+
+// A scrolling view of a TreeModel that only draws the visible rows
+class TreeView {
+    constructor(element, model) {
+        this.model = model;
+        const count = model.nodes.length;
+        this.expanded = new Uint8Array(count);
+        if (count <= TREE_EXPAND_ALL_LIMIT) {
+            this.expanded.fill(1);
+        } else {
+            this.depth = new Uint8Array(count);
+            for (let i = 1; i < count; i++) {
+                this.depth[i] = this.depth[model.parent[i]] + 1;
+                this.expanded[i] = this.depth[i] < TREE_OPEN_DEPTH || model.isSection(i) ? 1 : 0;
+            }
+            this.expanded[0] = 1;
+        }
+        this.rows = this.visibleRows(0, count);
+        this.longest = 0;
+        this.build(element);
+        this.draw();
+    }
+
+    // Node indexes shown between from and to (a node's subtree is skipped while it is collapsed)
+    visibleRows(from, to) {
+        const rows = [];
+        for (let i = from; i < to; i = this.expanded[i] ? i + 1 : this.model.end(i)) rows.push(i);
+        return rows;
+    }
+
+    build(element) {
+        const count = this.model.nodes.length;
+        const toolbar = document.createElement('div');
+        toolbar.className = 'tree-toolbar';
+        const buttons = [['Expand all', () => this.setAll(1)], ['Collapse all', () => this.setAll(0)],
+                         ['Copy text', event => this.copy(event.target)]];
+        for (const [label, action] of buttons) {
+            const button = document.createElement('button');
+            button.type = 'button';
+            button.textContent = label;
+            button.addEventListener('click', action);
+            toolbar.appendChild(button);
+        }
+        const counter = document.createElement('span');
+        counter.className = 'tree-count';
+        counter.textContent = `${count.toLocaleString()} nodes`;
+        toolbar.appendChild(counter);
+
+        this.scroller = document.createElement('div');
+        this.scroller.className = 'tree-scroll';
+        this.sizer = document.createElement('div');
+        this.sizer.className = 'tree-sizer';
+        this.body = document.createElement('div');
+        this.body.className = 'tree-rows';
+        this.sizer.appendChild(this.body);
+        this.scroller.appendChild(this.sizer);
+        element.append(toolbar, this.scroller);
+
+        let pending = false;
+        const redraw = () => {
+            if (pending) return;
+            pending = true;
+            requestAnimationFrame(() => { pending = false; this.draw(); });
+        };
+        this.scroller.addEventListener('scroll', redraw);
+        window.addEventListener('resize', redraw);
+        this.body.addEventListener('click', event => {
+            const row = event.target.closest('.tree-row');
+            if (row && row.classList.contains('branch')) this.toggle(Number(row.dataset.row));
+        });
+    }
+
+    // Show or hide the children of the node drawn at rows[position]
+    toggle(position) {
+        const node = this.rows[position];
+        const end = this.model.end(node);
+        if (this.expanded[node]) {
+            let last = position + 1;
+            while (last < this.rows.length && this.rows[last] < end) last++;
+            this.rows.splice(position + 1, last - position - 1);
+            this.expanded[node] = 0;
+        } else {
+            this.expanded[node] = 1;
+            const inserted = this.visibleRows(node + 1, end);
+            this.rows = this.rows.slice(0, position + 1).concat(inserted, this.rows.slice(position + 1));
+        }
+        this.draw();
+    }
+
+    setAll(value) {
+        this.expanded.fill(value);
+        this.expanded[0] = 1;
+        if (!value) {
+            for (let i = 1; i < this.expanded.length; i++) {
+                if (this.model.isSection(i)) this.expanded[i] = 1;
+            }
+        }
+        this.rows = this.visibleRows(0, this.model.nodes.length);
+        this.scroller.scrollTop = 0;
+        this.draw();
+    }
+
+    copy(button) {
+        navigator.clipboard.writeText(this.model.text()).then(() => {
+            const label = button.textContent;
+            button.textContent = 'Copied';
+            setTimeout(() => { button.textContent = label; }, 1500);
+        });
+    }
+
+    draw() {
+        const total = this.rows.length * TREE_ROW_HEIGHT;
+        this.scroller.style.height = `${Math.min(total + 20, Math.max(200, window.innerHeight * 0.75))}px`;
+        this.sizer.style.height = `${total}px`;
+
+        const top = this.scroller.scrollTop;
+        const first = Math.max(0, Math.floor(top / TREE_ROW_HEIGHT) - TREE_OVERSCAN);
+        const last = Math.min(this.rows.length,
+                              Math.ceil((top + this.scroller.clientHeight) / TREE_ROW_HEIGHT) + TREE_OVERSCAN);
+        const fragment = document.createDocumentFragment();
+        for (let position = first; position < last; position++) {
+            const node = this.rows[position];
+            const line = this.model.line(node);
+            const row = document.createElement('div');
+            row.className = 'tree-row';
+            row.dataset.row = position;
+            const status = this.model.field(node, T_STATUS);
+            if (status) row.classList.add(status === 'x' ? 'deprecated' : 'obsolete');
+            const toggle = document.createElement('span');
+            toggle.className = 'tree-toggle';
+            if (this.model.size(node) > 0 && node > 0) {
+                row.classList.add('branch');
+                toggle.textContent = this.expanded[node] ? '▾' : '▸';
+            }
+            row.append(toggle, line);
+            fragment.appendChild(row);
+            this.longest = Math.max(this.longest, line.length);
+        }
+        this.body.style.transform = `translateY(${first * TREE_ROW_HEIGHT}px)`;
+        this.body.replaceChildren(fragment);
+        this.sizer.style.width = `${this.longest + 3}ch`;
+    }
+}
+
+// Render every tree placeholder on the page from the node table it names
+function initTreeViews() {
+    document.querySelectorAll('.tree-view[data-tree]').forEach(element => {
+        const data = document.getElementById(element.dataset.tree);
+        if (data) new TreeView(element, new TreeModel(JSON.parse(data.textContent)));
+    });
+}
+
+if (typeof document !== 'undefined') {
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', initTreeViews);
+    } else {
+        initTreeViews();
+    }
+}